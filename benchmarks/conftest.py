@@ -0,0 +1,117 @@
+# pylint:disable=redefined-outer-name
+import json
+import random
+import tracemalloc
+from datetime import timedelta
+from typing import Any, Callable
+
+import pytest
+
+from tinvest.fake import MAX_CANDLES, FakeServer
+
+# Fixtures are generated by a seeded FakeServer, so every run and every
+# commit decodes the same data
+SEED = 0  # pragma: no mutate
+STOCKS = 2000  # pragma: no mutate
+OPERATIONS = 10000  # pragma: no mutate
+CANDLES = 100000  # pragma: no mutate
+TICKS = 10000  # pragma: no mutate
+
+
+@pytest.fixture(scope='session')
+def server():
+    return FakeServer(seed=SEED, instruments=STOCKS, operations=OPERATIONS)
+
+
+@pytest.fixture(scope='session')
+def figi(server):
+    return next(iter(server.instruments))
+
+
+@pytest.fixture(scope='session')
+def stocks_raw(server):
+    return server.handle('GET', '/market/stocks')[1]
+
+
+@pytest.fixture(scope='session')
+def operations_raw(server):
+    return server.handle(
+        'GET',
+        '/operations',
+        {
+            'from': (server.start - timedelta(days=365)).isoformat(),
+            'to': server.start.isoformat(),
+        },
+    )[1]
+
+
+@pytest.fixture(scope='session')
+def candles_raw(server, figi):
+    step = timedelta(minutes=MAX_CANDLES)
+    responses = [
+        json.loads(
+            server.handle(
+                'GET',
+                '/market/candles',
+                {
+                    'figi': figi,
+                    'from': (server.start + step * i).isoformat(),
+                    'to': (server.start + step * (i + 1)).isoformat(),
+                    'interval': '1min',
+                },
+            )[1]
+        )
+        for i in range(CANDLES // MAX_CANDLES)
+    ]
+    response = responses[0]
+    response['payload']['candles'] = [
+        c for r in responses for c in r['payload']['candles']
+    ]
+    return json.dumps(response)
+
+
+@pytest.fixture(scope='session')
+def orderbook_ticks(server):
+    rnd = random.Random(SEED)
+    figis = list(server.instruments)[:20]
+    ticks = []
+    for i in range(TICKS):
+        figi = figis[i % len(figis)]
+        price = server.prices[figi]
+        ticks.append(
+            json.dumps(
+                {
+                    'event': 'orderbook',
+                    'time': (server.start + timedelta(milliseconds=i)).isoformat(),
+                    'payload': {
+                        'figi': figi,
+                        'depth': 10,
+                        'bids': [
+                            [round(price - 0.01 * j, 2), rnd.randint(1, 1000)]
+                            for j in range(10)
+                        ],
+                        'asks': [
+                            [round(price + 0.01 * (j + 1), 2), rnd.randint(1, 1000)]
+                            for j in range(10)
+                        ],
+                    },
+                }
+            )
+        )
+    return ticks
+
+
+@pytest.fixture()
+def record_peak_memory(benchmark):
+    """Runs `func` once more under tracemalloc and records the peak in KiB."""
+
+    def record(func: Callable[[], Any]) -> None:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_memory_kib'] = peak // 1024
+
+    return record
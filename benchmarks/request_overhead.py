@@ -0,0 +1,129 @@
+"""Per-call overhead of the clients without network.
+
+python -m benchmarks.request_overhead
+"""
+
+import asyncio
+import json
+import time
+from decimal import Decimal
+from typing import Any, Callable
+
+import tinvest as ti
+
+NUMBER = 20000  # pragma: no mutate
+
+ORDERBOOK = json.dumps(
+    {
+        'trackingId': 'tracking_id',
+        'status': 'Ok',
+        'payload': {
+            'figi': 'BBG0013HGFT4',
+            'depth': 1,
+            'asks': [{'price': 75.5, 'quantity': 10}],
+            'bids': [{'price': 75.4, 'quantity': 3}],
+            'tradeStatus': 'NormalTrading',
+            'minPriceIncrement': 0.0025,
+            'lastPrice': 75.45,
+        },
+    }
+)
+LIMIT_ORDER = json.dumps(
+    {
+        'trackingId': 'tracking_id',
+        'status': 'Ok',
+        'payload': {
+            'orderId': '1',
+            'operation': 'Buy',
+            'status': 'New',
+            'requestedLots': 1,
+            'executedLots': 0,
+        },
+    }
+)
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.status = self.status_code = 200
+        self.text = text
+
+    async def __aenter__(self) -> 'FakeAsyncResponse':
+        return FakeAsyncResponse(self.text)
+
+    async def __aexit__(self, *args: Any) -> None:
+        return
+
+
+class FakeAsyncResponse:
+    status = 200
+
+    def __init__(self, text: str):
+        self._text = text
+
+    async def text(self) -> str:
+        return self._text
+
+
+class FakeSession:
+    def request(self, method: str, url: str, **kwargs: Any) -> FakeResponse:
+        if url.endswith('/orders/limit-order'):
+            return FakeResponse(LIMIT_ORDER)
+        return FakeResponse(ORDERBOOK)
+
+    async def close(self) -> None:
+        return
+
+
+def report(name: str, seconds: float) -> None:
+    print(f'{name:<40} {seconds / NUMBER * 1e6:8.1f} us/call')  # noqa:T001
+
+
+def measure(call: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        call()
+    return time.perf_counter() - start
+
+
+async def measure_async(call: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        await call()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    body = ti.LimitOrderRequest(
+        lots=1, operation=ti.OperationType.buy, price=Decimal('75.45')
+    )
+    client = ti.SyncClient('token', session=FakeSession())  # type: ignore
+    report(
+        'SyncClient.get_market_orderbook',
+        measure(lambda: client.get_market_orderbook('BBG0013HGFT4', 1)),
+    )
+    report(
+        'SyncClient.post_orders_limit_order',
+        measure(lambda: client.post_orders_limit_order('BBG0013HGFT4', body)),
+    )
+
+    async def run_async() -> None:
+        async_client = ti.AsyncClient('token', session=FakeSession())  # type: ignore
+        report(
+            'AsyncClient.get_market_orderbook',
+            await measure_async(
+                lambda: async_client.get_market_orderbook('BBG0013HGFT4', 1)
+            ),
+        )
+        report(
+            'AsyncClient.post_orders_limit_order',
+            await measure_async(
+                lambda: async_client.post_orders_limit_order('BBG0013HGFT4', body)
+            ),
+        )
+
+    asyncio.run(run_async())
+
+
+if __name__ == '__main__':
+    main()
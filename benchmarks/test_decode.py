@@ -0,0 +1,47 @@
+# pylint:disable=redefined-outer-name
+import json
+
+import pytest
+
+from tinvest import (
+    CandlesResponse,
+    MarketInstrumentListResponse,
+    OperationsResponse,
+    configure,
+)
+from tinvest.config import parse_lazy, parse_raw
+
+pytest.importorskip('pytest_benchmark')
+
+
+def parse_raw_lazy(model, raw):
+    return parse_lazy(model, json.loads(raw))
+
+
+@pytest.fixture(params=['decimal', 'float', 'lazy'])
+def parse(request):
+    if request.param == 'lazy':
+        yield parse_raw_lazy
+        return
+    configure(numeric=request.param)
+    yield parse_raw
+    configure(numeric='decimal')
+
+
+def test_stocks(benchmark, record_peak_memory, parse, stocks_raw):
+    response = benchmark(parse, MarketInstrumentListResponse, stocks_raw)
+    record_peak_memory(lambda: parse(MarketInstrumentListResponse, stocks_raw))
+
+    assert response.payload.instruments[0].figi
+
+
+def test_operations(benchmark, record_peak_memory, parse, operations_raw):
+    response = benchmark(parse, OperationsResponse, operations_raw)
+    record_peak_memory(lambda: parse(OperationsResponse, operations_raw))
+
+    assert len(response.payload.operations) == 10000
+
+
+def test_candles(benchmark, record_peak_memory, parse, candles_raw):
+    benchmark.pedantic(parse, (CandlesResponse, candles_raw), rounds=3, iterations=1)
+    record_peak_memory(lambda: parse(CandlesResponse, candles_raw))
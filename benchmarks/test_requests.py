@@ -0,0 +1,60 @@
+# pylint:disable=redefined-outer-name
+import asyncio
+
+import pytest
+
+from tinvest import AsyncClient, LimitOrderRequest, OperationType, SyncClient
+from tinvest.fake import FakeSyncTransport, FakeTransport
+
+pytest.importorskip('pytest_benchmark')
+
+BATCH = 100  # pragma: no mutate
+
+
+@pytest.fixture()
+def body():
+    return LimitOrderRequest(lots=1, operation=OperationType.buy, price=10)
+
+
+@pytest.fixture()
+def sync_client(server):
+    return SyncClient('token', transport=FakeSyncTransport(server))
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture()
+def async_client(server):
+    return AsyncClient('token', transport=FakeTransport(server))
+
+
+def test_sync_orderbook(benchmark, sync_client, figi):
+    benchmark(sync_client.get_market_orderbook, figi, 20)
+
+
+def test_sync_limit_order(benchmark, sync_client, figi, body):
+    benchmark(sync_client.post_orders_limit_order, figi, body)
+
+
+def test_async_orderbook(benchmark, loop, async_client, figi):
+    # BATCH awaits per round amortize run_until_complete, divide by BATCH
+    async def run():
+        for _ in range(BATCH):
+            await async_client.get_market_orderbook(figi, 20)
+
+    benchmark.extra_info['calls_per_round'] = BATCH
+    benchmark(lambda: loop.run_until_complete(run()))
+
+
+def test_async_limit_order(benchmark, loop, async_client, figi, body):
+    async def run():
+        for _ in range(BATCH):
+            await async_client.post_orders_limit_order(figi, body)
+
+    benchmark.extra_info['calls_per_round'] = BATCH
+    benchmark(lambda: loop.run_until_complete(run()))
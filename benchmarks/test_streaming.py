@@ -0,0 +1,49 @@
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+from datetime import timedelta
+
+import pytest
+
+from tinvest import SyncClient
+from tinvest.fake import FakeSyncTransport
+from tinvest.schemas import StreamingResponse
+from tinvest.streaming import _parse_response
+
+pytest.importorskip('pytest_benchmark')
+
+
+def record_rate(benchmark, messages):
+    # No stats with --benchmark-disable
+    if benchmark.disabled:
+        return
+    benchmark.extra_info['messages_per_sec'] = round(
+        messages / benchmark.stats.stats.mean
+    )
+
+
+def test_orderbook_ticks(benchmark, record_peak_memory, orderbook_ticks):
+    # Same decoding as Streaming._handle_ws for each websocket message
+    def decode():
+        return [
+            _parse_response(StreamingResponse.parse_raw(t)) for t in orderbook_ticks
+        ]
+
+    events = benchmark.pedantic(decode, rounds=3, iterations=1)
+    record_rate(benchmark, len(orderbook_ticks))
+    record_peak_memory(decode)
+
+    assert len(events) == len(orderbook_ticks)
+
+
+def test_stream_operations(benchmark, record_peak_memory, server):
+    client = SyncClient('token', transport=FakeSyncTransport(server))
+    from_, to = server.start - timedelta(days=365), server.start
+
+    def stream():
+        return sum(1 for _ in client.stream_operations(from_, to))
+
+    count = benchmark.pedantic(stream, rounds=3, iterations=1)
+    record_rate(benchmark, count)
+    record_peak_memory(stream)
+
+    assert count == len(server.operations)
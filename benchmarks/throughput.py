@@ -0,0 +1,75 @@
+"""Throughput and latency of the clients against the in-memory fake server.
+
+python -m benchmarks.throughput
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List
+
+import tinvest as ti
+from tinvest.fake import FakeServer, FakeSyncTransport, FakeTransport
+
+NUMBER = 2000  # pragma: no mutate
+CONCURRENCY = 50  # pragma: no mutate
+LATENCY = 0.005  # pragma: no mutate
+
+
+def report(name: str, seconds: float, latencies: List[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(  # noqa:T001
+        f'{name:<40} {NUMBER / seconds:8.0f} req/s'
+        f'  p50 {quantiles[49] * 1e3:6.2f} ms  p99 {quantiles[98] * 1e3:6.2f} ms'
+    )
+
+
+async def measure_async(call: Callable[[], Awaitable[object]]) -> None:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies: List[float] = []
+
+    async def timed() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(NUMBER)))
+    report(f'AsyncClient x{CONCURRENCY}', time.perf_counter() - start, latencies)
+
+
+def measure_sync(client: ti.SyncClient, figi: str) -> None:
+    latencies: List[float] = []
+
+    def timed(_: int) -> None:
+        start = time.perf_counter()
+        client.get_market_orderbook(figi, 20)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(CONCURRENCY) as executor:
+        list(executor.map(timed, range(NUMBER)))
+    report(f'SyncClient x{CONCURRENCY} threads', time.perf_counter() - start, latencies)
+
+
+def main() -> None:
+    server = FakeServer(seed=1)
+    figi = next(iter(server.instruments))
+    print(f'server latency {LATENCY * 1e3:.1f} ms')  # noqa:T001
+
+    async def run_async() -> None:
+        transport = FakeTransport(server, latency=LATENCY)
+        async with ti.AsyncClient('token', transport=transport) as client:
+            await measure_async(lambda: client.get_market_orderbook(figi, 20))
+
+    asyncio.run(run_async())
+    with ti.SyncClient(
+        'token', transport=FakeSyncTransport(server, latency=LATENCY)
+    ) as client:
+        measure_sync(client, figi)
+
+
+if __name__ == '__main__':
+    main()
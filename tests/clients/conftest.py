@@ -54,3 +54,22 @@ def error_raw(tracking_id):
             'payload': {},
         }
     )
+
+
+@pytest.fixture()
+def operations_raw(tracking_id):
+    operation = {
+        'id': '1',
+        'currency': 'RUB',
+        'date': '2020-01-01T00:00:00+00:00',
+        'isMarginCall': False,
+        'payment': 1,
+        'status': 'Done',
+    }
+    return json.dumps(
+        {
+            'trackingId': tracking_id,
+            'status': 'Ok',
+            'payload': {'operations': [operation, {**operation, 'id': '2'}]},
+        }
+    ).encode()
@@ -3,9 +3,10 @@
 import aiohttp
 import pytest
 
-from tinvest import AsyncClient, Empty
+from tinvest import AsyncClient, Empty, RateLimiter
 from tinvest.constants import PRODUCTION
 from tinvest.exceptions import BadRequestError, TooManyRequestsError, UnexpectedError
+from tinvest.transports import AiohttpTransport
 
 pytestmark = pytest.mark.asyncio
 
@@ -72,7 +73,8 @@ async def test_async_client(async_client, async_method):
 async def test_default_session(token):
     client = AsyncClient(token)
 
-    assert isinstance(client._session, aiohttp.ClientSession)
+    assert isinstance(client._transport, AiohttpTransport)
+    assert isinstance(client._transport.session, aiohttp.ClientSession)
 
 
 async def test_request(token, session, tracking_id, headers):
@@ -127,3 +129,36 @@ async def test_request_bad_request(token, session):
 
     with pytest.raises(BadRequestError):
         await client._request('GET', '/path', Empty)
+
+
+async def test_request_with_rate_limiter(mocker, token, session):
+    rate_limiter = mocker.Mock(RateLimiter)
+    rate_limiter.acquire = mocker.AsyncMock()
+    client = AsyncClient(token, session=session, rate_limiter=rate_limiter)
+
+    await client._request('GET', '/path', Empty)
+
+    rate_limiter.acquire.assert_called_once_with()
+
+
+async def test_stream(mocker, token, session, response, operations_raw):
+    async def iter_chunked(_):
+        yield operations_raw[:50]
+        yield operations_raw[50:]
+
+    response.content = mocker.Mock()
+    response.content.iter_chunked = iter_chunked
+    client = AsyncClient(token, session=session)
+
+    result = [operation async for operation in client.stream_operations('a', 'b')]
+
+    assert [operation.id for operation in result] == ['1', '2']
+
+
+@pytest.mark.usefixtures('_bad_request')
+async def test_stream_bad_request(token, session):
+    client = AsyncClient(token, session=session)
+
+    with pytest.raises(BadRequestError):
+        async for _ in client.stream_market_stocks():
+            pass
@@ -0,0 +1,192 @@
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+import asyncio
+import json
+
+import pytest
+
+from tinvest import (
+    AsyncClient,
+    BackgroundLoop,
+    BadRequestError,
+    LimitOrderRequest,
+    OperationType,
+    SyncClient,
+)
+
+httpx = pytest.importorskip('httpx')
+h2_config = pytest.importorskip('h2.config')
+h2_connection = pytest.importorskip('h2.connection')
+h2_events = pytest.importorskip('h2.events')
+http2 = pytest.importorskip('tinvest.http2')
+
+
+class H2Protocol(asyncio.Protocol):
+    def __init__(self, server):
+        self._server = server
+        self._conn = h2_connection.H2Connection(
+            h2_config.H2Configuration(client_side=False, header_encoding='utf-8')
+        )
+        self._transport = None
+        self._streams = {}
+
+    def connection_made(self, transport):
+        self._server.connections += 1
+        self._transport = transport
+        self._conn.initiate_connection()
+        transport.write(self._conn.data_to_send())
+
+    def data_received(self, data):
+        for event in self._conn.receive_data(data):
+            if isinstance(event, h2_events.RequestReceived):
+                self._streams[event.stream_id] = (dict(event.headers), bytearray())
+            elif isinstance(event, h2_events.DataReceived):
+                self._streams[event.stream_id][1].extend(event.data)
+                self._conn.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, h2_events.StreamEnded):
+                self._respond(event.stream_id)
+        self._transport.write(self._conn.data_to_send())
+
+    def _respond(self, stream_id):
+        headers, body = self._streams.pop(stream_id)
+        self._server.requests.append((headers, bytes(body)))
+        status, payload = self._server.response
+        self._conn.send_headers(
+            stream_id,
+            [
+                (':status', str(status)),
+                ('content-type', 'application/json'),
+                ('content-length', str(len(payload))),
+            ],
+        )
+        self._conn.send_data(stream_id, payload, end_stream=True)
+
+
+class H2Server:
+    """HTTP/2 server with prior knowledge, responds with `response` to any path."""
+
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+        self.connections = 0
+        self.url = None
+        self._server = None
+
+    async def start(self):
+        loop = asyncio.get_event_loop()
+        self._server = await loop.create_server(
+            lambda: H2Protocol(self), '127.0.0.1', 0
+        )
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}'
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+@pytest.fixture()
+def server(empty_raw):
+    loop = BackgroundLoop()
+    s = H2Server((200, empty_raw.encode()))
+    loop.run(s.start())
+    yield s
+    loop.run(s.stop())
+    loop.close()
+
+
+@pytest.fixture()
+def async_client(token, server):
+    # Plain HTTP/2 without TLS, api-invest.tinkoff.ru negotiates h2 with ALPN
+    transport = http2.HttpxTransport(httpx.AsyncClient(http1=False, http2=True))
+    client = AsyncClient(token, transport=transport)
+    client._base_url = server.url
+    return client
+
+
+@pytest.fixture()
+def sync_client(token, server):
+    transport = http2.HttpxSyncTransport(httpx.Client(http1=False, http2=True))
+    client = SyncClient(token, transport=transport)
+    client._base_url = server.url
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests(async_client, server, token):
+    async with async_client:
+        await asyncio.gather(
+            *(async_client.post_orders_cancel(str(i)) for i in range(20))
+        )
+
+    assert server.connections == 1
+    assert sorted(headers[':path'] for headers, _ in server.requests) == sorted(
+        f'/orders/cancel?orderId={i}' for i in range(20)
+    )
+    assert server.requests[0][0]['authorization'] == f'Bearer {token}'
+
+
+@pytest.fixture()
+def placed_order_raw(tracking_id):
+    return json.dumps(
+        {
+            'trackingId': tracking_id,
+            'status': 'Ok',
+            'payload': {
+                'orderId': '1',
+                'operation': 'Buy',
+                'status': 'New',
+                'requestedLots': 1,
+                'executedLots': 0,
+            },
+        }
+    ).encode()
+
+
+@pytest.mark.asyncio
+async def test_post_body(async_client, server, figi, placed_order_raw):
+    server.response = (200, placed_order_raw)
+    body = LimitOrderRequest(lots=1, operation=OperationType.buy, price=10)
+
+    async with async_client:
+        response = await async_client.post_orders_limit_order(figi, body)
+
+    headers, sent = server.requests[0]
+    assert response.payload.order_id == '1'
+    assert headers[':method'] == 'POST'
+    assert json.loads(sent) == {'lots': 1, 'operation': 'Buy', 'price': 10}
+
+
+@pytest.mark.asyncio
+async def test_bad_request(async_client, server, error_raw):
+    server.response = (400, error_raw.encode())
+
+    async with async_client:
+        with pytest.raises(BadRequestError):
+            await async_client.get_accounts()
+
+
+@pytest.mark.asyncio
+async def test_stream(async_client, server, operations_raw):
+    server.response = (200, operations_raw)
+
+    async with async_client:
+        operations = [o async for o in async_client.stream_operations('a', 'b')]
+
+    assert [o.id for o in operations] == ['1', '2']
+
+
+def test_sync_client(sync_client, server, figi, placed_order_raw, operations_raw):
+    server.response = (200, placed_order_raw)
+    body = LimitOrderRequest(lots=1, operation=OperationType.buy, price=10)
+
+    with sync_client:
+        assert sync_client.post_orders_limit_order(figi, body).payload.order_id == '1'
+        server.response = (200, operations_raw)
+        operations = list(sync_client.stream_operations('a', 'b'))
+
+    assert [o.id for o in operations] == ['1', '2']
+    assert json.loads(server.requests[0][1])['lots'] == 1
+    assert server.connections == 1
@@ -1,11 +1,21 @@
 # pylint:disable=redefined-outer-name
 # pylint:disable=protected-access
+import threading
+
 import pytest
 import requests
 
-from tinvest import Empty, SyncClient
+from tinvest import (
+    AsyncClient,
+    BackgroundLoop,
+    Empty,
+    MarketInstrument,
+    MarketInstrumentListResponse,
+    SyncClient,
+)
 from tinvest.constants import PRODUCTION
 from tinvest.exceptions import BadRequestError, TooManyRequestsError, UnexpectedError
+from tinvest.transports import RequestsTransport
 
 
 @pytest.fixture()
@@ -67,7 +77,8 @@ def test_sync_client(sync_client, sync_method):
 def test_default_session(token):
     client = SyncClient(token)
 
-    assert isinstance(client._session, requests.Session)
+    assert isinstance(client._transport, RequestsTransport)
+    assert isinstance(client._transport.session, requests.Session)
 
 
 def test_request(token, session, tracking_id, headers):
@@ -81,6 +92,19 @@ def test_request(token, session, tracking_id, headers):
     )
 
 
+def test_request_with_headers(token, session, headers):
+    client = SyncClient(token, session=session)
+
+    client._request('GET', '/path', Empty, headers={'X-Custom-Header': 'value'})
+    client._request('GET', '/path', Empty)
+
+    assert session.request.call_args_list[0].kwargs['headers'] == {
+        **headers,
+        'X-Custom-Header': 'value',
+    }
+    assert session.request.call_args_list[1].kwargs['headers'] == headers
+
+
 @pytest.mark.usefixtures('_too_many_requests')
 def test_request_too_many_requests(token, session):
     client = SyncClient(token, session=session)
@@ -103,3 +127,117 @@ def test_request_bad_request(token, session):
 
     with pytest.raises(BadRequestError):
         client._request('GET', '/path', Empty)
+
+
+def test_stream(token, session, response, operations_raw, headers):
+    response.iter_content.return_value = [operations_raw[:50], operations_raw[50:]]
+    client = SyncClient(token, session=session)
+
+    result = list(client.stream_operations('from', 'to'))
+
+    assert [operation.id for operation in result] == ['1', '2']
+    session.request.assert_called_once_with(
+        'GET',
+        f'{PRODUCTION}/operations',
+        stream=True,
+        headers=headers,
+        params={'from': 'from', 'to': 'to'},
+    )
+    response.close.assert_called_once_with()
+
+
+@pytest.mark.usefixtures('_bad_request')
+def test_stream_bad_request(token, session):
+    client = SyncClient(token, session=session)
+
+    with pytest.raises(BadRequestError):
+        list(client.stream_market_stocks())
+
+
+@pytest.fixture()
+def background_loop():
+    loop = BackgroundLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture()
+def async_request(mocker, empty_raw):
+    return mocker.patch.object(
+        AsyncClient, '_request', return_value=Empty.parse_raw(empty_raw)
+    )
+
+
+def test_background_request(token, session, background_loop, async_request):
+    client = SyncClient(token, session=session, background_loop=background_loop)
+
+    assert client._request('GET', '/path', Empty, params={}).status == 'Ok'
+    async_request.assert_called_once_with('GET', '/path', Empty, lazy=False, params={})
+    session.request.assert_not_called()
+    client.close()
+    session.close.assert_called_once_with()
+
+
+def test_background_stream(mocker, token, background_loop, figi):
+    async def stream(*_, **__):
+        yield figi
+
+    target = mocker.patch.object(AsyncClient, '_iter_stream', side_effect=stream)
+    with SyncClient(token, background_loop=background_loop) as client:
+        assert list(client.stream_market_stocks()) == [figi]
+
+    assert target.call_args[0][:4] == (
+        'GET',
+        '/market/stocks',
+        MarketInstrumentListResponse,
+        MarketInstrument,
+    )
+
+
+def test_background_gather(token, session, background_loop, async_request, figi):
+    client = SyncClient(token, session=session, background_loop=background_loop)
+
+    results = client.gather(SyncClient.get_market_orderbook, [(figi, 5)] * 2)
+
+    assert len(results) == 2
+    assert async_request.call_count == 2
+
+
+def test_gather(mocker, token, session, figi):
+    client = SyncClient(token, session=session)
+    method = mocker.Mock(__name__='get_market_orderbook')
+    method.side_effect = [None, ValueError]
+
+    results = client.gather(method, [(figi, 5), figi], return_exceptions=True)
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+    method.assert_has_calls([mocker.call(client, figi, 5), mocker.call(client, figi)])
+    with pytest.raises(ValueError):
+        client.gather(mocker.Mock(side_effect=ValueError), [figi])
+
+
+def test_map(mocker, token, session, figi):
+    client = SyncClient(token, session=session)
+    method = mocker.Mock(side_effect=[None, ValueError])
+
+    with pytest.raises(ValueError):
+        client.map(method, [figi, figi], max_workers=1)
+    method.side_effect = lambda _, arg: threading.current_thread()
+    threads = client.map(method, [(figi,)] * 4, max_workers=2)
+
+    assert len(threads) == 4
+    assert threading.current_thread() not in threads
+
+
+def test_map_executor(mocker, token, session, figi):
+    client = SyncClient(token, session=session)
+    method = mocker.Mock(side_effect=lambda _, arg: threading.current_thread())
+
+    threads = set(client.map(method, [figi] * 4, max_workers=1))
+    threads.update(client.map(method, [figi] * 4, max_workers=1))
+    assert len(threads) == 1
+
+    client.close()
+    (thread,) = threads
+    assert not thread.is_alive()
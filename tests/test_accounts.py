@@ -0,0 +1,71 @@
+# pylint:disable=redefined-outer-name
+import pytest
+
+from tinvest import AsyncClient, BrokerAccountType, UserAccountsResponse
+from tinvest.accounts import MultiAccountExecutor
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture()
+def client(mocker, tracking_id):
+    c = mocker.Mock(AsyncClient)
+    c.get_accounts = mocker.AsyncMock(
+        return_value=UserAccountsResponse.parse_obj(
+            {
+                'trackingId': tracking_id,
+                'status': 'Ok',
+                'payload': {
+                    'accounts': [
+                        {'brokerAccountType': 'Tinkoff', 'brokerAccountId': '1'},
+                        {'brokerAccountType': 'TinkoffIis', 'brokerAccountId': '2'},
+                    ]
+                },
+            }
+        )
+    )
+    return c
+
+
+@pytest.fixture()
+def method(mocker):
+    async def get_portfolio(_client, broker_account_id=None):
+        if broker_account_id == 'error':
+            raise ValueError(broker_account_id)
+        return f'portfolio {broker_account_id}'
+
+    return mocker.AsyncMock(side_effect=get_portfolio)
+
+
+async def test_run_for_all_accounts(client, method):
+    executor = MultiAccountExecutor(client)
+
+    assert await executor.run(method) == {'1': 'portfolio 1', '2': 'portfolio 2'}
+    assert await executor.run(method) == {'1': 'portfolio 1', '2': 'portfolio 2'}
+    client.get_accounts.assert_called_once_with()
+    method.assert_any_call(client, broker_account_id='1')
+
+
+async def test_run_for_subset(client, method):
+    executor = MultiAccountExecutor(client, ['3'], concurrency=1)
+
+    assert await executor.run(method, broker_account_ids=['4', '4']) == {
+        '4': 'portfolio 4'
+    }
+    assert await executor.run(method) == {'3': 'portfolio 3'}
+    client.get_accounts.assert_not_called()
+
+
+async def test_run_with_exceptions(client, method):
+    executor = MultiAccountExecutor(client, ['1', 'error'])
+
+    results = await executor.run(method, return_exceptions=True)
+
+    assert results['1'] == 'portfolio 1'
+    assert isinstance(results['error'], ValueError)
+
+
+async def test_get_broker_account_ids_by_type(client):
+    executor = MultiAccountExecutor(client)
+
+    assert await executor.get_broker_account_ids(BrokerAccountType.tinkoff_iis) == ['2']
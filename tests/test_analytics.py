@@ -0,0 +1,158 @@
+# pylint:disable=redefined-outer-name
+import random
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from tinvest import Currency, Operation, OperationTypeWithCommission
+
+np = pytest.importorskip('numpy')
+analytics = pytest.importorskip('tinvest.analytics')
+
+
+def make_operation(operation_type, payment, quantity=None, figi=None, day=1):
+    return Operation.parse_obj(
+        {
+            'id': str(random.random()),
+            'currency': 'USD',
+            'date': datetime(2020, 1, day, tzinfo=timezone.utc),
+            'figi': figi,
+            'isMarginCall': False,
+            'operationType': operation_type,
+            'payment': payment,
+            'quantityExecuted': quantity,
+            'status': 'Done',
+        }
+    )
+
+
+@pytest.fixture()
+def frame():
+    return analytics.OperationsFrame.from_operations(
+        [
+            make_operation('Buy', -100, 10, 'A', 1),
+            make_operation('BrokerCommission', -1, figi='A', day=1),
+            make_operation('Buy', -120, 10, 'A', 2),
+            make_operation('Sell', 165, 15, 'A', 3),
+            make_operation('BrokerCommission', -2, figi='A', day=3),
+            make_operation('Sell', 60, 5, 'A', 4).copy(update={'status': 'Decline'}),
+            make_operation('Buy', -50, 5, 'B', 3),
+            make_operation('PayIn', 1000, day=1),
+        ]
+    )
+
+
+def test_columns(frame):
+    assert len(frame) == 8
+    assert frame.columns['date'][0] == np.datetime64('2020-01-01T00:00')
+    assert frame.columns['quantity'].tolist() == [10, 0, 10, 15, 0, 5, 5, 0]
+    assert frame.labels['figi'] == ['A', 'B', None]
+
+
+def test_commissions(frame):
+    assert frame.commissions() == {(Currency.usd,): 3}
+    assert frame.commissions(by=(), freq='D') == {
+        (date(2020, 1, 1),): 1,
+        (date(2020, 1, 3),): 2,
+    }
+
+
+def test_turnover(frame):
+    assert frame.turnover(by=('figi', 'operation_type')) == {
+        ('A', OperationTypeWithCommission.buy): 220,
+        ('A', OperationTypeWithCommission.sell): 165,
+        ('B', OperationTypeWithCommission.buy): 50,
+    }
+
+
+def test_realized_pnl(frame):
+    # 10 units for 100 and 5 units for 60 are sold for 165
+    assert frame.realized_pnl() == {('A', Currency.usd): pytest.approx(5)}
+    assert frame.realized_pnl_by_operation().tolist() == pytest.approx(
+        [0, 0, 0, 5, 0, 0, 0, 0]
+    )
+
+
+def test_realized_pnl_ignores_short_sell():
+    frame = analytics.OperationsFrame.from_operations(
+        [
+            make_operation('Sell', 1000, 10, 'A', 1),
+            make_operation('Buy', -1000, 10, 'A', 2),
+            make_operation('Sell', 1200, 10, 'A', 3),
+        ]
+    )
+
+    assert frame.realized_pnl() == {('A', Currency.usd): pytest.approx(200)}
+    assert frame.realized_pnl_by_operation().tolist() == pytest.approx([0, 0, 200])
+
+
+def test_aggregate(frame):
+    mask = frame.isin('operation_type', [OperationTypeWithCommission.pay_in])
+
+    assert frame.aggregate('payment', mask=mask) == {(Currency.usd,): 1000}
+    assert frame.aggregate('payment', mask=~mask) == {(Currency.usd,): -48}
+    assert frame.filter(mask).aggregate('payment', by=('status',), freq='M') == {
+        ('Done', date(2020, 1, 1)): 1000
+    }
+
+
+def test_empty():
+    frame = analytics.OperationsFrame.from_operations([])
+
+    assert len(frame) == 0
+    assert frame.commissions() == {}
+    assert frame.realized_pnl() == {}
+
+
+def fifo_pnl(operations):
+    lots = {}
+    pnl = {}
+    for operation in sorted(operations, key=lambda o: o.date):
+        queue = lots.setdefault(operation.figi, deque())
+        quantity = operation.quantity_executed
+        if operation.operation_type == OperationTypeWithCommission.buy:
+            queue.append([quantity, -float(operation.payment) / quantity])
+            continue
+        key = (operation.figi, Currency.usd)
+        pnl[key] = pnl.get(key, 0) + match_lots(
+            queue, quantity, float(operation.payment) / quantity
+        )
+    return pnl
+
+
+def match_lots(queue, quantity, price):
+    pnl = 0
+    while quantity and queue:
+        matched = min(quantity, queue[0][0])
+        pnl += matched * (price - queue[0][1])
+        quantity -= matched
+        queue[0][0] -= matched
+        if not queue[0][0]:
+            queue.popleft()
+    return pnl
+
+
+def test_realized_pnl_matches_fifo():
+    rnd = random.Random(0)
+    operations = []
+    for i in range(500):
+        figi = rnd.choice('ABC')
+        quantity = rnd.randint(1, 10)
+        price = rnd.randint(90, 110)
+        sell = rnd.random() < 0.4
+        operation = make_operation(
+            'Sell' if sell else 'Buy',
+            price * quantity * (1 if sell else -1),
+            quantity,
+            figi,
+        )
+        operation.date += timedelta(minutes=i)
+        operations.append(operation)
+
+    result = analytics.OperationsFrame.from_operations(operations).realized_pnl()
+    expected = fifo_pnl(operations)
+
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        assert result[key] == pytest.approx(value)
@@ -0,0 +1,61 @@
+# pylint:disable=redefined-outer-name
+import asyncio
+
+import pytest
+
+from tinvest import BackgroundLoop
+
+
+@pytest.fixture()
+def background_loop():
+    loop = BackgroundLoop()
+    yield loop
+    loop.close()
+
+
+def test_run(background_loop):
+    async def get_loop():
+        await asyncio.sleep(0)
+        return asyncio.get_event_loop()
+
+    assert background_loop.run(get_loop()) is background_loop.loop
+
+
+def test_run_from_loop_thread(background_loop):
+    async def run():
+        background_loop.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        background_loop.run(run())
+
+
+def test_iterate(background_loop):
+    closed = []
+
+    async def items():
+        try:
+            for i in range(3):
+                yield i
+        finally:
+            closed.append(True)
+
+    assert list(background_loop.iterate(items())) == [0, 1, 2]
+    iterator = background_loop.iterate(items())
+    assert next(iterator) == 0
+    iterator.close()
+    assert closed == [True, True]
+
+
+def test_close(background_loop):
+    background_loop.close()
+    background_loop.close()
+
+    assert background_loop.closed
+
+
+def test_shared():
+    loop = BackgroundLoop.shared()
+
+    assert BackgroundLoop.shared() is loop
+    loop.close()
+    assert BackgroundLoop.shared() is not loop
@@ -0,0 +1,154 @@
+# pylint:disable=redefined-outer-name
+import pytest
+
+from tinvest import (
+    AsyncClient,
+    Empty,
+    LimitOrderRequest,
+    LimitOrderResponse,
+    MarketOrderRequest,
+    MarketOrderResponse,
+    OperationType,
+    OrdersResponse,
+    RateLimiter,
+)
+from tinvest.batch import cancel_orders, place_orders
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_placed(order_id):
+    return {
+        'orderId': order_id,
+        'operation': 'Buy',
+        'status': 'New',
+        'requestedLots': 1,
+        'executedLots': 0,
+    }
+
+
+@pytest.fixture()
+def client(mocker, tracking_id):
+    c = mocker.Mock(AsyncClient)
+    c.post_orders_limit_order = mocker.AsyncMock(
+        return_value=LimitOrderResponse.parse_obj(
+            {'trackingId': tracking_id, 'payload': make_placed('1')}
+        )
+    )
+    c.post_orders_market_order = mocker.AsyncMock(
+        return_value=MarketOrderResponse.parse_obj(
+            {'trackingId': tracking_id, 'payload': make_placed('2')}
+        )
+    )
+    c.post_orders_cancel = mocker.AsyncMock(
+        return_value=Empty(trackingId=tracking_id, payload={})
+    )
+    c.get_orders = mocker.AsyncMock(
+        return_value=OrdersResponse.parse_obj(
+            {
+                'trackingId': tracking_id,
+                'payload': [
+                    {
+                        'orderId': order_id,
+                        'figi': figi,
+                        'operation': 'Buy',
+                        'status': 'New',
+                        'type': 'Limit',
+                        'price': 10,
+                        'requestedLots': 1,
+                        'executedLots': 0,
+                    }
+                    for order_id, figi in (('1', 'A'), ('2', 'B'))
+                ],
+            }
+        )
+    )
+    return c
+
+
+async def test_place_orders(client, figi, broker_account_id):
+    limit_order = LimitOrderRequest(lots=1, operation=OperationType.buy, price=10)
+    market_order = MarketOrderRequest(lots=1, operation=OperationType.buy)
+    rate_limiter = RateLimiter(10)
+
+    results = await place_orders(
+        client,
+        [(figi, limit_order), (figi, market_order)],
+        broker_account_id,
+        concurrency=1,
+        rate_limiter=rate_limiter,
+    )
+
+    assert [r.order_id for r in results] == ['1', '2']
+    assert all(r.ok and r.figi == figi for r in results)
+    assert results[0].started <= results[1].started
+    assert results[1].elapsed >= 0
+    client.post_orders_limit_order.assert_called_once_with(
+        figi, limit_order, broker_account_id
+    )
+    client.post_orders_market_order.assert_called_once_with(
+        figi, market_order, broker_account_id
+    )
+    assert rate_limiter._tokens < 9  # pylint:disable=protected-access
+
+
+async def test_place_orders_error(client, figi):
+    client.post_orders_limit_order.side_effect = ValueError
+    body = LimitOrderRequest(lots=1, operation=OperationType.buy, price=10)
+
+    [result] = await place_orders(client, [(figi, body)])
+
+    assert not result.ok
+    assert isinstance(result.error, ValueError)
+    assert result.order_id is None
+
+
+async def test_cancel_orders(client, broker_account_id):
+    results = await cancel_orders(client, ['3'], broker_account_id)
+
+    assert [(r.order_id, r.figi, r.ok) for r in results] == [('3', None, True)]
+    client.post_orders_cancel.assert_called_once_with('3', broker_account_id)
+    client.get_orders.assert_not_called()
+
+
+async def test_cancel_single_order(client, broker_account_id):
+    results = await cancel_orders(client, '123', broker_account_id)
+
+    assert [r.order_id for r in results] == ['123']
+    client.post_orders_cancel.assert_called_once_with('123', broker_account_id)
+    client.get_orders.assert_not_called()
+
+
+async def test_cancel_all_orders(client, broker_account_id):
+    results = await cancel_orders(client, 'all', broker_account_id)
+
+    assert [(r.order_id, r.figi) for r in results] == [('1', 'A'), ('2', 'B')]
+    client.get_orders.assert_called_once_with(broker_account_id)
+
+
+async def test_concurrency(client):
+    with pytest.raises(ValueError):
+        await cancel_orders(client, [], concurrency=0)
+
+
+async def test_async_client_place_orders(mocker, token, figi):
+    target = mocker.patch('tinvest.clients.place_orders', autospec=True)
+    client = AsyncClient(token, session=mocker.Mock())
+    body = MarketOrderRequest(lots=1, operation=OperationType.buy)
+
+    await client.place_orders([(figi, body)], concurrency=2)
+
+    target.assert_called_once_with(
+        client, [(figi, body)], None, concurrency=2, rate_limiter=None
+    )
+
+
+async def test_async_client_cancel_orders(mocker, token, broker_account_id):
+    target = mocker.patch('tinvest.clients.cancel_orders', autospec=True)
+    client = AsyncClient(token, session=mocker.Mock())
+
+    await client.cancel_orders('all', broker_account_id)
+
+    target.assert_called_once_with(
+        client, 'all', broker_account_id, concurrency=10, rate_limiter=None
+    )
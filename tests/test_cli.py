@@ -0,0 +1,428 @@
+# pylint:disable=redefined-outer-name
+# pylint:disable=wrong-import-position
+import asyncio
+import csv
+import io
+import json
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip('typer')
+
+from typer.testing import CliRunner  # noqa:E402
+
+from tinvest import (  # noqa:E402
+    AsyncClient,
+    Empty,
+    ErrorStreamingResponse,
+    Operation,
+    OrderbookStreamingResponse,
+    SyncClient,
+)
+from tinvest.cli.app import app  # noqa:E402
+from tinvest.cli.batch import Method  # noqa:E402
+from tinvest.cli.batch import _run as run_batch  # noqa:E402
+from tinvest.cli.bench import _report as bench_report  # noqa:E402
+from tinvest.cli.formats import (  # noqa:E402
+    ArrowWriter,
+    CsvWriter,
+    JsonlWriter,
+    get_columns,
+)
+from tinvest.cli.instruments import InstrumentIndex  # noqa:E402
+from tinvest.cli.profiling import get_startup_time  # noqa:E402
+from tinvest.cli.stream import LiveView, watch  # noqa:E402
+from tinvest.fake import FakeServer, FakeSyncTransport, FakeTransport  # noqa:E402
+
+runner = CliRunner()
+
+
+def test_bench():
+    result = runner.invoke(
+        app, ['bench', 'market-orderbook', '--fake', '-n', '20', '-c', '4']
+    )
+
+    assert result.exit_code == 0, result.output
+    assert 'Requests\t20\n' in result.output
+    assert 'Errors\t0\n' in result.output
+    assert 'Latency p99' in result.output
+    assert 'Mean validate' in result.output
+
+
+def test_bench_figi_is_required():
+    result = runner.invoke(
+        app, ['bench', 'market-orderbook', '-n', '1', '--token', 'token']
+    )
+
+    assert result.exit_code == 2
+    assert '--figi is required' in result.output
+
+
+def test_bench_token_is_required():
+    result = runner.invoke(app, ['bench', 'accounts', '-n', '1'], env={})
+
+    assert result.exit_code == 2
+    assert 'TINVEST_TOKEN is required' in result.output
+
+
+def test_bench_sandbox_token_is_required():
+    result = runner.invoke(
+        app,
+        ['bench', 'accounts', '-n', '1', '--use-sandbox', '--token', 'token'],
+        env={},
+    )
+
+    assert result.exit_code == 2
+    assert 'TINVEST_SANDBOX_TOKEN is required' in result.output
+
+
+def test_bench_report_without_spans(capsys):
+    bench_report([], 1.0, 10)
+
+    assert capsys.readouterr().out == 'Requests\t0\nConcurrency\t10\n'
+
+
+def test_startup_time(mocker):
+    assert 0 < get_startup_time() < 3600
+
+    mocker.patch('builtins.open', side_effect=OSError)
+    assert 0 < get_startup_time() < 3600
+
+
+def test_profile(tmp_path):
+    output = tmp_path / 'tinvest.prof'
+    result = runner.invoke(
+        app, ['--profile-output', str(output), 'bench', 'accounts', '--fake', '-n', '1']
+    )
+
+    assert result.exit_code == 0, result.output
+    assert 'startup' in result.output
+    assert 'command' in result.output
+    assert output.exists()
+
+
+@pytest.fixture()
+def fake_client(monkeypatch, token):
+    server = FakeServer(instruments=3, operations=10)
+    monkeypatch.setattr(
+        'tinvest.cli.batch.create_async_client',
+        lambda ctx: AsyncClient(token, transport=FakeTransport(server)),
+    )
+    return server
+
+
+def test_batch(tmp_path, fake_client):
+    figis = list(fake_client.instruments)
+    requests = tmp_path / 'requests.jsonl'
+    requests.write_text(
+        '\n'.join(
+            [json.dumps({'figi': figi, 'depth': 5}) for figi in figis]
+            + [json.dumps({'method': 'market-search-by-figi', 'figi': 'unknown'})]
+        )
+    )
+
+    result = runner.invoke(
+        app,
+        ['openapi', 'batch', str(requests), '--method', 'market-orderbook', '-c', '2'],
+    )
+
+    assert result.exit_code == 1
+    results = sorted(
+        (json.loads(line) for line in result.stdout.splitlines()),
+        key=lambda r: r['index'],
+    )
+    assert [r['ok'] for r in results] == [True] * len(figis) + [False]
+    assert [r['payload']['figi'] for r in results[:-1]] == figis
+    assert results[0]['payload']['depth'] == 5
+    assert results[-1]['error'].startswith('BadRequestError')
+
+
+@pytest.mark.asyncio
+async def test_batch_reads_records_lazily(mocker):
+    client = mocker.MagicMock(AsyncClient)
+    released = asyncio.Event()
+    read = 0
+    threads = set()
+
+    async def get_market_orderbook(figi, depth):
+        await released.wait()
+        return Empty(trackingId='id', payload={'figi': figi, 'depth': depth})
+
+    def records():
+        nonlocal read
+        for index in range(100):
+            read += 1
+            threads.add(threading.get_ident())
+            yield {'figi': str(index)}
+
+    client.get_market_orderbook.side_effect = get_market_orderbook
+    writer = JsonlWriter(io.StringIO())
+    run = asyncio.create_task(
+        run_batch(client, records(), writer, Method.market_orderbook, 2, 10**6)
+    )
+    await asyncio.sleep(0.01)
+
+    # Requests in flight, queued records and one being put
+    assert read == 5
+    released.set()
+    assert await asyncio.wait_for(run, 1) == (100, 0)
+    # Records are not read in the event loop
+    assert threading.get_ident() not in threads
+
+
+def test_batch_csv(tmp_path, fake_client):
+    requests = tmp_path / 'requests.csv'
+    requests.write_text(
+        'method,figi,from,to,interval\n'
+        + ''.join(
+            f'market-candles,{figi},2020-12-31T00:00:00,2021-01-01T00:00:00,hour\n'
+            for figi in fake_client.instruments
+        )
+    )
+    output = tmp_path / 'candles.csv'
+
+    result = runner.invoke(
+        app, ['openapi', 'batch', str(requests), '--format', 'csv', '-o', str(output)]
+    )
+
+    assert result.exit_code == 0, result.output
+    rows = list(csv.DictReader(output.open()))
+    assert len(rows) == len(fake_client.instruments)
+    assert {row['ok'] for row in rows} == {'True'}
+    assert json.loads(rows[0]['payload'])['interval'] == 'hour'
+
+
+def test_batch_parquet(tmp_path, fake_client):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    requests = tmp_path / 'requests.jsonl'
+    requests.write_text(json.dumps({'method': 'portfolio'}))
+    output = tmp_path / 'portfolio.parquet'
+
+    result = runner.invoke(
+        app,
+        ['openapi', 'batch', str(requests), '--format', 'parquet', '-o', str(output)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert parquet.read_table(output).column('ok').to_pylist() == [True]
+
+
+@pytest.fixture()
+def fake_sync_client(monkeypatch, token):
+    server = FakeServer(instruments=3, operations=10)
+    monkeypatch.setattr(
+        'tinvest.cli.openapi.create_client',
+        lambda ctx: SyncClient(token, transport=FakeSyncTransport(server)),
+    )
+    return server
+
+
+@pytest.fixture()
+def index_path(monkeypatch, tmp_path):
+    path = tmp_path / 'instruments.json'
+    monkeypatch.setenv('TINVEST_INSTRUMENTS_INDEX', str(path))
+    return path
+
+
+def test_instrument_index(index_path, token):
+    fake = FakeServer(instruments=5)
+    client = SyncClient(token, transport=FakeSyncTransport(fake))
+    figi, instrument = next(iter(fake.instruments.items()))
+
+    index = InstrumentIndex()
+    assert index.resolve(instrument['ticker'], lambda: client) == figi
+    assert index.resolve(instrument['isin'].lower(), lambda: client) == figi
+    assert index.resolve('unknown', lambda: client) is None
+    # one request per market list
+    assert fake.requests == 4
+    assert InstrumentIndex().resolve(instrument['ticker'], lambda: client) == figi
+    assert fake.requests == 4
+    assert index_path.exists()
+
+    stale = InstrumentIndex(max_age=0)
+    assert stale.resolve(figi, lambda: client) == figi
+    assert fake.requests == 4
+    assert stale.resolve(instrument['ticker'], lambda: client) == figi
+    assert fake.requests == 8
+
+
+def test_ticker_argument(fake_sync_client, index_path):
+    figi, instrument = next(iter(fake_sync_client.instruments.items()))
+
+    result = runner.invoke(
+        app, ['openapi', 'market-orderbook', instrument['ticker'], '5']
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith(f'FIGI\t{figi}\n')
+    assert index_path.exists()
+
+    result = runner.invoke(app, ['openapi', 'market-orderbook', 'unknown', '5'])
+
+    assert result.exit_code == 2
+    assert 'Unknown FIGI, ticker or ISIN: unknown' in result.output
+
+
+def test_table(fake_sync_client):
+    result = runner.invoke(app, ['openapi', 'market-stocks'])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    stocks = [i for i in fake_sync_client.instruments.values() if i['type'] == 'Stock']
+    assert lines[-1] == f'Total\t{len(stocks)}'
+    assert lines[0].startswith(stocks[0]['figi'])
+
+
+def test_jsonl(fake_sync_client):
+    result = runner.invoke(app, ['openapi', '--format', 'jsonl', 'market-stocks'])
+
+    assert result.exit_code == 0, result.output
+    stocks = [json.loads(line) for line in result.output.splitlines()]
+    assert {stock['type'] for stock in stocks} == {'Stock'}
+    assert stocks[0]['figi'] in fake_sync_client.instruments
+
+
+def test_json(fake_sync_client):
+    stock = next(
+        i for i in fake_sync_client.instruments.values() if i['type'] == 'Stock'
+    )
+    result = runner.invoke(
+        app,
+        [
+            'openapi',
+            '--format',
+            'json',
+            'market-candles',
+            stock['figi'],
+            'hour',
+            '2020-12-31T00:00:00',
+            '2021-01-01T00:00:00',
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    candles = json.loads(result.output)
+    assert len(candles) == 24
+    assert candles[0]['interval'] == 'hour'
+    assert candles[0]['time'] == '2020-12-31T00:00:00+00:00'
+
+
+def test_csv(fake_sync_client, tmp_path):
+    output = tmp_path / 'operations.csv'
+    result = runner.invoke(
+        app,
+        [
+            'openapi',
+            '--format',
+            'csv',
+            '-o',
+            str(output),
+            'operations',
+            '2020-01-01T00:00:00',
+            '2021-01-01T00:00:00',
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    rows = list(csv.DictReader(output.open()))
+    assert len(rows) == 10
+    assert rows[0]['operationType']
+    assert float(rows[0]['payment']) != 0
+
+
+def test_arrow(fake_sync_client, tmp_path):
+    ipc = pytest.importorskip('pyarrow.ipc')
+    output = tmp_path / 'accounts.arrow'
+    result = runner.invoke(
+        app, ['openapi', '--format', 'arrow', '-o', str(output), 'accounts']
+    )
+
+    assert result.exit_code == 0, result.output
+    table = ipc.open_stream(output.read_bytes()).read_all()
+    assert table.column('brokerAccountId').to_pylist() == ['FAKE0001']
+
+
+def test_get_columns():
+    columns = get_columns(Operation)
+
+    assert columns['payment'] is float
+    assert columns['quantity'] is int
+    assert columns['isMarginCall'] is bool
+    assert columns['operationType'] is str
+    assert columns['trades'] is str
+
+
+def test_arrow_columns(mocker):
+    ipc = pytest.importorskip('pyarrow.ipc')
+    mocker.patch('tinvest.cli.formats.ARROW_BATCH', 1)
+    sink = io.BytesIO()
+    writer = ArrowWriter(sink, {'figi': str, 'price': float})
+
+    # The first batch has no prices
+    writer.write({'figi': 'BBG0', 'price': None})
+    writer.write({'figi': 'BBG1', 'price': 1.5})
+    writer.close()
+
+    table = ipc.open_stream(sink.getvalue()).read_all()
+    assert table.column('price').to_pylist() == [None, 1.5]
+
+
+def test_csv_columns():
+    file = io.StringIO()
+    writer = CsvWriter(file, {'figi': str, 'price': float})
+
+    writer.write({'figi': 'BBG0'})
+    writer.write({'figi': 'BBG1', 'price': 1.5})
+
+    assert list(csv.DictReader(io.StringIO(file.getvalue()))) == [
+        {'figi': 'BBG0', 'price': ''},
+        {'figi': 'BBG1', 'price': '1.5'},
+    ]
+
+
+def _streaming_events():
+    now = datetime.now(timezone.utc)
+    orderbook = {'figi': 'BBG0', 'depth': 1, 'bids': [[10, 1]], 'asks': [[11, 2]]}
+    return [
+        OrderbookStreamingResponse(time=now, payload=orderbook),
+        OrderbookStreamingResponse(time=now, payload={**orderbook, 'bids': [[12, 3]]}),
+        OrderbookStreamingResponse(time=now, payload={**orderbook, 'figi': 'BBG1'}),
+        ErrorStreamingResponse(time=now, payload={'error': 'Subscription failed'}),
+    ]
+
+
+def test_live_view():
+    output = io.StringIO()
+    view = LiveView(JsonlWriter(output))
+    for event in _streaming_events():
+        view.add(event)
+
+    lines = view.render()
+
+    assert lines[:3] == [
+        'BBG0\tbid 12 x 3\task 11 x 2',
+        'BBG1\tbid 10 x 1\task 11 x 2',
+        'Last error: Subscription failed',
+    ]
+    assert 'latency p50' in lines[3]
+    assert lines[3].endswith('total 4\terrors 1')
+    assert view.render()[-1].startswith('0.0 msg/s\ttotal 4')
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [r['event'] for r in records] == ['orderbook'] * 3 + ['error']
+    assert records[1]['payload']['bids'] == [[12, 3]]
+
+
+@pytest.mark.asyncio
+async def test_watch(capsys):
+    async def events():
+        for event in _streaming_events():
+            yield event
+        await asyncio.sleep(10)
+
+    view = LiveView()
+    await watch(events(), view, refresh=0.05, duration=0.2)
+
+    assert view.total == 4
+    assert 'BBG1\tbid 10 x 1' in capsys.readouterr().out
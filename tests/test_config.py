@@ -0,0 +1,44 @@
+import pytest
+
+from tinvest import Candle, LazyModel, NumericMode, configure
+from tinvest.config import get_model, parse_lazy, parse_obj, settings
+from tinvest.numeric import float_model
+
+
+@pytest.fixture()
+def _float_mode():
+    configure(numeric='float')
+    yield
+    configure(numeric=NumericMode.decimal)
+
+
+def test_get_model():
+    assert settings.numeric == NumericMode.decimal
+    assert get_model(Candle) is Candle
+
+
+@pytest.mark.usefixtures('_float_mode')
+def test_get_model_float():
+    assert get_model(Candle) is float_model(Candle)
+
+
+def test_configure_invalid_numeric():
+    with pytest.raises(ValueError):
+        configure(numeric='int')
+
+
+def test_parse_lazy():
+    candle = parse_lazy(Candle, {'figi': 'figi'})
+
+    assert isinstance(candle, LazyModel)
+    assert candle.figi == 'figi'
+
+
+def test_configure_lazy_is_per_call():
+    with pytest.raises(TypeError):
+        configure(lazy=True)  # type: ignore[call-arg]  # pylint:disable=E1123
+
+
+def test_parse_obj():
+    with pytest.raises(ValueError):
+        parse_obj(Candle, {})
@@ -0,0 +1,138 @@
+# pylint:disable=redefined-outer-name
+import asyncio
+import os
+import socket
+from datetime import timedelta
+
+import pytest
+
+from tinvest import BadRequestError, SyncClient
+from tinvest.daemon import DaemonServer, DaemonTransport, get_socket_path, is_running
+from tinvest.fake import FakeServer, FakeTransport
+
+
+@pytest.fixture()
+def fake():
+    return FakeServer(instruments=5, operations=20)
+
+
+@pytest.fixture()
+def path(tmp_path):
+    return str(tmp_path / 'tinvest.sock')
+
+
+@pytest.fixture()
+async def daemon(fake, path):
+    server = DaemonServer(path, transport=FakeTransport(fake))
+    task = asyncio.create_task(server.serve())
+    while not os.path.exists(path):
+        await asyncio.sleep(0.01)
+    yield server
+    server.stop()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_requests(daemon, fake, token, path):
+    def call():
+        client = SyncClient(token, transport=DaemonTransport(path))
+        client.get_market_stocks()
+        stocks = client.get_market_stocks().payload.instruments
+        accounts = client.get_accounts().payload.accounts
+        operations = list(
+            client.stream_operations(fake.start - timedelta(days=365), fake.start)
+        )
+        with pytest.raises(BadRequestError):
+            client.post_orders_cancel('unknown')
+        return stocks, accounts, operations
+
+    stocks, accounts, operations = await asyncio.to_thread(call)
+
+    assert stocks
+    assert accounts[0].broker_account_id == 'FAKE0001'
+    assert len(operations) == 20
+    assert daemon.requests == 5
+    # the second list of stocks is cached
+    assert fake.requests == 4
+
+
+@pytest.mark.asyncio
+async def test_expired_cache_entries_are_dropped(fake, path):
+    transport = FakeTransport(fake)
+    server = DaemonServer(path, transport=transport, cache_ttl=0.05)
+    stocks = {'method': 'GET', 'url': '/market/stocks', 'kwargs': {}}
+    bonds = {'method': 'GET', 'url': '/market/bonds', 'kwargs': {}}
+
+    await server.handle(transport, stocks)
+    await asyncio.sleep(0.1)
+    await server.handle(transport, bonds)
+
+    assert list(server._cache) == [  # pylint:disable=protected-access
+        server._get_cache_key(bonds)  # pylint:disable=protected-access
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stop(daemon, path):
+    assert await asyncio.to_thread(is_running, path)
+
+    await asyncio.to_thread(DaemonTransport(path).stop)
+    await asyncio.sleep(0.05)
+
+    assert not os.path.exists(path)
+    assert not is_running(path)
+    assert not is_running(daemon.path + '.missing')
+
+
+@pytest.mark.asyncio
+async def test_already_running(daemon, path):
+    with pytest.raises(RuntimeError, match='already running'):
+        await DaemonServer(path).serve()
+
+    assert daemon.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_socket_is_private(daemon):
+    assert os.stat(daemon.path).st_mode & 0o777 == 0o600
+
+
+def test_not_a_socket(path):
+    with open(path, 'w', encoding='utf-8'):
+        pass
+
+    assert not is_running(path)
+    with pytest.raises(PermissionError):
+        DaemonTransport(path).stop()
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason='needs another user')
+def test_socket_of_another_user(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        sock.listen()
+        os.chown(path, 65534, 65534)
+
+        assert not is_running(path)
+    finally:
+        sock.close()
+
+
+def test_socket_path(monkeypatch, tmp_path):
+    monkeypatch.delenv('TINVEST_DAEMON_SOCKET', raising=False)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert get_socket_path() == str(tmp_path / 'tinvest.sock')
+
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    assert get_socket_path().endswith(f'tinvest-{os.getuid()}/daemon.sock')
+
+
+@pytest.mark.asyncio
+async def test_shared_directory(tmp_path):
+    shared = tmp_path / 'shared'
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+
+    with pytest.raises(RuntimeError, match='not private'):
+        await DaemonServer(str(shared / 'tinvest.sock')).serve()
@@ -0,0 +1,212 @@
+# pylint:disable=redefined-outer-name
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tinvest import (
+    AsyncClient,
+    BadRequestError,
+    BrokerAccountType,
+    CandleResolution,
+    LimitOrderRequest,
+    MarketOrderRequest,
+    OperationType,
+    SandboxRegisterRequest,
+    SandboxSetCurrencyBalanceRequest,
+    SandboxSetPositionBalanceRequest,
+    SyncClient,
+)
+from tinvest.constants import PRODUCTION, SANDBOX
+from tinvest.fake import FakeServer, FakeSyncTransport, FakeTransport
+
+
+@pytest.fixture()
+def server():
+    return FakeServer(seed=1, instruments=5, operations=50)
+
+
+@pytest.fixture()
+def stock(server):
+    return next(i for i in server.instruments.values() if i['type'] == 'Stock')
+
+
+@pytest.fixture()
+def sync_client(token, server):
+    return SyncClient(token, transport=FakeSyncTransport(server))
+
+
+def test_deterministic():
+    first, second = FakeServer(seed=7), FakeServer(seed=7)
+
+    assert first.handle('GET', '/market/stocks') == second.handle(
+        'GET', '/market/stocks'
+    )
+    assert first.operations == second.operations
+    assert first.instruments != FakeServer(seed=8).instruments
+
+
+def test_paths(server):
+    assert server.handle('GET', '/unknown') == (404, '')
+    assert server.handle('GET', f'{PRODUCTION}/orders')[0] == 200
+    assert server.handle('GET', f'{SANDBOX}/orders')[0] == 200
+    assert server.handle('POST', f'{SANDBOX}/sandbox/clear')[0] == 200
+
+
+def test_market(sync_client, stock):
+    figi = stock['figi']
+
+    stocks = sync_client.get_market_stocks().payload
+    assert stocks.total == 5
+    assert [i.figi for i in stocks.instruments].count(figi) == 1
+    assert sync_client.get_market_bonds().payload.total == 5
+    assert sync_client.get_market_etfs().payload.total == 5
+    assert sync_client.get_market_currencies().payload.total == 8
+    assert sync_client.get_market_search_by_figi(figi).payload.ticker == (
+        stock['ticker']
+    )
+    found = sync_client.get_market_search_by_ticker(stock['ticker']).payload
+    assert [i.figi for i in found.instruments] == [figi]
+
+    orderbook = sync_client.get_market_orderbook(figi, 5).payload
+    assert len(orderbook.asks) == len(orderbook.bids) == 5
+    assert orderbook.bids[0].price < orderbook.asks[0].price
+
+
+def test_unknown_figi(sync_client):
+    with pytest.raises(BadRequestError) as exc_info:
+        sync_client.get_market_orderbook('unknown', 1)
+
+    assert exc_info.value.response.payload['code'] == 'NOT_FOUND'
+
+
+def test_candles(sync_client, stock, server):
+    start = server.start
+    candles = sync_client.get_market_candles(
+        stock['figi'], start, start + timedelta(hours=1), CandleResolution.min5
+    ).payload.candles
+    later = sync_client.get_market_candles(
+        stock['figi'],
+        start + timedelta(minutes=30),
+        start + timedelta(hours=2),
+        CandleResolution.min5,
+    ).payload.candles
+
+    assert len(candles) == 12
+    assert candles[6:] == later[:6]
+    assert all(c.l <= min(c.o, c.c) and c.h >= max(c.o, c.c) for c in candles)
+    assert candles[1].o == candles[0].c
+
+
+def test_stream_candles(sync_client, stock, server):
+    args = (stock['figi'], server.start, server.start + timedelta(hours=1))
+
+    candles = sync_client.get_market_candles(*args, CandleResolution.min5)
+    streamed = sync_client.stream_market_candles(*args, CandleResolution.min5)
+
+    assert list(streamed) == candles.payload.candles
+
+
+def test_orders(sync_client, stock):
+    figi = stock['figi']
+    body = LimitOrderRequest(lots=2, operation=OperationType.buy, price=10)
+
+    order_id = sync_client.post_orders_limit_order(figi, body).payload.order_id
+    assert [o.order_id for o in sync_client.get_orders().payload] == [order_id]
+
+    sync_client.post_orders_cancel(order_id)
+    assert sync_client.get_orders().payload == []
+    with pytest.raises(BadRequestError):
+        sync_client.post_orders_cancel(order_id)
+
+
+def test_market_order(sync_client, stock):
+    figi = stock['figi']
+    body = MarketOrderRequest(lots=3, operation=OperationType.buy)
+    before = {
+        c.currency: c.balance
+        for c in sync_client.get_portfolio_currencies().payload.currencies
+    }
+
+    order = sync_client.post_orders_market_order(figi, body).payload
+
+    positions = sync_client.get_portfolio().payload.positions
+    after = {
+        c.currency: c.balance
+        for c in sync_client.get_portfolio_currencies().payload.currencies
+    }
+    assert order.executed_lots == 3
+    assert any(p.figi == figi and p.balance >= 3 for p in positions)
+    assert after[stock['currency']] < before[stock['currency']]
+
+
+def test_operations(sync_client, server):
+    end = server.start
+    operations = sync_client.get_operations(end - timedelta(days=365), end).payload
+    figi = operations.operations[0].figi
+
+    assert len(operations.operations) == 50
+    assert all(
+        o.figi == figi
+        for o in sync_client.get_operations(
+            end - timedelta(days=365), end, figi
+        ).payload.operations
+    )
+    assert (
+        list(sync_client.stream_operations(end - timedelta(days=365), end))
+        == operations.operations
+    )
+    assert (
+        sync_client.get_operations(
+            datetime(2000, 1, 1, tzinfo=timezone.utc), datetime(2000, 1, 2)
+        ).payload.operations
+        == []
+    )
+
+
+def test_sandbox(sync_client, stock):
+    account = sync_client.register_sandbox_account(
+        SandboxRegisterRequest.tinkoff_iis()
+    ).payload
+    account_id = account.broker_account_id
+    assert account.broker_account_type == BrokerAccountType.tinkoff_iis
+
+    sync_client.set_sandbox_currencies_balance(
+        SandboxSetCurrencyBalanceRequest(balance=10, currency='EUR'), account_id
+    )
+    sync_client.set_sandbox_positions_balance(
+        SandboxSetPositionBalanceRequest(balance=7, figi=stock['figi']), account_id
+    )
+    assert {
+        c.currency.value: c.balance
+        for c in sync_client.get_portfolio_currencies(account_id).payload.currencies
+    }['EUR'] == 10
+
+    sync_client.clear_sandbox_account(account_id)
+    assert sync_client.get_portfolio(account_id).payload.positions == []
+
+    sync_client.remove_sandbox_account(account_id)
+    accounts = sync_client.get_accounts().payload.accounts
+    assert account_id not in [a.broker_account_id for a in accounts]
+    with pytest.raises(BadRequestError):
+        sync_client.get_portfolio(account_id)
+
+
+@pytest.mark.asyncio
+async def test_async_client(token, server, stock):
+    transport = FakeTransport(server, latency=0.001)
+    body = LimitOrderRequest(lots=1, operation=OperationType.sell, price=10)
+
+    async with AsyncClient(token, transport=transport) as client:
+        results = await client.place_orders([(stock['figi'], body)] * 10)
+        orders = (await client.get_orders()).payload
+        operations = [
+            o
+            async for o in client.stream_operations(
+                server.start - timedelta(days=365), server.start
+            )
+        ]
+
+    assert all(r.ok for r in results)
+    assert len({o.order_id for o in orders}) == 10
+    assert len(operations) == 50
+    assert server.requests == 12
@@ -0,0 +1,127 @@
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+from tinvest import (
+    AsyncClient,
+    LimitOrderRequest,
+    LimitOrderResponse,
+    MarketOrderRequest,
+    MarketOrderResponse,
+    OperationType,
+)
+from tinvest.gateway import LatencyHistogram, OrderGateway
+from tinvest.utils import dump_model
+
+
+@pytest.fixture()
+def client(mocker):
+    c = mocker.Mock(AsyncClient)
+    c._request = mocker.AsyncMock(return_value='response')
+    c.get_accounts = mocker.AsyncMock()
+    return c
+
+
+@pytest.fixture()
+def gateway(client):
+    return OrderGateway(client, keepalive_interval=0.01, connections=3)
+
+
+@pytest.mark.parametrize('price', [75.5, Decimal('75.5000'), 75])
+def test_limit_order_template(gateway, figi, broker_account_id, price):
+    template = gateway.limit_order_template(figi, OperationType.sell, broker_account_id)
+
+    assert template.params == {'figi': figi, 'brokerAccountId': broker_account_id}
+    body = LimitOrderRequest(lots=2, operation=OperationType.sell, price=price)
+
+    assert json.loads(template.body(2, price), parse_float=Decimal) == json.loads(
+        dump_model(body), parse_float=Decimal
+    )
+
+
+def test_market_order_template(gateway, figi):
+    template = gateway.market_order_template(figi, OperationType.buy)
+
+    assert template.params == {'figi': figi}
+    assert template.body(1) == dump_model(
+        MarketOrderRequest(lots=1, operation=OperationType.buy)
+    )
+
+
+def test_invalid_price(gateway, figi):
+    template = gateway.limit_order_template(figi, OperationType.buy)
+
+    with pytest.raises(TypeError):
+        template.body(1, '1')
+    with pytest.raises(TypeError):
+        template.body(1, True)
+
+
+@pytest.mark.parametrize(
+    'price', [float('nan'), float('inf'), Decimal('NaN'), Decimal('-Infinity')]
+)
+def test_non_finite_price(gateway, figi, price):
+    template = gateway.limit_order_template(figi, OperationType.buy)
+
+    with pytest.raises(ValueError, match='finite'):
+        template.body(1, price)
+
+
+@pytest.mark.asyncio
+async def test_limit_order(gateway, client, figi):
+    template = gateway.limit_order_template(figi, OperationType.buy)
+
+    assert await gateway.limit_order(template, 1, 10.5) == 'response'
+
+    client._request.assert_called_once_with(
+        'POST',
+        '/orders/limit-order',
+        LimitOrderResponse,
+        params={'figi': figi},
+        data=template.body(1, 10.5),
+    )
+    assert gateway.latency.count == 1
+    assert gateway.latency_by_path['/orders/limit-order'].count == 1
+
+
+@pytest.mark.asyncio
+async def test_market_order(gateway, client, figi):
+    template = gateway.market_order_template(figi, OperationType.buy)
+
+    await gateway.market_order(template, 1)
+
+    assert client._request.call_args.args[2] is MarketOrderResponse
+
+
+@pytest.mark.asyncio
+async def test_keep_alive(gateway, client):
+    client.get_accounts.side_effect = [None, ValueError, None, None, None, None]
+
+    async def keep_alive():
+        while client.get_accounts.call_count < 6:
+            await asyncio.sleep(0.001)
+
+    async with gateway:
+        # Warm up and a round of keep-alive pings, a failed ping is ignored
+        await asyncio.wait_for(keep_alive(), 1)
+
+    assert client.get_accounts.call_count == 6
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram([0.001, 0.01, 0.1])
+    assert histogram.percentile(50) is None
+
+    for seconds in [0.0005, 0.005, 0.005, 0.05, 1.0]:
+        histogram.record(seconds)
+
+    assert histogram.count == 5
+    assert histogram.min == 0.0005
+    assert histogram.max == 1.0
+    assert histogram.percentile(50) == 0.01
+    assert histogram.percentile(100) == 1.0
+    assert histogram.buckets() == [(0.001, 1), (0.01, 2), (0.1, 1), (float('inf'), 1)]
@@ -0,0 +1,120 @@
+# pylint:disable=redefined-outer-name
+from datetime import datetime, timedelta
+
+import pytest
+
+from tinvest import AsyncClient, OperationsResponse
+from tinvest.history import MIN_WINDOW, Windows, iter_operations
+
+
+def make_operation(operation_id, date):
+    return {
+        'id': operation_id,
+        'currency': 'RUB',
+        'date': date.isoformat(),
+        'isMarginCall': False,
+        'payment': 1,
+        'status': 'Done',
+    }
+
+
+@pytest.fixture()
+def operations():
+    start = datetime(2020, 1, 1)
+    return [make_operation(str(i), start + timedelta(days=i)) for i in range(10)]
+
+
+@pytest.fixture()
+def client(mocker, operations, tracking_id):
+    async def get_operations(from_, to, figi=None, broker_account_id=None):
+        window = [
+            op for op in operations if from_.isoformat() <= op['date'] <= to.isoformat()
+        ]
+        return OperationsResponse.parse_obj(
+            {'trackingId': tracking_id, 'payload': {'operations': window[::-1]}}
+        )
+
+    c = mocker.Mock(AsyncClient)
+    c.get_operations = mocker.AsyncMock(side_effect=get_operations)
+    return c
+
+
+@pytest.mark.asyncio
+async def test_iter_operations(client, figi, broker_account_id):
+    result = [
+        operation.id
+        async for operation in iter_operations(
+            client,
+            datetime(2020, 1, 1),
+            '2020-01-11T00:00:00+00:00',
+            figi,
+            broker_account_id,
+            window=timedelta(days=3),
+        )
+    ]
+
+    assert result == [str(i) for i in range(10)]
+    client.get_operations.assert_any_call(
+        datetime(2020, 1, 1), datetime(2020, 1, 4), figi, broker_account_id
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_operations_adapts_window(client):
+    result = [
+        operation.id
+        async for operation in iter_operations(
+            client,
+            datetime(2020, 1, 1),
+            datetime(2020, 1, 11),
+            window=timedelta(days=4),
+            max_operations=2,
+            prefetch=0,
+        )
+    ]
+
+    assert result == [str(i) for i in range(10)]
+    assert [c.args[1] - c.args[0] for c in client.get_operations.call_args_list][
+        :2
+    ] == [timedelta(days=4), timedelta(days=2)]
+
+
+@pytest.mark.asyncio
+async def test_iter_operations_splits_requested_window(client):
+    result = [
+        operation.id
+        async for operation in iter_operations(
+            client,
+            datetime(2020, 1, 1),
+            datetime(2020, 1, 11),
+            window=timedelta(days=4),
+            max_operations=2,
+            prefetch=2,
+        )
+    ]
+
+    assert result == [str(i) for i in range(10)]
+    assert [c.args[:2] for c in client.get_operations.call_args_list][:3] == [
+        (datetime(2020, 1, 1), datetime(2020, 1, 5)),
+        (datetime(2020, 1, 5), datetime(2020, 1, 9)),
+        (datetime(2020, 1, 5), datetime(2020, 1, 7)),
+    ]
+
+
+def test_async_client_iter_operations(mocker, token, broker_account_id):
+    target = mocker.patch('tinvest.clients.iter_operations', autospec=True)
+    client = AsyncClient(token, session=mocker.Mock())
+
+    client.iter_operations('from', 'to', None, broker_account_id)
+
+    target.assert_called_once_with(client, 'from', 'to', None, broker_account_id)
+
+
+def test_windows():
+    windows = Windows(datetime(2020, 1, 1), datetime(2020, 1, 2), MIN_WINDOW, 4)
+
+    assert windows.next() == (datetime(2020, 1, 1), datetime(2020, 1, 1, 1))
+    windows.adapt(5)
+    assert windows.size == MIN_WINDOW
+    windows.adapt(0)
+    assert windows.size == MIN_WINDOW * 2
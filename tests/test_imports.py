@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+import pytest
+
+import tinvest
+
+HEAVY_MODULES = ('aiohttp', 'requests', 'pydantic', 'tinvest.clients')
+
+
+def get_imported(code):
+    modules = ', '.join(repr(module) for module in HEAVY_MODULES)
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            f'{code}\nimport sys\n'
+            f'print(*[m for m in ({modules}) if m in sys.modules])',
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return result.stdout.split()
+
+
+def test_import_is_lazy():
+    assert get_imported('import tinvest; tinvest.__version__') == []
+
+
+def test_cli_import_is_lazy():
+    pytest.importorskip('typer')
+
+    assert 'tinvest.clients' not in get_imported('import tinvest.cli.app')
+
+
+def test_attributes():
+    assert set(tinvest.__all__) <= set(dir(tinvest))
+    for name in tinvest.__all__:
+        assert getattr(tinvest, name) is not None
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match='unknown'):
+        tinvest.unknown  # noqa:B018 pylint:disable=pointless-statement
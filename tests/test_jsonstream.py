@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from tinvest.jsonstream import ArrayItemsParser
+
+
+def feed_by(parser, raw, size):
+    items = []
+    for start in range(0, len(raw), size):
+        end = start + size
+        items.extend(parser.feed(raw[start:end]))
+    return items
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 1024])
+def test_array_items_parser(size):
+    items = [
+        {'name': f'Имя {i}', 'lot': i, 'nested': [i, {'k': '}]'}]} for i in range(5)
+    ]
+    raw = json.dumps(
+        {'trackingId': 'id', 'payload': {'instruments': items, 'total': 5}},
+        ensure_ascii=False,
+    ).encode()
+    parser = ArrayItemsParser('instruments')
+
+    assert feed_by(parser, raw, size) == items
+    parser.close()
+
+
+def test_array_items_parser_numbers():
+    parser = ArrayItemsParser('values')
+
+    assert feed_by(parser, b'{"values": [12, 345]}', 2) == [12, 345]
+
+
+def test_array_items_parser_empty_array():
+    parser = ArrayItemsParser('operations')
+
+    assert parser.feed(b'{"payload": {"operations": [ ]}}') == []
+    assert parser.feed(b'') == []
+    parser.close()
+
+
+def test_array_items_parser_not_completed():
+    parser = ArrayItemsParser('operations')
+    parser.feed(b'{"payload": {"operations": [{}')
+
+    with pytest.raises(ValueError, match='is not found or not completed'):
+        parser.close()
@@ -0,0 +1,131 @@
+# pylint:disable=redefined-outer-name
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from tinvest import (
+    AsyncClient,
+    Currency,
+    LazyModel,
+    LimitOrderRequest,
+    OperationsResponse,
+    OrderbookStreaming,
+    PortfolioEngine,
+    PortfolioPosition,
+    SyncClient,
+)
+from tinvest.fake import FakeServer, FakeSyncTransport, FakeTransport
+
+
+@pytest.fixture()
+def data(tracking_id):
+    operation = {
+        'id': '1',
+        'currency': 'RUB',
+        'date': '2020-01-01T00:00:00+00:00',
+        'isMarginCall': False,
+        'payment': '-1.5',
+        'status': 'Done',
+        'commission': {'currency': 'RUB', 'value': 0.5},
+        'trades': [
+            {
+                'date': '2020-01-01T00:00:00+00:00',
+                'price': 10,
+                'quantity': 1,
+                'tradeId': 't',
+            }
+        ],
+    }
+    return {'trackingId': tracking_id, 'payload': {'operations': [operation]}}
+
+
+def test_lazy_model(data, tracking_id):
+    response = LazyModel(OperationsResponse, data)
+
+    (operation,) = response.payload.operations
+    assert response.tracking_id == tracking_id
+    assert response.status == 'Ok'
+    assert operation.payment == Decimal('-1.5')
+    assert operation.currency == Currency.rub
+    assert operation.date == datetime(2020, 1, 1, tzinfo=timezone.utc)
+    assert operation.commission.value == Decimal('0.5')
+    assert operation.trades[0].trade_id == 't'
+    assert operation.figi is None
+    assert operation.payment is operation.payment
+    assert response.to_model() == OperationsResponse.parse_obj(data)
+    assert response.dict() == OperationsResponse.parse_obj(data).dict()
+    assert response.json() == OperationsResponse.parse_obj(data).json()
+    assert response == LazyModel(OperationsResponse, data)
+
+
+def test_lazy_model_validates_on_access(data):
+    data['payload']['operations'][0]['payment'] = 'not a number'
+    data['payload']['operations'][0].pop('status')
+    (operation,) = LazyModel(OperationsResponse, data).payload.operations
+
+    assert operation.id == '1'
+    with pytest.raises(ValidationError):
+        operation.payment  # pylint:disable=pointless-statement
+    with pytest.raises(ValidationError):
+        operation.status  # pylint:disable=pointless-statement
+
+
+def test_lazy_model_unknown_attribute(data):
+    with pytest.raises(AttributeError):
+        LazyModel(OperationsResponse, data).unknown  # pylint:disable=W0106
+
+
+@pytest.fixture()
+def fake():
+    return FakeServer(instruments=5, operations=20)
+
+
+@pytest.mark.asyncio
+async def test_async_client_lazy(fake, token):
+    async with AsyncClient(token, transport=FakeTransport(fake)) as client:
+        response = await client.lazy(
+            AsyncClient.get_operations, fake.start - timedelta(days=365), fake.start
+        )
+
+    assert isinstance(response, LazyModel)
+    assert [o.id for o in response.payload.operations] == [
+        o['id'] for o in fake.operations
+    ]
+
+
+def test_sync_client_lazy(fake, token):
+    with SyncClient(token, transport=FakeSyncTransport(fake)) as client:
+        response = client.lazy(
+            SyncClient.get_market_orderbook, next(iter(fake.prices)), 5
+        )
+
+    assert isinstance(response, LazyModel)
+    assert response.payload.depth == 5
+    with pytest.raises(TypeError):
+        client.lazy(SyncClient.post_orders_cancel, '1')
+
+
+@pytest.mark.asyncio
+async def test_lazy_is_per_call(fake, token):
+    figi = next(iter(fake.positions))
+    async with AsyncClient(token, transport=FakeTransport(fake)) as client:
+        engine = PortfolioEngine(client)
+        lazy, snapshot, orders, _ = await asyncio.gather(
+            client.lazy(AsyncClient.get_portfolio),
+            client.snapshot(),
+            client.place_orders(
+                [(figi, LimitOrderRequest(lots=1, operation='Buy', price=1))]
+            ),
+            engine.load(),
+        )
+
+    assert isinstance(lazy, LazyModel)
+    assert lazy.payload.positions[0].figi in fake.positions
+    assert isinstance(snapshot.positions[0].position, PortfolioPosition)
+    assert orders[0].error is None
+    tick = OrderbookStreaming(figi=figi, depth=1, bids=[(10, 1)], asks=[(12, 1)])
+    assert engine.apply(tick)
+    assert engine.get(figi).price == Decimal(11)
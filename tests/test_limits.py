@@ -0,0 +1,26 @@
+import pytest
+
+from tinvest.limits import RateLimiter
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_rate_limiter(mocker):
+    monotonic = mocker.patch('tinvest.limits.time.monotonic', return_value=0.0)
+    sleep = mocker.patch('tinvest.limits.asyncio.sleep', new_callable=mocker.AsyncMock)
+    limiter = RateLimiter(2, 1.0)
+
+    async with limiter:
+        await limiter.acquire()
+    sleep.assert_not_called()
+
+    monotonic.return_value = 0.25
+    await limiter.acquire()
+
+    sleep.assert_called_once_with(0.25)
+
+
+@pytest.mark.parametrize(('rate', 'period'), [(0, 1.0), (1, 0)])
+async def test_invalid_rate_limiter(rate, period):
+    with pytest.raises(ValueError, match='Rate and period must be positive'):
+        RateLimiter(rate, period)
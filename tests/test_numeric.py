@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from tinvest import (
+    CandlesResponse,
+    Empty,
+    LimitOrderResponse,
+    Orderbook,
+    OrderbookStreamingResponse,
+)
+from tinvest.numeric import float_model
+
+
+def test_float_model():
+    model = float_model(CandlesResponse)
+    response = model.parse_obj(
+        {
+            'trackingId': 'id',
+            'payload': {
+                'figi': 'figi',
+                'interval': 'day',
+                'candles': [
+                    {
+                        'figi': 'figi',
+                        'interval': 'day',
+                        'o': '1.5',
+                        'c': 2,
+                        'h': 3,
+                        'l': 1,
+                        'v': 10,
+                        'time': '2020-01-01T00:00:00+00:00',
+                    }
+                ],
+            },
+        }
+    )
+
+    assert issubclass(model, CandlesResponse)
+    assert model.__name__ == 'CandlesResponse'
+    assert isinstance(response.payload.candles[0].o, float)
+    assert response.payload.candles[0].o == 1.5
+    assert float_model(CandlesResponse) is model
+
+
+def test_float_model_keeps_aliases_and_optional():
+    orderbook = float_model(Orderbook).parse_obj(
+        {
+            'figi': 'figi',
+            'depth': 1,
+            'asks': [],
+            'bids': [{'price': '1.25', 'quantity': 1}],
+            'tradeStatus': 'NormalTrading',
+            'minPriceIncrement': '0.01',
+        }
+    )
+
+    assert orderbook.min_price_increment == 0.01
+    assert orderbook.bids[0].price == 1.25
+    assert orderbook.last_price is None
+
+
+def test_float_model_tuples():
+    response = float_model(OrderbookStreamingResponse).parse_obj(
+        {
+            'time': '2020-01-01T00:00:00+00:00',
+            'payload': {'figi': 'figi', 'depth': 1, 'bids': [[1.5, 2]], 'asks': []},
+        }
+    )
+
+    assert response.payload.bids == [(1.5, 2.0)]
+    assert isinstance(response.payload.bids[0][0], float)
+
+
+def test_float_model_without_decimals():
+    assert float_model(Empty) is Empty
+
+
+def test_float_model_keeps_order_placement():
+    assert float_model(LimitOrderResponse) is LimitOrderResponse
+    payload = LimitOrderResponse.__fields__['payload'].type_
+    commission = payload.__fields__['commission'].type_
+    assert commission.__fields__['value'].type_ is Decimal
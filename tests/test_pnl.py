@@ -0,0 +1,194 @@
+# pylint:disable=redefined-outer-name
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from tinvest import (
+    AsyncClient,
+    CandleResolution,
+    CandleStreaming,
+    CandleStreamingResponse,
+    Currency,
+    OrderbookStreaming,
+    OrderbookStreamingResponse,
+    OrderStatus,
+    PortfolioEngine,
+    PortfolioResponse,
+)
+from tinvest.tracker import OrderEvent, TrackedOrder
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_portfolio(figi, tracking_id, balance=10):
+    return PortfolioResponse.parse_obj(
+        {
+            'trackingId': tracking_id,
+            'payload': {
+                'positions': [
+                    {
+                        'name': 'Some',
+                        'figi': figi,
+                        'instrumentType': 'Stock',
+                        'balance': balance,
+                        'lots': balance,
+                        'averagePositionPrice': {'currency': 'USD', 'value': 100},
+                        'expectedYield': {'currency': 'USD', 'value': 50},
+                    },
+                    {
+                        'name': 'Rub',
+                        'figi': 'RUB',
+                        'instrumentType': 'Currency',
+                        'balance': 1,
+                        'lots': 1,
+                    },
+                ]
+            },
+        }
+    )
+
+
+def make_orderbook(figi, bid, ask):
+    return OrderbookStreamingResponse(
+        time=datetime.utcnow(),
+        payload=OrderbookStreaming(figi=figi, depth=1, bids=bid, asks=ask),
+    )
+
+
+@pytest.fixture()
+def client(mocker, figi, tracking_id):
+    c = mocker.Mock(AsyncClient)
+    c.get_portfolio = mocker.AsyncMock(return_value=make_portfolio(figi, tracking_id))
+    return c
+
+
+@pytest.fixture()
+async def engine(client, broker_account_id):
+    e = PortfolioEngine(client, broker_account_id, resync_interval=0.01)
+    await e.load()
+    return e
+
+
+async def test_load(engine, client, figi, broker_account_id):
+    client.get_portfolio.assert_called_once_with(broker_account_id)
+    assert engine.figis() == [figi, 'RUB']
+    assert engine.get(figi).price == Decimal(105)
+    assert engine.get('RUB').price is None
+    assert engine.get('unknown') is None
+    assert engine.total() == {Currency.usd: Decimal(1050)}
+    assert engine.expected_yield() == {Currency.usd: Decimal(50)}
+
+
+async def test_apply(engine, figi):
+    assert engine.apply(make_orderbook(figi, [(110, 1)], [(112, 1)]))
+    assert engine.total() == {Currency.usd: Decimal(1110)}
+    assert engine.expected_yield() == {Currency.usd: Decimal(110)}
+
+    candle = CandleStreaming(
+        figi=figi,
+        interval=CandleResolution.min1,
+        o=1,
+        h=1,
+        l=1,
+        c=90,
+        v=1,
+        time=datetime.utcnow(),
+    )
+    assert engine.apply(CandleStreamingResponse(time=datetime.utcnow(), payload=candle))
+    assert engine.total() == {Currency.usd: Decimal(900)}
+    assert engine.expected_yield() == {Currency.usd: Decimal(-100)}
+    assert [p.market_value for p in engine.positions()] == [Decimal(900), None]
+
+
+async def test_apply_skipped(engine, figi):
+    assert not engine.apply(make_orderbook(figi, [], [(112, 1)]))
+    assert not engine.apply(make_orderbook('unknown', [(1, 1)], [(2, 1)]))
+    assert not engine.apply(None)
+    assert engine.total() == {Currency.usd: Decimal(1050)}
+
+
+async def test_load_keeps_streamed_price(engine, client, figi, tracking_id):
+    engine.update_price(figi, Decimal(120))
+    client.get_portfolio.return_value = make_portfolio(figi, tracking_id, 20)
+
+    await engine.load()
+
+    assert engine.total() == {Currency.usd: Decimal(2400)}
+
+
+async def test_resync_on_fill(mocker, client, figi, tracking_id):
+    engine = PortfolioEngine(client, resync_interval=10)
+    order = TrackedOrder(
+        order_id='1',
+        figi=figi,
+        operation='Buy',
+        status=OrderStatus.fill,
+        requested_lots=1,
+        executed_lots=1,
+    )
+    loaded = asyncio.Event()
+
+    async def get_portfolio(_):
+        loaded.set()
+        return make_portfolio(figi, tracking_id)
+
+    async def events():
+        yield make_orderbook(figi, [(110, 1)], [(112, 1)])
+        engine.on_order_event(OrderEvent(order=order, previous_status=None))
+        await loaded.wait()
+
+    client.get_portfolio.side_effect = get_portfolio
+    streaming = mocker.MagicMock()
+    streaming.__aiter__.side_effect = events
+    await asyncio.wait_for(engine.run(streaming), 1)
+
+    client.get_portfolio.assert_called_once_with(None)
+    assert engine.get(figi).price == Decimal(111)
+
+
+async def test_subscribe(mocker, engine, figi):
+    streaming = mocker.Mock()
+    streaming.orderbook.subscribe = mocker.AsyncMock()
+
+    await engine.subscribe(streaming, 5)
+
+    streaming.orderbook.subscribe.assert_has_calls(
+        [mocker.call(figi, 5), mocker.call('RUB', 5)]
+    )
+
+
+async def test_resubscribe_on_resync(mocker, client, figi, tracking_id):
+    engine = PortfolioEngine(client, resync_interval=10)
+    await engine.load()
+    streaming = mocker.MagicMock()
+    streaming.orderbook.subscribe = mocker.AsyncMock()
+    streaming.orderbook.unsubscribe = mocker.AsyncMock()
+    await engine.subscribe(streaming, 5)
+    streaming.orderbook.subscribe.reset_mock()
+
+    order = TrackedOrder(
+        order_id='1',
+        figi='NEW',
+        operation='Buy',
+        status=OrderStatus.fill,
+        requested_lots=1,
+        executed_lots=1,
+    )
+    subscribed = asyncio.Event()
+    streaming.orderbook.subscribe.side_effect = lambda *_: subscribed.set()
+
+    async def events():
+        engine.on_order_event(OrderEvent(order=order, previous_status=None))
+        await subscribed.wait()
+        yield make_orderbook('NEW', [(110, 1)], [(112, 1)])
+
+    # The fill opens a position in NEW and closes the one in figi
+    client.get_portfolio.return_value = make_portfolio('NEW', tracking_id)
+    streaming.__aiter__.side_effect = events
+    await asyncio.wait_for(engine.run(streaming), 1)
+
+    streaming.orderbook.subscribe.assert_called_once_with('NEW', 5)
+    streaming.orderbook.unsubscribe.assert_called_once_with(figi, 5)
+    assert engine.get('NEW').price == Decimal(111)
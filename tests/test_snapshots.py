@@ -0,0 +1,141 @@
+# pylint:disable=redefined-outer-name
+from decimal import Decimal
+
+import pytest
+
+from tinvest import (
+    AsyncClient,
+    Currency,
+    OrderbookResponse,
+    OrdersResponse,
+    PortfolioCurrenciesResponse,
+    PortfolioResponse,
+)
+from tinvest.exceptions import UnexpectedError
+from tinvest.snapshots import get_mark_price, get_portfolio_snapshot
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_orderbook(figi, tracking_id, last_price=None, close_price=None):
+    return OrderbookResponse.parse_obj(
+        {
+            'trackingId': tracking_id,
+            'payload': {
+                'figi': figi,
+                'depth': 1,
+                'asks': [{'price': 11, 'quantity': 1}],
+                'bids': [{'price': 9, 'quantity': 1}],
+                'tradeStatus': 'NormalTrading',
+                'minPriceIncrement': 0.01,
+                'lastPrice': last_price,
+                'closePrice': close_price,
+            },
+        }
+    )
+
+
+@pytest.fixture()
+def portfolio(figi, tracking_id):
+    return PortfolioResponse.parse_obj(
+        {
+            'trackingId': tracking_id,
+            'payload': {
+                'positions': [
+                    {
+                        'name': 'Some',
+                        'figi': figi,
+                        'instrumentType': 'Stock',
+                        'balance': 10,
+                        'lots': 10,
+                        'averagePositionPrice': {'currency': 'USD', 'value': 100},
+                    }
+                ]
+            },
+        }
+    )
+
+
+@pytest.fixture()
+def client(mocker, portfolio, figi, tracking_id):
+    c = mocker.Mock(AsyncClient)
+    c.get_portfolio = mocker.AsyncMock(return_value=portfolio)
+    c.get_portfolio_currencies = mocker.AsyncMock(
+        return_value=PortfolioCurrenciesResponse.parse_obj(
+            {
+                'trackingId': tracking_id,
+                'payload': {'currencies': [{'currency': 'USD', 'balance': 5}]},
+            }
+        )
+    )
+    c.get_orders = mocker.AsyncMock(
+        return_value=OrdersResponse.parse_obj(
+            {'trackingId': tracking_id, 'payload': []}
+        )
+    )
+    c.get_market_orderbook = mocker.AsyncMock(
+        return_value=make_orderbook(figi, tracking_id, last_price=110)
+    )
+    return c
+
+
+async def test_snapshot(client, figi, broker_account_id):
+    snapshot = await get_portfolio_snapshot(client, broker_account_id)
+
+    (valuation,) = snapshot.positions
+    assert valuation.price == Decimal(110)
+    assert valuation.market_value == Decimal(1100)
+    assert valuation.expected_yield == Decimal(100)
+    assert snapshot.total() == {Currency.usd: Decimal(1100)}
+    assert snapshot.currencies[0].balance == Decimal(5)
+    assert snapshot.broker_account_id == broker_account_id
+    client.get_portfolio.assert_called_once_with(broker_account_id)
+    client.get_market_orderbook.assert_called_once_with(figi, 1)
+
+
+async def test_snapshot_with_known_figis(client, figi):
+    await get_portfolio_snapshot(client, figis=[figi, figi], depth=5)
+
+    client.get_market_orderbook.assert_called_once_with(figi, 5)
+
+
+async def test_snapshot_orderbook_error(client, portfolio, figi, tracking_id):
+    portfolio.payload.positions.append(
+        portfolio.payload.positions[0].copy(update={'figi': 'DELISTED'})
+    )
+    client.get_market_orderbook.side_effect = [
+        make_orderbook(figi, tracking_id, last_price=110),
+        UnexpectedError(500, 'error'),
+    ]
+
+    snapshot = await get_portfolio_snapshot(client)
+
+    assert [v.price for v in snapshot.positions] == [Decimal(110), None]
+    assert snapshot.total() == {Currency.usd: Decimal(1100)}
+    assert list(snapshot.errors) == ['DELISTED']
+
+
+async def test_snapshot_error(client):
+    client.get_portfolio.side_effect = UnexpectedError(500, 'error')
+
+    with pytest.raises(UnexpectedError):
+        await get_portfolio_snapshot(client)
+
+
+async def test_async_client_snapshot(mocker, token, broker_account_id):
+    target = mocker.patch('tinvest.clients.get_portfolio_snapshot', autospec=True)
+    client = AsyncClient(token, session=mocker.Mock())
+
+    await client.snapshot(broker_account_id)
+
+    target.assert_called_once_with(client, broker_account_id, None, 1)
+
+
+@pytest.mark.parametrize(
+    ('last_price', 'close_price', 'expected'),
+    [(12, None, Decimal(12)), (None, 8, Decimal(10))],
+)
+async def test_get_mark_price(figi, tracking_id, last_price, close_price, expected):
+    orderbook = make_orderbook(figi, tracking_id, last_price, close_price).payload
+
+    assert get_mark_price(orderbook) == expected
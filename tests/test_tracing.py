@@ -0,0 +1,236 @@
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+from datetime import datetime, timedelta
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from tinvest import AsyncClient, BadRequestError, SyncClient, Tracer
+from tinvest.fake import FakeServer, FakeSyncTransport, FakeTransport
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.started = []
+        self.phases = []
+        self.spans = []
+
+    def on_start(self, span):
+        self.started.append(span)
+
+    def on_phase(self, span, phase, seconds):
+        self.phases.append(phase)
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture()
+def tracer():
+    return RecordingTracer()
+
+
+@pytest.fixture()
+def server():
+    return FakeServer(instruments=2, operations=10)
+
+
+@pytest.fixture()
+def sync_client(token, server, tracer):
+    return SyncClient(token, transport=FakeSyncTransport(server), tracer=tracer)
+
+
+def test_request(sync_client, tracer):
+    sync_client.get_accounts()
+
+    (span,) = tracer.spans
+    assert tracer.started == [span]
+    assert (span.method, span.path, span.status) == ('GET', '/user/accounts', 200)
+    assert span.tracking_id == 'fake1'
+    assert span.error is None
+    assert tracer.phases == ['response', 'read', 'decode', 'validate']
+    assert list(span.phases) == tracer.phases
+    assert 0 < sum(span.phases.values()) <= span.duration
+
+
+def test_bad_request(sync_client, tracer):
+    with pytest.raises(BadRequestError) as exc_info:
+        sync_client.get_market_orderbook('unknown', 1)
+
+    (span,) = tracer.spans
+    assert span.error is exc_info.value
+    assert span.status == 400
+    assert span.tracking_id == 'fake1'
+
+
+def test_stream(sync_client, tracer, server):
+    operations = list(
+        sync_client.stream_operations(server.start - timedelta(days=365), server.start)
+    )
+
+    (span,) = tracer.spans
+    assert len(operations) == 10
+    assert (span.path, span.status) == ('/operations', 200)
+    assert list(span.phases) == ['response', 'read']
+
+
+@pytest.mark.asyncio
+async def test_async_client(token, server, tracer):
+    async with AsyncClient(
+        token, transport=FakeTransport(server), tracer=tracer
+    ) as client:
+        await client.get_portfolio()
+        stream = client.stream_operations(
+            server.start - timedelta(days=365), server.start
+        )
+        await stream.__anext__()
+        await stream.aclose()
+
+    portfolio, operations = tracer.spans
+    assert portfolio.path == '/portfolio'
+    assert portfolio.tracking_id == 'fake1'
+    assert operations.error is None
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_phases(token, tracer, tracking_id):
+    async def cancel(_):
+        return web.json_response(
+            {'trackingId': tracking_id, 'status': 'Ok', 'payload': {}}
+        )
+
+    app = web.Application()
+    app.router.add_post('/orders/cancel', cancel)
+    async with TestServer(app) as server:
+        async with AsyncClient(token, tracer=tracer) as client:
+            client._base_url = str(server.make_url(''))
+            await client.post_orders_cancel('1')
+            await client.post_orders_cancel('2')
+
+    first, second = tracer.spans
+    assert list(first.phases) == [
+        'connect',
+        'send',
+        'response',
+        'read',
+        'decode',
+        'validate',
+    ]
+    assert second.phases.keys() == first.phases.keys()
+    assert first.tracking_id == tracking_id
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_stream_phases(token, tracer, tracking_id):
+    async def operations(request):
+        if request.query['figi'] == 'unknown':
+            return web.json_response(
+                {
+                    'trackingId': tracking_id,
+                    'status': 'Error',
+                    'payload': {'message': 'Unknown figi', 'code': 'NOT_FOUND'},
+                },
+                status=400,
+            )
+        return web.json_response(
+            {'trackingId': tracking_id, 'status': 'Ok', 'payload': {'operations': []}}
+        )
+
+    app = web.Application()
+    app.router.add_get('/operations', operations)
+    async with TestServer(app) as server:
+        async with AsyncClient(token, tracer=tracer) as client:
+            client._base_url = str(server.make_url(''))
+            start = datetime(2020, 1, 1)
+            async for _ in client.stream_operations(start, start, 'BBG0013HGFT4'):
+                pass
+            with pytest.raises(BadRequestError):
+                async for _ in client.stream_operations(start, start, 'unknown'):
+                    pass
+
+    ok, error = tracer.spans
+    assert list(ok.phases) == ['connect', 'send', 'response', 'read']
+    assert (ok.status, ok.error) == (200, None)
+    assert (error.status, error.tracking_id) == (400, tracking_id)
+    assert isinstance(error.error, BadRequestError)
+
+
+def test_prometheus(token, server):
+    prometheus_client = pytest.importorskip('prometheus_client')
+    prometheus = pytest.importorskip('tinvest.prometheus')
+    registry = prometheus_client.CollectorRegistry()
+    client = SyncClient(
+        token,
+        transport=FakeSyncTransport(server),
+        tracer=prometheus.PrometheusTracer(registry),
+    )
+
+    client.get_accounts()
+    with pytest.raises(BadRequestError):
+        client.post_orders_cancel('unknown')
+
+    assert (
+        registry.get_sample_value(
+            'tinvest_request_duration_seconds_count',
+            {'method': 'GET', 'path': '/user/accounts', 'status': '200'},
+        )
+        == 1
+    )
+    assert (
+        registry.get_sample_value(
+            'tinvest_request_phase_seconds_count',
+            {'path': '/user/accounts', 'phase': 'decode'},
+        )
+        == 1
+    )
+    assert (
+        registry.get_sample_value(
+            'tinvest_request_errors_total',
+            {'path': '/orders/cancel', 'error': 'BadRequestError'},
+        )
+        == 1
+    )
+
+
+def test_prometheus_shared_registry():
+    prometheus_client = pytest.importorskip('prometheus_client')
+    prometheus = pytest.importorskip('tinvest.prometheus')
+    registry = prometheus_client.CollectorRegistry()
+
+    first = prometheus.PrometheusTracer(registry)
+    second = prometheus.PrometheusTracer(registry)
+    other = prometheus.PrometheusTracer(registry, namespace='other')
+
+    assert second.requests is first.requests
+    assert other.requests is not first.requests
+    assert prometheus.PrometheusTracer(None).requests is not first.requests
+
+
+def test_opentelemetry(token, server):
+    sdk_trace = pytest.importorskip('opentelemetry.sdk.trace')
+    export = pytest.importorskip('opentelemetry.sdk.trace.export')
+    in_memory = pytest.importorskip(
+        'opentelemetry.sdk.trace.export.in_memory_span_exporter'
+    )
+    otel = pytest.importorskip('tinvest.otel')
+    exporter = in_memory.InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(export.SimpleSpanProcessor(exporter))
+    client = SyncClient(
+        token,
+        transport=FakeSyncTransport(server),
+        tracer=otel.OpenTelemetryTracer(provider),
+    )
+
+    client.get_accounts()
+    with pytest.raises(BadRequestError):
+        client.post_orders_cancel('unknown')
+
+    accounts, cancel = exporter.get_finished_spans()
+    assert accounts.name == 'GET /user/accounts'
+    assert accounts.attributes['tinvest.tracking_id'] == 'fake1'
+    assert accounts.attributes['http.response.status_code'] == 200
+    assert accounts.attributes['tinvest.phase.validate'] > 0
+    assert accounts.end_time > accounts.start_time
+    assert not cancel.status.is_ok
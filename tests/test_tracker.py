@@ -0,0 +1,298 @@
+# pylint:disable=redefined-outer-name,too-many-arguments,too-many-positional-arguments
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from tinvest import (
+    AsyncClient,
+    LimitOrderRequest,
+    LimitOrderResponse,
+    MarketOrderRequest,
+    MarketOrderResponse,
+    OperationsResponse,
+    OperationType,
+    OrdersResponse,
+    OrderStatus,
+)
+from tinvest.tracker import OPERATIONS_LOOKBACK, OrderTracker
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_placed(order_id, status='New', executed_lots=0):
+    return {
+        'orderId': order_id,
+        'operation': 'Buy',
+        'status': status,
+        'requestedLots': 2,
+        'executedLots': executed_lots,
+    }
+
+
+def make_orders(tracking_id, figi, *orders):
+    return OrdersResponse.parse_obj(
+        {
+            'trackingId': tracking_id,
+            'payload': [
+                {
+                    'orderId': order_id,
+                    'figi': figi,
+                    'operation': 'Buy',
+                    'status': status,
+                    'type': 'Limit',
+                    'price': 10,
+                    'requestedLots': 2,
+                    'executedLots': executed_lots,
+                }
+                for order_id, status, executed_lots in orders
+            ],
+        }
+    )
+
+
+def make_operations(tracking_id, figi, *operations):
+    return OperationsResponse.parse_obj(
+        {
+            'trackingId': tracking_id,
+            'payload': {
+                'operations': [
+                    {
+                        'id': operation_id,
+                        'figi': figi,
+                        'currency': 'USD',
+                        'date': '2020-01-01T00:00:00+00:00',
+                        'isMarginCall': False,
+                        'operationType': 'Buy',
+                        'payment': -20,
+                        'quantity': 20,
+                        'quantityExecuted': quantity_executed,
+                        'status': status,
+                    }
+                    for operation_id, status, quantity_executed in operations
+                ]
+            },
+        }
+    )
+
+
+@pytest.fixture()
+def client(mocker, tracking_id, figi):
+    c = mocker.Mock(AsyncClient)
+    c.post_orders_limit_order = mocker.AsyncMock(
+        return_value=LimitOrderResponse.parse_obj(
+            {'trackingId': tracking_id, 'payload': make_placed('1')}
+        )
+    )
+    c.post_orders_market_order = mocker.AsyncMock(
+        return_value=MarketOrderResponse.parse_obj(
+            {'trackingId': tracking_id, 'payload': make_placed('2', 'Fill', 2)}
+        )
+    )
+    c.post_orders_cancel = mocker.AsyncMock()
+    c.get_orders = mocker.AsyncMock()
+    c.get_operations = mocker.AsyncMock(
+        return_value=make_operations(tracking_id, figi, ('1', 'Done', 20))
+    )
+    return c
+
+
+@pytest.fixture()
+def tracker(client, broker_account_id):
+    return OrderTracker(
+        client, broker_account_id, active_interval=0.001, idle_interval=0.001
+    )
+
+
+@pytest.fixture()
+def limit_order_request():
+    return LimitOrderRequest(lots=2, operation=OperationType.buy, price=10)
+
+
+async def test_limit_order_fill(
+    tracker, client, figi, tracking_id, broker_account_id, limit_order_request
+):
+    events = []
+    tracker.add_listener(events.append)
+    order = await tracker.limit_order(figi, limit_order_request)
+    client.get_orders.side_effect = [
+        make_orders(tracking_id, figi, ('1', 'PartiallyFill', 1)),
+        make_orders(tracking_id, figi),
+    ]
+
+    assert order.price == Decimal(10)
+    await tracker.poll()
+    assert tracker.get('1').executed_lots == 1
+    await tracker.poll()
+
+    assert tracker.get('1').status == OrderStatus.fill
+    assert tracker.get('1').executed_lots == 2
+    assert [e.order.status for e in events] == [
+        OrderStatus.new,
+        OrderStatus.partially_fill,
+        OrderStatus.fill,
+    ]
+    assert events[2].previous_status == OrderStatus.partially_fill
+    assert tracker.by_figi(figi) == [tracker.get('1')]
+    assert not tracker.open_orders()
+    client.post_orders_limit_order.assert_called_once_with(
+        figi, limit_order_request, broker_account_id
+    )
+    (from_, to, operations_figi, account_id), _ = client.get_operations.call_args
+    assert to - from_ >= OPERATIONS_LOOKBACK
+    assert (operations_figi, account_id) == (figi, broker_account_id)
+
+
+async def test_evicts_closed_orders(
+    client, figi, tracking_id, broker_account_id, limit_order_request
+):
+    tracker = OrderTracker(client, broker_account_id, retention=0)
+    await tracker.limit_order(figi, limit_order_request)
+    client.get_orders.return_value = make_orders(tracking_id, figi)
+
+    await tracker.poll()
+    assert tracker.get('1').status == OrderStatus.fill
+    await tracker.poll()
+
+    assert tracker.get('1') is None
+    assert tracker.by_figi(figi) == []
+    assert not tracker._closed_at  # pylint:disable=protected-access
+    assert not tracker._seen_at  # pylint:disable=protected-access
+
+
+async def test_keeps_closed_orders_for_retention(
+    client, figi, tracking_id, broker_account_id, limit_order_request
+):
+    tracker = OrderTracker(client, broker_account_id, retention=60)
+    await tracker.limit_order(figi, limit_order_request)
+    client.get_orders.return_value = make_orders(tracking_id, figi)
+
+    await tracker.poll()
+    await tracker.poll()
+
+    assert tracker.get('1').status == OrderStatus.fill
+
+
+async def test_cancelled_outside(
+    tracker, client, figi, tracking_id, limit_order_request
+):
+    await tracker.limit_order(figi, limit_order_request)
+    client.get_orders.return_value = make_orders(tracking_id, figi)
+    client.get_operations.return_value = make_operations(
+        tracking_id, figi, ('1', 'Done', 10), ('2', 'Done', 20)
+    )
+
+    await tracker.poll()
+
+    assert tracker.get('1').status == OrderStatus.cancelled
+    assert tracker.get('1').executed_lots == 1
+
+
+async def test_gone(tracker, client, figi, tracking_id, limit_order_request):
+    events = []
+    tracker.add_listener(events.append)
+    await tracker.limit_order(figi, limit_order_request)
+    client.get_orders.return_value = make_orders(tracking_id, figi)
+    client.get_operations.return_value = make_operations(tracking_id, figi)
+
+    await tracker.poll()
+
+    order = tracker.get('1')
+    assert order.gone
+    assert order.closed
+    assert order.status == OrderStatus.new
+    assert order.executed_lots == 0
+    assert events[-1].order == order
+    assert await tracker.wait('1') == order
+
+
+async def test_operations_error(
+    tracker, client, figi, tracking_id, limit_order_request
+):
+    await tracker.limit_order(figi, limit_order_request)
+    client.get_orders.return_value = make_orders(tracking_id, figi)
+    client.get_operations.side_effect = [ValueError, client.get_operations.return_value]
+
+    with pytest.raises(ValueError):
+        await tracker.poll()
+    assert not tracker.get('1').closed
+    await tracker.poll()
+
+    assert tracker.get('1').status == OrderStatus.fill
+
+
+async def test_cancel(tracker, client, figi, tracking_id, limit_order_request):
+    await tracker.limit_order(figi, limit_order_request)
+    client.get_orders.return_value = make_orders(tracking_id, figi)
+
+    client.get_operations.return_value = make_operations(tracking_id, figi)
+
+    await tracker.cancel('1')
+    await tracker.poll()
+
+    assert tracker.get('1').status == OrderStatus.cancelled
+
+
+async def test_cancel_error(tracker, client, figi, limit_order_request):
+    await tracker.limit_order(figi, limit_order_request)
+    client.post_orders_cancel.side_effect = ValueError
+
+    with pytest.raises(ValueError):
+        await tracker.cancel('1')
+    assert tracker.get('1').status == OrderStatus.new
+
+
+async def test_wait(tracker, client, figi, tracking_id, limit_order_request):
+    client.get_orders.side_effect = [
+        make_orders(tracking_id, figi, ('1', 'New', 0)),
+        ValueError,
+        make_orders(tracking_id, figi),
+    ]
+    async with tracker:
+        await tracker.limit_order(figi, limit_order_request)
+        order = await tracker.wait('1', timeout=1)
+
+    assert order.status == OrderStatus.fill
+
+
+async def test_wait_timeout(tracker, client, figi, tracking_id, limit_order_request):
+    client.get_orders.return_value = make_orders(tracking_id, figi, ('1', 'New', 0))
+    await tracker.limit_order(figi, limit_order_request)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await tracker.wait('1', timeout=0.01)
+
+    assert not tracker._waiters  # pylint:disable=protected-access
+
+
+async def test_wait_closed(tracker, figi):
+    order = await tracker.market_order(
+        figi, MarketOrderRequest(lots=2, operation=OperationType.buy)
+    )
+
+    assert await tracker.wait(order.order_id) == order
+
+
+async def test_events(tracker, figi, limit_order_request):
+    events = tracker.events()
+    task = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+    await tracker.limit_order(figi, limit_order_request)
+
+    assert (await task).order.order_id == '1'
+    await events.aclose()
+    assert not tracker._listeners  # pylint:disable=protected-access
+
+
+async def test_poll_skips_orders_placed_later(
+    tracker, client, figi, tracking_id, limit_order_request
+):
+    async def get_orders(_):
+        await tracker.limit_order(figi, limit_order_request)
+        return make_orders(tracking_id, figi, ('3', 'New', 0))
+
+    client.get_orders.side_effect = get_orders
+    await tracker.poll()
+
+    assert tracker.get('1').status == OrderStatus.new
+    assert tracker.get('3').figi == figi
@@ -0,0 +1,52 @@
+# pylint:disable=protected-access
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tinvest.transports import (
+    AsyncResponse,
+    AsyncTransport,
+    RequestsTransport,
+    SyncResponse,
+    SyncTransport,
+)
+
+
+def test_thread_sessions():
+    transport = RequestsTransport()
+    session = transport.session
+
+    with ThreadPoolExecutor(1) as executor:
+        other = executor.submit(lambda: transport.session).result()
+    third = threading.Thread(target=lambda: transport.session)
+    third.start()
+    third.join()
+
+    assert transport.session is session
+    assert other is not session
+    assert len(transport._sessions._sessions) == 2
+    transport.close()
+    assert transport.session is not session
+
+
+def test_shared_session(mocker):
+    session = mocker.Mock()
+    transport = RequestsTransport(session)
+
+    with transport.request('GET', 'url', stream=True, params={}) as response:
+        assert response.status == session.request.return_value.status_code
+        assert response.text() == session.request.return_value.text
+
+    session.request.assert_called_once_with('GET', 'url', stream=True, params={})
+    session.request.return_value.close.assert_called_once_with()
+    transport.close()
+    session.close.assert_called_once_with()
+
+
+@pytest.mark.parametrize(
+    'cls', [AsyncTransport, SyncTransport, AsyncResponse, SyncResponse]
+)
+def test_abstract_transport(cls):
+    with pytest.raises(TypeError):
+        cls()
@@ -1,8 +1,29 @@
 from datetime import datetime
+from decimal import Decimal
 
 import pytest
 
-from tinvest.utils import Func, isoformat, set_default_headers, validate_token
+from tinvest import (
+    LimitOrderRequest,
+    MarketOrderRequest,
+    OperationType,
+    SandboxCurrency,
+    SandboxRegisterRequest,
+    SandboxSetCurrencyBalanceRequest,
+    SandboxSetPositionBalanceRequest,
+)
+from tinvest.utils import (
+    Func,
+    dump_model,
+    get_default_headers,
+    isoformat,
+    set_default_headers,
+    validate_token,
+)
+
+
+def test_get_default_headers(token, headers):
+    assert get_default_headers(token) == headers
 
 
 def test_set_default_headers(token):
@@ -63,3 +84,19 @@ def test_validate_token():
 def test_invalid_token():
     with pytest.raises(ValueError, match='Token can not be empty'):
         validate_token('')
+
+
+@pytest.mark.parametrize(
+    'model',
+    [
+        LimitOrderRequest(lots=3, operation=OperationType.buy, price=Decimal('13.5')),
+        MarketOrderRequest(lots=1, operation=OperationType.sell),
+        SandboxRegisterRequest.tinkoff_iis(),
+        SandboxSetCurrencyBalanceRequest(
+            balance=Decimal(10), currency=SandboxCurrency.usd
+        ),
+        SandboxSetPositionBalanceRequest(balance=Decimal('0.1'), figi='BBG0'),
+    ],
+)
+def test_dump_model(model):
+    assert dump_model(model) == model.json(by_alias=True)
@@ -1,87 +1,228 @@
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
 __version__ = '3.0.1'
 __api_version__ = '20.4'  # pragma: no mutate
 
-from .clients import AsyncClient, SyncClient
-from .exceptions import (
-    BadRequestError,
-    TinvestError,
-    TooManyRequestsError,
-    UnexpectedError,
-)
-from .schemas import (
-    BrokerAccountType,
-    Candle,
-    CandleResolution,
-    Candles,
-    CandlesResponse,
-    CandleStreaming,
-    CandleStreamingResponse,
-    Currencies,
-    Currency,
-    CurrencyPosition,
-    Empty,
-    Error,
-    ErrorStreaming,
-    ErrorStreamingResponse,
-    Event,
-    InstrumentInfoStreaming,
-    InstrumentInfoStreamingResponse,
-    InstrumentType,
-    LimitOrderRequest,
-    LimitOrderResponse,
-    MarketInstrument,
-    MarketInstrumentList,
-    MarketInstrumentListResponse,
-    MarketInstrumentResponse,
-    MarketOrderRequest,
-    MarketOrderResponse,
-    MoneyAmount,
-    Operation,
-    Operations,
-    OperationsResponse,
-    OperationStatus,
-    OperationTrade,
-    OperationType,
-    OperationTypeWithCommission,
-    Order,
-    Orderbook,
-    OrderbookResponse,
-    OrderbookStreaming,
-    OrderbookStreamingResponse,
-    OrderResponse,
-    OrdersResponse,
-    OrderStatus,
-    OrderType,
-    PlacedLimitOrder,
-    PlacedMarketOrder,
-    Portfolio,
-    PortfolioCurrenciesResponse,
-    PortfolioPosition,
-    PortfolioResponse,
-    SandboxAccount,
-    SandboxCurrency,
-    SandboxRegisterRequest,
-    SandboxRegisterResponse,
-    SandboxSetCurrencyBalanceRequest,
-    SandboxSetPositionBalanceRequest,
-    SearchMarketInstrument,
-    SearchMarketInstrumentResponse,
-    TradeStatus,
-    UserAccount,
-    UserAccounts,
-    UserAccountsResponse,
-)
-from .streaming import Streaming
+if TYPE_CHECKING:  # pragma: no cover
+    from .accounts import MultiAccountExecutor
+    from .background import BackgroundLoop
+    from .batch import OrderResult
+    from .clients import AsyncClient, SyncClient
+    from .config import NumericMode, configure
+    from .exceptions import (
+        BadRequestError,
+        TinvestError,
+        TooManyRequestsError,
+        UnexpectedError,
+    )
+    from .gateway import LatencyHistogram, OrderGateway, OrderTemplate
+    from .lazy import LazyModel
+    from .limits import RateLimiter
+    from .pnl import PortfolioEngine
+    from .schemas import (
+        BrokerAccountType,
+        Candle,
+        CandleResolution,
+        Candles,
+        CandlesResponse,
+        CandleStreaming,
+        CandleStreamingResponse,
+        Currencies,
+        Currency,
+        CurrencyPosition,
+        Empty,
+        Error,
+        ErrorStreaming,
+        ErrorStreamingResponse,
+        Event,
+        InstrumentInfoStreaming,
+        InstrumentInfoStreamingResponse,
+        InstrumentType,
+        LimitOrderRequest,
+        LimitOrderResponse,
+        MarketInstrument,
+        MarketInstrumentList,
+        MarketInstrumentListResponse,
+        MarketInstrumentResponse,
+        MarketOrderRequest,
+        MarketOrderResponse,
+        MoneyAmount,
+        Operation,
+        Operations,
+        OperationsResponse,
+        OperationStatus,
+        OperationTrade,
+        OperationType,
+        OperationTypeWithCommission,
+        Order,
+        Orderbook,
+        OrderbookResponse,
+        OrderbookStreaming,
+        OrderbookStreamingResponse,
+        OrderResponse,
+        OrdersResponse,
+        OrderStatus,
+        OrderType,
+        PlacedLimitOrder,
+        PlacedMarketOrder,
+        Portfolio,
+        PortfolioCurrenciesResponse,
+        PortfolioPosition,
+        PortfolioResponse,
+        SandboxAccount,
+        SandboxCurrency,
+        SandboxRegisterRequest,
+        SandboxRegisterResponse,
+        SandboxSetCurrencyBalanceRequest,
+        SandboxSetPositionBalanceRequest,
+        SearchMarketInstrument,
+        SearchMarketInstrumentResponse,
+        TradeStatus,
+        UserAccount,
+        UserAccounts,
+        UserAccountsResponse,
+    )
+    from .snapshots import PortfolioSnapshot, PositionValuation
+    from .streaming import Streaming
+    from .tracing import Span, Tracer
+    from .tracker import OrderEvent, OrderTracker, TrackedOrder
+    from .transports import (
+        AiohttpTransport,
+        AsyncTransport,
+        RequestsTransport,
+        SyncTransport,
+    )
+
+# Public names are imported from submodules on first access (PEP 562), so
+# `import tinvest` does not load aiohttp, requests and pydantic until needed
+_MODULES: Dict[str, str] = {
+    'MultiAccountExecutor': 'accounts',
+    'BackgroundLoop': 'background',
+    'OrderResult': 'batch',
+    'AsyncClient': 'clients',
+    'SyncClient': 'clients',
+    'NumericMode': 'config',
+    'configure': 'config',
+    'BadRequestError': 'exceptions',
+    'TinvestError': 'exceptions',
+    'TooManyRequestsError': 'exceptions',
+    'UnexpectedError': 'exceptions',
+    'LatencyHistogram': 'gateway',
+    'OrderGateway': 'gateway',
+    'OrderTemplate': 'gateway',
+    'LazyModel': 'lazy',
+    'RateLimiter': 'limits',
+    'PortfolioEngine': 'pnl',
+    'BrokerAccountType': 'schemas',
+    'Candle': 'schemas',
+    'CandleResolution': 'schemas',
+    'Candles': 'schemas',
+    'CandlesResponse': 'schemas',
+    'CandleStreaming': 'schemas',
+    'CandleStreamingResponse': 'schemas',
+    'Currencies': 'schemas',
+    'Currency': 'schemas',
+    'CurrencyPosition': 'schemas',
+    'Empty': 'schemas',
+    'Error': 'schemas',
+    'ErrorStreaming': 'schemas',
+    'ErrorStreamingResponse': 'schemas',
+    'Event': 'schemas',
+    'InstrumentInfoStreaming': 'schemas',
+    'InstrumentInfoStreamingResponse': 'schemas',
+    'InstrumentType': 'schemas',
+    'LimitOrderRequest': 'schemas',
+    'LimitOrderResponse': 'schemas',
+    'MarketInstrument': 'schemas',
+    'MarketInstrumentList': 'schemas',
+    'MarketInstrumentListResponse': 'schemas',
+    'MarketInstrumentResponse': 'schemas',
+    'MarketOrderRequest': 'schemas',
+    'MarketOrderResponse': 'schemas',
+    'MoneyAmount': 'schemas',
+    'Operation': 'schemas',
+    'Operations': 'schemas',
+    'OperationsResponse': 'schemas',
+    'OperationStatus': 'schemas',
+    'OperationTrade': 'schemas',
+    'OperationType': 'schemas',
+    'OperationTypeWithCommission': 'schemas',
+    'Order': 'schemas',
+    'Orderbook': 'schemas',
+    'OrderbookResponse': 'schemas',
+    'OrderbookStreaming': 'schemas',
+    'OrderbookStreamingResponse': 'schemas',
+    'OrderResponse': 'schemas',
+    'OrdersResponse': 'schemas',
+    'OrderStatus': 'schemas',
+    'OrderType': 'schemas',
+    'PlacedLimitOrder': 'schemas',
+    'PlacedMarketOrder': 'schemas',
+    'Portfolio': 'schemas',
+    'PortfolioCurrenciesResponse': 'schemas',
+    'PortfolioPosition': 'schemas',
+    'PortfolioResponse': 'schemas',
+    'SandboxAccount': 'schemas',
+    'SandboxCurrency': 'schemas',
+    'SandboxRegisterRequest': 'schemas',
+    'SandboxRegisterResponse': 'schemas',
+    'SandboxSetCurrencyBalanceRequest': 'schemas',
+    'SandboxSetPositionBalanceRequest': 'schemas',
+    'SearchMarketInstrument': 'schemas',
+    'SearchMarketInstrumentResponse': 'schemas',
+    'TradeStatus': 'schemas',
+    'UserAccount': 'schemas',
+    'UserAccounts': 'schemas',
+    'UserAccountsResponse': 'schemas',
+    'PortfolioSnapshot': 'snapshots',
+    'PositionValuation': 'snapshots',
+    'Streaming': 'streaming',
+    'Span': 'tracing',
+    'Tracer': 'tracing',
+    'OrderEvent': 'tracker',
+    'OrderTracker': 'tracker',
+    'TrackedOrder': 'tracker',
+    'AiohttpTransport': 'transports',
+    'AsyncTransport': 'transports',
+    'RequestsTransport': 'transports',
+    'SyncTransport': 'transports',
+}
 
 __all__ = (
+    # Settings
+    'configure',
+    'NumericMode',
+    'LazyModel',
     # Clients
     'AsyncClient',
     'SyncClient',
+    'BackgroundLoop',
+    'MultiAccountExecutor',
+    'RateLimiter',
+    'AsyncTransport',
+    'SyncTransport',
+    'AiohttpTransport',
+    'RequestsTransport',
+    'Span',
+    'Tracer',
+    # Orders
+    'LatencyHistogram',
+    'OrderGateway',
+    'OrderTemplate',
+    'OrderResult',
+    'OrderEvent',
+    'OrderTracker',
+    'TrackedOrder',
     # Errors
     'TinvestError',
     'BadRequestError',
     'TooManyRequestsError',
     'UnexpectedError',
+    # Snapshots
+    'PortfolioEngine',
+    'PortfolioSnapshot',
+    'PositionValuation',
     # Streaming
     'Streaming',
     # Streaming Schemas
@@ -148,3 +289,17 @@ __all__ = (
     'UserAccounts',
     'UserAccountsResponse',
 )
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,112 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from .schemas import BrokerAccountType
+
+if TYPE_CHECKING:
+    from .clients import AsyncClient  # pragma: no cover
+
+__all__ = ('MultiAccountExecutor',)
+
+T = TypeVar('T')  # pragma: no mutate
+
+AccountMethod = Callable[..., Awaitable[T]]
+
+
+class MultiAccountExecutor:
+    """
+    Runs a client method for several broker accounts at once.
+    All calls go through one client, so they share its session
+    and rate limiter.
+
+    ```python
+    from tinvest import AsyncClient, MultiAccountExecutor, RateLimiter
+
+    async def main():
+        async with AsyncClient(TOKEN, rate_limiter=RateLimiter(120)) as client:
+            executor = MultiAccountExecutor(client)
+            portfolios = await executor.run(AsyncClient.get_portfolio)
+            for broker_account_id, response in portfolios.items():
+                print(broker_account_id, response.payload)
+    ```
+    """
+
+    def __init__(
+        self,
+        client: 'AsyncClient',
+        broker_account_ids: Optional[Iterable[str]] = None,
+        *,
+        concurrency: Optional[int] = None,
+    ):
+        self._client = client
+        self._broker_account_ids: Optional[List[str]] = (
+            list(broker_account_ids) if broker_account_ids is not None else None
+        )
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def get_broker_account_ids(
+        self, broker_account_type: Optional[BrokerAccountType] = None
+    ) -> List[str]:
+        if self._broker_account_ids is not None and broker_account_type is None:
+            return self._broker_account_ids
+
+        response = await self._client.get_accounts()
+        accounts = [
+            account
+            for account in response.payload.accounts
+            if broker_account_type in (None, account.broker_account_type)
+        ]
+        if broker_account_type is None:
+            self._broker_account_ids = [a.broker_account_id for a in accounts]
+            return self._broker_account_ids
+        return [a.broker_account_id for a in accounts]
+
+    async def run(
+        self,
+        method: AccountMethod[T],
+        *args: Any,
+        broker_account_ids: Optional[Iterable[str]] = None,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> Dict[str, Union[T, BaseException]]:
+        """
+        `method` is an `AsyncClient` method accepting `broker_account_id`,
+        e.g. `AsyncClient.get_portfolio`.
+        Results are mapped by broker account id.
+        """
+        if broker_account_ids is None:
+            broker_account_ids = await self.get_broker_account_ids()
+        ids = list(dict.fromkeys(broker_account_ids))
+
+        results = await asyncio.gather(
+            *(self._call(method, args, kwargs, account_id) for account_id in ids),
+            return_exceptions=return_exceptions,
+        )
+        return dict(zip(ids, results))
+
+    async def _call(
+        self,
+        method: AccountMethod[T],
+        args: Iterable[Any],
+        kwargs: Dict[str, Any],
+        broker_account_id: str,
+    ) -> T:
+        if not self._semaphore:
+            return await method(
+                self._client, *args, broker_account_id=broker_account_id, **kwargs
+            )
+        async with self._semaphore:
+            return await method(
+                self._client, *args, broker_account_id=broker_account_id, **kwargs
+            )
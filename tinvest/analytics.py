@@ -0,0 +1,242 @@
+from datetime import timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .schemas import Operation, OperationStatus, OperationTypeWithCommission
+
+__all__ = ('OperationsFrame',)
+
+CATEGORIES = ('currency', 'figi', 'instrument_type', 'operation_type', 'status')
+
+BUY_TYPES = (OperationTypeWithCommission.buy, OperationTypeWithCommission.buy_card)
+SELL_TYPES = (OperationTypeWithCommission.sell,)
+COMMISSION_TYPES = (
+    OperationTypeWithCommission.broker_commission,
+    OperationTypeWithCommission.exchange_commission,
+    OperationTypeWithCommission.service_commission,
+    OperationTypeWithCommission.margin_commission,
+    OperationTypeWithCommission.other_commission,
+)
+
+Values = Union[str, np.ndarray]
+GroupKey = Tuple[Any, ...]
+# Codes and labels of each grouping
+GroupCodes = Tuple[List[np.ndarray], List[List[Any]]]  # pragma: no mutate
+
+
+class OperationsFrame:
+    """
+    Operations as columns of numpy arrays with grouped aggregates.
+    Amounts are float64, categories are integer codes with labels.
+    Requires `numpy`, install `tinvest[analytics]`.
+
+    ```python
+    from tinvest.analytics import OperationsFrame
+
+    response = client.get_operations(from_, to)
+    frame = OperationsFrame.from_operations(response.payload.operations)
+    frame.commissions()  # {(Currency.usd,): 1.5}
+    frame.turnover(by=('figi',), freq='M')
+    # {('BBG0013HGFT4', datetime.date(2020, 1, 1)): 150.0}
+    frame.realized_pnl()  # {('BBG0013HGFT4', Currency.usd): 10.0}
+    ```
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        labels: Dict[str, List[Any]],
+    ):
+        self.columns = columns
+        self.labels = labels
+
+    @classmethod
+    def from_operations(cls, operations: Iterable[Operation]) -> 'OperationsFrame':
+        rows = [
+            (
+                _to_naive_utc(o.date),
+                float(o.payment),
+                float('nan') if o.price is None else float(o.price),
+                o.quantity_executed or o.quantity or 0,
+                float(o.commission.value) if o.commission else 0.0,
+                o.currency,
+                o.figi,
+                o.instrument_type,
+                o.operation_type,
+                o.status,
+            )
+            for o in operations
+        ]
+        date, payment, price, quantity, commission, *categories = (
+            zip(*rows) if rows else [()] * 10
+        )
+        columns = {
+            'date': np.array(date, dtype='datetime64[us]'),
+            'payment': np.array(payment, dtype=np.float64),
+            'price': np.array(price, dtype=np.float64),
+            'quantity': np.array(quantity, dtype=np.int64),
+            'commission': np.array(commission, dtype=np.float64),
+        }
+        labels = {}
+        for name, values in zip(CATEGORIES, categories):
+            columns[name], labels[name] = _factorize(values)
+        return cls(columns, labels)
+
+    def __len__(self) -> int:
+        return len(self.columns['payment'])
+
+    def filter(self, mask: np.ndarray) -> 'OperationsFrame':
+        return OperationsFrame(
+            {name: column[mask] for name, column in self.columns.items()},
+            self.labels,
+        )
+
+    def isin(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        """Mask of rows where the category `name` is one of `values`."""
+        values = set(values)
+        codes = [i for i, label in enumerate(self.labels[name]) if label in values]
+        return np.isin(self.columns[name], codes)
+
+    def aggregate(
+        self,
+        values: Values,
+        by: Sequence[str] = ('currency',),
+        freq: Optional[str] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> Dict[GroupKey, float]:
+        """
+        Sums `values` (a column name or an array) grouped by categories `by`
+        and by the date truncated to `freq`: numpy datetime unit,
+        e.g. `'h'`, `'D'`, `'M'`, `'Y'`.
+        """
+        array = self.columns[values] if isinstance(values, str) else values
+        codes, labels = self._group_codes(by, freq)
+        if mask is not None:
+            array = array[mask]
+            codes = [c[mask] for c in codes]
+        if not array.size:
+            return {}
+
+        sizes = [max(len(label), 1) for label in labels]
+        keys = np.ravel_multi_index(codes, sizes) if codes else np.zeros_like(array)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse.reshape(-1), weights=array)
+        groups = np.unravel_index(unique_keys.astype(np.int64), sizes)
+        return {
+            tuple(label[group[i]] for label, group in zip(labels, groups)): float(
+                sums[i]
+            )
+            for i in range(len(unique_keys))
+        }
+
+    def commissions(
+        self, by: Sequence[str] = ('currency',), freq: Optional[str] = None
+    ) -> Dict[GroupKey, float]:
+        """Paid commissions as positive amounts."""
+        mask = self._done() & self.isin('operation_type', COMMISSION_TYPES)
+        return self.aggregate(-self.columns['payment'], by, freq, mask)
+
+    def turnover(
+        self, by: Sequence[str] = ('currency',), freq: Optional[str] = None
+    ) -> Dict[GroupKey, float]:
+        """Absolute amount of buys and sells."""
+        mask = self._done() & self.isin('operation_type', BUY_TYPES + SELL_TYPES)
+        return self.aggregate(np.abs(self.columns['payment']), by, freq, mask)
+
+    def realized_pnl(
+        self, by: Sequence[str] = ('figi', 'currency'), freq: Optional[str] = None
+    ) -> Dict[GroupKey, float]:
+        """
+        Realized profit of sells matched with earlier buys of the same FIGI
+        in FIFO order. Commissions are not included, short sells are ignored.
+        """
+        pnl = self.realized_pnl_by_operation()
+        mask = self._done() & self.isin('operation_type', SELL_TYPES)
+        return self.aggregate(pnl, by, freq, mask)
+
+    def realized_pnl_by_operation(self) -> np.ndarray:  # pylint:disable=too-many-locals
+        """FIFO realized profit of each sell, zeros for other operations."""
+        if len(self) == 0:
+            return np.zeros(0)
+        done = self._done()
+        quantity = self.columns['quantity']
+        buy = done & self.isin('operation_type', BUY_TYPES) & (quantity > 0)
+        sell = done & self.isin('operation_type', SELL_TYPES) & (quantity > 0)
+
+        order = np.lexsort((self.columns['date'], self.columns['figi']))
+        figi, payment = self.columns['figi'][order], self.columns['payment'][order]
+        buy, sell, quantity = buy[order], sell[order], quantity[order]
+
+        bought_quantity = np.where(buy, quantity, 0)
+        bought = np.cumsum(bought_quantity)
+        cost = np.cumsum(np.where(buy, -payment, 0.0))
+
+        # Operations are numbered within each FIGI
+        first = np.r_[True, figi[1:] != figi[:-1]]
+        starts, group = np.flatnonzero(first), np.cumsum(first) - 1
+        bought_before = (bought - bought_quantity)[starts][group]
+
+        # Sells only match units held at that moment, so short sells
+        # do not consume later buys
+        delta = bought_quantity - np.where(sell, quantity, 0)
+        held = _held_before(delta, first, group)
+        matched = np.where(sell, np.minimum(quantity, held), 0)
+
+        sold = np.cumsum(matched)
+        end = sold - (sold - matched)[starts][group]
+        start = end - matched
+
+        # Cost of the first n bought units is linear within a buy
+        xp = np.r_[0, bought[buy]]
+        fp = np.r_[0.0, cost[buy]]
+        matched_cost = np.interp(bought_before + end, xp, fp) - np.interp(
+            bought_before + start, xp, fp
+        )
+        proceeds = payment * matched / np.maximum(quantity, 1)
+
+        pnl = np.zeros(len(order))
+        pnl[order] = np.where(sell, proceeds - matched_cost, 0.0)
+        return pnl
+
+    def _group_codes(self, by: Sequence[str], freq: Optional[str]) -> GroupCodes:
+        codes = [self.columns[name] for name in by]
+        labels = [self.labels[name] for name in by]
+        if freq:
+            buckets, bucket_codes = np.unique(
+                self.columns['date'].astype(f'datetime64[{freq}]'),
+                return_inverse=True,
+            )
+            codes.append(bucket_codes.reshape(-1))
+            labels.append([bucket.item() for bucket in buckets])
+        return codes, labels
+
+    def _done(self) -> np.ndarray:
+        return self.isin('status', (OperationStatus.done,))
+
+
+def _factorize(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    index: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+def _to_naive_utc(value: Any) -> Any:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _held_before(delta: np.ndarray, first: np.ndarray, group: np.ndarray) -> np.ndarray:
+    # Position clipped at zero is the walk minus its running minimum; later
+    # groups are shifted below earlier ones to keep the minimum per group
+    walk = np.cumsum(delta)
+    walk -= (walk - delta)[first][group]
+    shift = group * (2 * np.abs(delta).sum() + 1)
+    low = np.minimum.accumulate(walk - shift) + shift
+    position = walk - np.minimum(low, 0)
+    return np.where(first, 0, np.r_[0, position[:-1]])
@@ -1,5 +1,5 @@
 # pylint:disable=too-many-lines
-from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
+from typing import Awaitable, Callable, Optional, TypeVar, Union
 
 from pydantic import BaseModel
 
@@ -24,8 +24,8 @@ from .schemas import (
     SearchMarketInstrumentResponse,
     UserAccountsResponse,
 )
-from .typedefs import datetime_or_str
-from .utils import isoformat
+from .typedefs import AnyDict, datetime_or_str
+from .utils import dump_model, isoformat
 
 __all__ = (
     'accounts_get',
@@ -68,13 +68,11 @@ def sandbox_register_post(
     """
     POST /sandbox/register
     """
-    kwargs: Any = {}
-    kwargs.setdefault('data', body.json(by_alias=True))
     return request(
         'POST',
         '/sandbox/register',
         response_model=SandboxRegisterResponse,
-        **kwargs,
+        data=dump_model(body),
     )
 
 
@@ -86,17 +84,15 @@ def sandbox_currencies_balance_post(
     """
     POST /sandbox/currencies/balance
     """
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
+    params: AnyDict = {}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    kwargs.setdefault('data', body.json())
+        params['brokerAccountId'] = broker_account_id
     return request(
         'POST',
         '/sandbox/currencies/balance',
         response_model=Empty,
-        **kwargs,
+        params=params,
+        data=dump_model(body),
     )
 
 
@@ -108,13 +104,16 @@ def sandbox_positions_balance_post(
     """
     POST /sandbox/positions/balance
     """
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
+    params: AnyDict = {}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    kwargs.setdefault('data', body.json())
-    return request('POST', '/sandbox/positions/balance', response_model=Empty, **kwargs)
+        params['brokerAccountId'] = broker_account_id
+    return request(
+        'POST',
+        '/sandbox/positions/balance',
+        response_model=Empty,
+        params=params,
+        data=dump_model(body),
+    )
 
 
 def sandbox_remove_post(
@@ -122,12 +121,10 @@ def sandbox_remove_post(
     broker_account_id: Optional[str] = None,
 ) -> Response[Empty]:
     """POST /sandbox/remove"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
+    params: AnyDict = {}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    return request('POST', '/sandbox/remove', response_model=Empty, **kwargs)
+        params['brokerAccountId'] = broker_account_id
+    return request('POST', '/sandbox/remove', response_model=Empty, params=params)
 
 
 def sandbox_clear_post(
@@ -135,12 +132,10 @@ def sandbox_clear_post(
     broker_account_id: Optional[str] = None,
 ) -> Response[Empty]:
     """POST /sandbox/clear"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
+    params: AnyDict = {}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    return request('POST', '/sandbox/clear', response_model=Empty, **kwargs)
+        params['brokerAccountId'] = broker_account_id
+    return request('POST', '/sandbox/clear', response_model=Empty, params=params)
 
 
 def orders_get(
@@ -148,12 +143,10 @@ def orders_get(
     broker_account_id: Optional[str] = None,
 ) -> Response[OrdersResponse]:
     """GET /orders"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
+    params: AnyDict = {}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    return request('GET', '/orders', response_model=OrdersResponse, **kwargs)
+        params['brokerAccountId'] = broker_account_id
+    return request('GET', '/orders', response_model=OrdersResponse, params=params)
 
 
 def orders_limit_order_post(
@@ -163,18 +156,15 @@ def orders_limit_order_post(
     broker_account_id: Optional[str] = None,
 ) -> Response[LimitOrderResponse]:
     """POST /orders/limit-order"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('figi', figi)
+    params: AnyDict = {'figi': figi}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    kwargs.setdefault('data', body.json())
+        params['brokerAccountId'] = broker_account_id
     return request(
         'POST',
         '/orders/limit-order',
         response_model=LimitOrderResponse,
-        **kwargs,
+        params=params,
+        data=dump_model(body),
     )
 
 
@@ -185,15 +175,15 @@ def orders_market_order_post(
     broker_account_id: Optional[str] = None,
 ) -> Response[MarketOrderResponse]:
     """POST /orders/market-order"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('figi', figi)
+    params: AnyDict = {'figi': figi}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    kwargs.setdefault('data', body.json())
+        params['brokerAccountId'] = broker_account_id
     return request(
-        'POST', '/orders/market-order', response_model=MarketOrderResponse, **kwargs
+        'POST',
+        '/orders/market-order',
+        response_model=MarketOrderResponse,
+        params=params,
+        data=dump_model(body),
     )
 
 
@@ -203,13 +193,10 @@ def orders_cancel_post(
     broker_account_id: Optional[str] = None,
 ) -> Response[Empty]:
     """POST /orders/cancel"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('orderId', order_id)
+    params: AnyDict = {'orderId': order_id}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    return request('POST', '/orders/cancel', response_model=Empty, **kwargs)
+        params['brokerAccountId'] = broker_account_id
+    return request('POST', '/orders/cancel', response_model=Empty, params=params)
 
 
 def portfolio_get(
@@ -217,12 +204,10 @@ def portfolio_get(
     broker_account_id: Optional[str] = None,
 ) -> Response[PortfolioResponse]:
     """GET /portfolio"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
+    params: AnyDict = {}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    return request('GET', '/portfolio', response_model=PortfolioResponse, **kwargs)
+        params['brokerAccountId'] = broker_account_id
+    return request('GET', '/portfolio', response_model=PortfolioResponse, params=params)
 
 
 def portfolio_currencies_get(
@@ -230,16 +215,14 @@ def portfolio_currencies_get(
     broker_account_id: Optional[str] = None,
 ) -> Response[PortfolioCurrenciesResponse]:
     """GET /portfolio/currencies"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
+    params: AnyDict = {}
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
+        params['brokerAccountId'] = broker_account_id
     return request(
         'GET',
         '/portfolio/currencies',
         response_model=PortfolioCurrenciesResponse,
-        **kwargs,
+        params=params,
     )
 
 
@@ -247,51 +230,31 @@ def market_stocks_get(
     request: Request[MarketInstrumentListResponse],
 ) -> Response[MarketInstrumentListResponse]:
     """GET /market/stocks"""
-    kwargs: Any = {}
-    return request(
-        'GET',
-        '/market/stocks',
-        response_model=MarketInstrumentListResponse,
-        **kwargs,
-    )
+    return request('GET', '/market/stocks', response_model=MarketInstrumentListResponse)
 
 
 def market_bonds_get(
     request: Request[MarketInstrumentListResponse],
 ) -> Response[MarketInstrumentListResponse]:
     """GET /market/bonds"""
-    kwargs: Any = {}
-    return request(
-        'GET',
-        '/market/bonds',
-        response_model=MarketInstrumentListResponse,
-        **kwargs,
-    )
+    return request('GET', '/market/bonds', response_model=MarketInstrumentListResponse)
 
 
 def market_etfs_get(
     request: Request[MarketInstrumentListResponse],
 ) -> Response[MarketInstrumentListResponse]:
     """GET /market/etfs"""
-    kwargs: Any = {}
-    return request(
-        'GET',
-        '/market/etfs',
-        response_model=MarketInstrumentListResponse,
-        **kwargs,
-    )
+    return request('GET', '/market/etfs', response_model=MarketInstrumentListResponse)
 
 
 def market_currencies_get(
     request: Request[MarketInstrumentListResponse],
 ) -> Response[MarketInstrumentListResponse]:
     """GET /market/currencies"""
-    kwargs: Any = {}
     return request(
         'GET',
         '/market/currencies',
         response_model=MarketInstrumentListResponse,
-        **kwargs,
     )
 
 
@@ -301,16 +264,12 @@ def market_orderbook_get(
     depth: int,
 ) -> Response[OrderbookResponse]:
     """GET /market/orderbook"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('figi', figi)
-    params.setdefault('depth', depth)
+    params: AnyDict = {'figi': figi, 'depth': depth}
     return request(
         'GET',
         '/market/orderbook',
         response_model=OrderbookResponse,
-        **kwargs,
+        params=params,
     )
 
 
@@ -322,14 +281,18 @@ def market_candles_get(
     interval: CandleResolution,
 ) -> Response[CandlesResponse]:
     """GET /market/candles"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('figi', figi)
-    params.setdefault('from', isoformat(from_))
-    params.setdefault('to', isoformat(to))
-    params.setdefault('interval', interval.value)
-    return request('GET', '/market/candles', response_model=CandlesResponse, **kwargs)
+    params: AnyDict = {
+        'figi': figi,
+        'from': isoformat(from_),
+        'to': isoformat(to),
+        'interval': interval.value,
+    }
+    return request(
+        'GET',
+        '/market/candles',
+        response_model=CandlesResponse,
+        params=params,
+    )
 
 
 def market_search_by_figi_get(
@@ -337,15 +300,12 @@ def market_search_by_figi_get(
     figi: str,
 ) -> Response[SearchMarketInstrumentResponse]:
     """GET /market/search/by-figi"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('figi', figi)
+    params: AnyDict = {'figi': figi}
     return request(
         'GET',
         '/market/search/by-figi',
         response_model=SearchMarketInstrumentResponse,
-        **kwargs,
+        params=params,
     )
 
 
@@ -354,15 +314,12 @@ def market_search_by_ticker_get(
     ticker: str,
 ) -> Response[MarketInstrumentListResponse]:
     """GET /market/search/by-ticker"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('ticker', ticker)
+    params: AnyDict = {'ticker': ticker}
     return request(
         'GET',
         '/market/search/by-ticker',
         response_model=MarketInstrumentListResponse,
-        **kwargs,
+        params=params,
     )
 
 
@@ -374,23 +331,21 @@ def operations_get(
     broker_account_id: Optional[str] = None,
 ) -> Response[OperationsResponse]:
     """GET /operations"""
-    kwargs: Any = {}
-    kwargs.setdefault('params', {})
-    params = kwargs['params']
-    params.setdefault('from', isoformat(from_))
-    params.setdefault('to', isoformat(to))
+    params: AnyDict = {'from': isoformat(from_), 'to': isoformat(to)}
     if figi:
-        params.setdefault('figi', figi)
+        params['figi'] = figi
     if broker_account_id:
-        params.setdefault('brokerAccountId', broker_account_id)
-    return request('GET', '/operations', response_model=OperationsResponse, **kwargs)
+        params['brokerAccountId'] = broker_account_id
+    return request(
+        'GET',
+        '/operations',
+        response_model=OperationsResponse,
+        params=params,
+    )
 
 
 def accounts_get(
     request: Request[UserAccountsResponse],
 ) -> Response[UserAccountsResponse]:
     """GET /user/accounts"""
-    kwargs: Any = {}
-    return request(
-        'GET', '/user/accounts', response_model=UserAccountsResponse, **kwargs
-    )
+    return request('GET', '/user/accounts', response_model=UserAccountsResponse)
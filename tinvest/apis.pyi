@@ -1,17 +1,30 @@
 # pylint:disable=too-many-lines
-from typing import Any, Awaitable, Callable, Optional, TypeVar, Union, overload
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from pydantic import BaseModel
 
 from .schemas import (
+    Candle,
     CandleResolution,
     CandlesResponse,
     Empty,
     LimitOrderRequest,
     LimitOrderResponse,
+    MarketInstrument,
     MarketInstrumentListResponse,
     MarketOrderRequest,
     MarketOrderResponse,
+    Operation,
     OperationsResponse,
     OrderbookResponse,
     OrdersResponse,
@@ -58,6 +71,13 @@ AsyncRequest = Callable[..., Awaitable[T]]
 
 Request = Union[SyncRequest[T], AsyncRequest[T]]
 Response = Union[T, Awaitable[T]]
+
+ItemT = TypeVar('ItemT', bound=BaseModel)
+
+# Requests of the `stream_` client methods yield items of the response array
+SyncStreamRequest = Callable[..., Iterator[ItemT]]
+AsyncStreamRequest = Callable[..., AsyncIterator[ItemT]]
+
 @overload
 def sandbox_register_post(
     request: SyncRequest[SandboxRegisterResponse],
@@ -191,6 +211,14 @@ def market_stocks_get(
     request: AsyncRequest[MarketInstrumentListResponse],
 ) -> Awaitable[MarketInstrumentListResponse]: ...
 @overload
+def market_stocks_get(
+    request: SyncStreamRequest[MarketInstrument],
+) -> Iterator[MarketInstrument]: ...
+@overload
+def market_stocks_get(
+    request: AsyncStreamRequest[MarketInstrument],
+) -> AsyncIterator[MarketInstrument]: ...
+@overload
 def market_bonds_get(
     request: SyncRequest[MarketInstrumentListResponse],
 ) -> MarketInstrumentListResponse: ...
@@ -199,6 +227,14 @@ def market_bonds_get(
     request: AsyncRequest[MarketInstrumentListResponse],
 ) -> Awaitable[MarketInstrumentListResponse]: ...
 @overload
+def market_bonds_get(
+    request: SyncStreamRequest[MarketInstrument],
+) -> Iterator[MarketInstrument]: ...
+@overload
+def market_bonds_get(
+    request: AsyncStreamRequest[MarketInstrument],
+) -> AsyncIterator[MarketInstrument]: ...
+@overload
 def market_etfs_get(
     request: SyncRequest[MarketInstrumentListResponse],
 ) -> MarketInstrumentListResponse: ...
@@ -207,6 +243,14 @@ def market_etfs_get(
     request: AsyncRequest[MarketInstrumentListResponse],
 ) -> Awaitable[MarketInstrumentListResponse]: ...
 @overload
+def market_etfs_get(
+    request: SyncStreamRequest[MarketInstrument],
+) -> Iterator[MarketInstrument]: ...
+@overload
+def market_etfs_get(
+    request: AsyncStreamRequest[MarketInstrument],
+) -> AsyncIterator[MarketInstrument]: ...
+@overload
 def market_currencies_get(
     request: SyncRequest[MarketInstrumentListResponse],
 ) -> MarketInstrumentListResponse: ...
@@ -215,6 +259,14 @@ def market_currencies_get(
     request: AsyncRequest[MarketInstrumentListResponse],
 ) -> Awaitable[MarketInstrumentListResponse]: ...
 @overload
+def market_currencies_get(
+    request: SyncStreamRequest[MarketInstrument],
+) -> Iterator[MarketInstrument]: ...
+@overload
+def market_currencies_get(
+    request: AsyncStreamRequest[MarketInstrument],
+) -> AsyncIterator[MarketInstrument]: ...
+@overload
 def market_orderbook_get(
     request: SyncRequest[OrderbookResponse],
     figi: str,
@@ -243,6 +295,22 @@ def market_candles_get(
     interval: CandleResolution,
 ) -> Awaitable[CandlesResponse]: ...
 @overload
+def market_candles_get(
+    request: SyncStreamRequest[Candle],
+    figi: str,
+    from_: datetime_or_str,
+    to: datetime_or_str,
+    interval: CandleResolution,
+) -> Iterator[Candle]: ...
+@overload
+def market_candles_get(
+    request: AsyncStreamRequest[Candle],
+    figi: str,
+    from_: datetime_or_str,
+    to: datetime_or_str,
+    interval: CandleResolution,
+) -> AsyncIterator[Candle]: ...
+@overload
 def market_search_by_figi_get(
     request: SyncRequest[SearchMarketInstrumentResponse],
     figi: str,
@@ -279,6 +347,22 @@ def operations_get(
     broker_account_id: Optional[str] = None,
 ) -> Awaitable[OperationsResponse]: ...
 @overload
+def operations_get(
+    request: SyncStreamRequest[Operation],
+    from_: datetime_or_str,
+    to: datetime_or_str,
+    figi: Optional[str] = None,
+    broker_account_id: Optional[str] = None,
+) -> Iterator[Operation]: ...
+@overload
+def operations_get(
+    request: AsyncStreamRequest[Operation],
+    from_: datetime_or_str,
+    to: datetime_or_str,
+    figi: Optional[str] = None,
+    broker_account_id: Optional[str] = None,
+) -> AsyncIterator[Operation]: ...
+@overload
 def accounts_get(
     request: SyncRequest[UserAccountsResponse],
 ) -> UserAccountsResponse: ...
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Coroutine,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+__all__ = ('BackgroundLoop',)
+
+T = TypeVar('T')  # pragma: no mutate
+
+
+class BackgroundLoop:
+    """
+    Event loop running forever in a daemon thread.
+    Coroutines are submitted from other threads and awaited synchronously.
+
+    ```python
+    from tinvest import BackgroundLoop, SyncClient
+
+    client = SyncClient(TOKEN, background_loop=BackgroundLoop.shared())
+    ```
+    """
+
+    _shared: Optional['BackgroundLoop'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name='tinvest-loop', daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def shared(cls) -> 'BackgroundLoop':
+        """The loop shared by all callers, started on first use."""
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared.closed:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    @property
+    def closed(self) -> bool:
+        return self._loop.is_closed()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError('BackgroundLoop.run is called from its own thread')
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """Iterates over an async iterator in the loop."""
+        try:
+            yield from self._iter_items(iterator)
+        finally:
+            self.run(_aclose(iterator))
+
+    def _iter_items(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        while True:
+            has_item, item = self.run(_next(iterator))
+            if not has_item:
+                return
+            yield cast(T, item)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def _next(iterator: AsyncIterator[T]) -> Tuple[bool, Optional[T]]:
+    try:
+        return True, await iterator.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+
+async def _aclose(iterator: AsyncIterator[Any]) -> None:
+    aclose = getattr(iterator, 'aclose', None)
+    if aclose:
+        await aclose()
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from .limits import RateLimiter
+from .schemas import LimitOrderRequest, MarketOrderRequest
+
+if TYPE_CHECKING:
+    from .clients import AsyncClient  # pragma: no cover
+
+__all__ = ('OrderResult', 'place_orders', 'cancel_orders')
+
+DEFAULT_CONCURRENCY = 10  # pragma: no mutate
+
+OrderRequest = Union[LimitOrderRequest, MarketOrderRequest]
+# FIGI and order request
+PlaceOrder = Tuple[str, OrderRequest]  # pragma: no mutate
+
+
+class OrderResult(BaseModel):
+    """
+    `started` is seconds since the start of the batch,
+    `elapsed` is seconds from sending the request to the response.
+    """
+
+    order_id: Optional[str]
+    figi: Optional[str]
+    response: Any
+    error: Optional[Exception]
+    started: float
+    elapsed: float
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def place_orders(
+    client: 'AsyncClient',
+    orders: Iterable[PlaceOrder],
+    broker_account_id: Optional[str] = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> List[OrderResult]:
+    """
+    Places orders concurrently, results keep the order of `orders`.
+    Errors are returned in `OrderResult.error` instead of being raised.
+    """
+    batch = _Batch(concurrency, rate_limiter)
+    return await asyncio.gather(
+        *(
+            batch.run(_place_order(client, figi, body, broker_account_id), figi=figi)
+            for figi, body in orders
+        )
+    )
+
+
+async def cancel_orders(
+    client: 'AsyncClient',
+    order_ids: Union[Iterable[str], str],
+    broker_account_id: Optional[str] = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> List[OrderResult]:
+    """
+    Cancels orders concurrently, `order_ids='all'` cancels every active order
+    and any other string is a single order id.
+    """
+    batch = _Batch(concurrency, rate_limiter)
+    figis = {}
+    if order_ids == 'all':
+        response = await client.get_orders(broker_account_id)
+        figis = {order.order_id: order.figi for order in response.payload}
+        order_ids = list(figis)
+    elif isinstance(order_ids, str):
+        order_ids = [order_ids]
+
+    return await asyncio.gather(
+        *(
+            batch.run(
+                client.post_orders_cancel(order_id, broker_account_id),
+                order_id=order_id,
+                figi=figis.get(order_id),
+            )
+            for order_id in order_ids
+        )
+    )
+
+
+class _Batch:
+    def __init__(self, concurrency: int, rate_limiter: Optional[RateLimiter]):
+        if concurrency <= 0:
+            raise ValueError('Concurrency must be positive')
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._rate_limiter = rate_limiter
+        self._start = time.perf_counter()
+
+    async def run(
+        self,
+        call: Awaitable[Any],
+        order_id: Optional[str] = None,
+        figi: Optional[str] = None,
+    ) -> OrderResult:
+        response = error = None
+        async with self._semaphore:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = await call
+            except Exception as e:  # pylint:disable=broad-except
+                error = e
+            elapsed = time.perf_counter() - started
+
+        if order_id is None and response is not None:
+            order_id = response.payload.order_id
+        return OrderResult(
+            order_id=order_id,
+            figi=figi,
+            response=response,
+            error=error,
+            started=started - self._start,
+            elapsed=elapsed,
+        )
+
+
+def _place_order(
+    client: 'AsyncClient',
+    figi: str,
+    body: OrderRequest,
+    broker_account_id: Optional[str],
+) -> Awaitable[Any]:
+    if isinstance(body, LimitOrderRequest):
+        return client.post_orders_limit_order(figi, body, broker_account_id)
+    return client.post_orders_market_order(figi, body, broker_account_id)
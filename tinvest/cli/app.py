@@ -1,10 +1,22 @@
+from pathlib import Path
+from typing import Optional
+
 import typer
 
 from .. import __api_version__, __version__
+from .batch import batch
+from .bench import bench
+from .daemon import daemon
 from .openapi import openapi
+from .profiling import PROFILER_KEY, Profiler
+from .stream import stream
 
 app = typer.Typer()
+openapi.command(help='Run requests from a JSONL or CSV file')(batch)
 app.add_typer(openapi, name='openapi', help='CLI for invest-openapi')
+app.command(help='Load test of an endpoint')(bench)
+app.command(help='Keep a warm client for openapi commands')(daemon)
+app.command(help='Live view of the Streaming API')(stream)
 
 
 def version_callback(value: bool) -> None:
@@ -16,6 +28,7 @@ def version_callback(value: bool) -> None:
 
 @app.callback()
 def main(
+    ctx: typer.Context,
     version: bool = typer.Option(  # noqa:B008 pylint:disable=unused-argument
         None,
         '--version',
@@ -23,5 +36,18 @@ def main(
         is_eager=True,
         help='Application version',
     ),
+    profile: bool = typer.Option(  # noqa:B008
+        False,
+        '--profile',
+        help='Print timings of startup, client and requests to stderr',
+    ),
+    profile_output: Optional[Path] = typer.Option(  # noqa:B008
+        None,
+        '--profile-output',
+        help='Dump cProfile stats to the file, implies --profile',
+    ),
 ):
-    return
+    if profile or profile_output:
+        profiler = Profiler(profile_output)
+        ctx.meta[PROFILER_KEY] = profiler
+        ctx.call_on_close(profiler.report)
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import typer
+
+import tinvest as ti
+
+from ..typedefs import AnyDict
+from .formats import Columns, Format, RecordWriter, open_writer, read_records
+from .openapi import convert_to_datetime
+from .profiling import get_profiler
+
+DEFAULT_CONCURRENCY = 10
+# invest-openapi allows 120 requests per minute for most of the market methods
+DEFAULT_RATE = 120
+# Requests and payloads are JSON
+RESULT_COLUMNS: Columns = {
+    'index': int,
+    'method': str,
+    'request': str,
+    'ok': bool,
+    'error': str,
+    'elapsed': float,
+    'payload': str,
+}
+
+
+class Method(str, Enum):
+    market_orderbook = 'market-orderbook'
+    market_candles = 'market-candles'
+    market_search_by_figi = 'market-search-by-figi'
+    market_search_by_ticker = 'market-search-by-ticker'
+    portfolio = 'portfolio'
+    portfolio_currencies = 'portfolio-currencies'
+    operations = 'operations'
+
+
+Call = Callable[['ti.AsyncClient', AnyDict], Awaitable[Any]]
+# Index and record of a request
+Job = Tuple[int, AnyDict]
+
+CALLS: Dict[Method, Call] = {
+    Method.market_orderbook: lambda c, r: c.get_market_orderbook(
+        r['figi'], int(r.get('depth', 20))
+    ),
+    Method.market_candles: lambda c, r: c.get_market_candles(
+        r['figi'],
+        convert_to_datetime(r['from']),
+        convert_to_datetime(r.get('to', 'now')),
+        ti.CandleResolution(r['interval']),
+    ),
+    Method.market_search_by_figi: lambda c, r: c.get_market_search_by_figi(r['figi']),
+    Method.market_search_by_ticker: lambda c, r: (
+        c.get_market_search_by_ticker(r['ticker'])
+    ),
+    Method.portfolio: lambda c, r: c.get_portfolio(r.get('broker_account_id')),
+    Method.portfolio_currencies: lambda c, r: c.get_portfolio_currencies(
+        r.get('broker_account_id')
+    ),
+    Method.operations: lambda c, r: c.get_operations(
+        convert_to_datetime(r['from']),
+        convert_to_datetime(r.get('to', 'now')),
+        r.get('figi'),
+        r.get('broker_account_id'),
+    ),
+}
+
+
+def batch(  # pylint:disable=too-many-arguments,too-many-positional-arguments
+    ctx: typer.Context,
+    input_path: Path = typer.Argument(  # noqa:B008
+        ..., metavar='INPUT', help='JSONL or CSV file of requests, - for stdin'
+    ),
+    method: Optional[Method] = typer.Option(  # noqa:B008
+        None, help='Method of requests without the method field'
+    ),
+    output: Optional[Path] = typer.Option(None, '--output', '-o'),  # noqa:B008
+    output_format: Optional[Format] = typer.Option(  # noqa:B008
+        None, '--format', help='Defaults to the format of openapi or jsonl'
+    ),
+    concurrency: int = typer.Option(  # noqa:B008
+        DEFAULT_CONCURRENCY, '--concurrency', '-c', min=1
+    ),
+    rate: int = typer.Option(  # noqa:B008
+        DEFAULT_RATE, min=1, help='Requests per minute'
+    ),
+):
+    """
+    Runs requests concurrently over one client and writes results as they
+    complete. A request is an object with `method` and its arguments:
+    `figi`, `depth`, `ticker`, `from`, `to`, `interval`, `broker_account_id`.
+    """
+    output_format = output_format or ctx.obj.output_format or Format.jsonl
+    output = output or ctx.obj.output
+    if output_format == Format.parquet and output is None:
+        raise typer.BadParameter('parquet needs --output')
+
+    async def run() -> Tuple[int, int]:
+        # The client is created in the event loop of the batch
+        return await _run(
+            create_async_client(ctx),
+            read_records(input_path),
+            writer,
+            method,
+            concurrency,
+            rate,
+        )
+
+    with open_writer(output_format, output, RESULT_COLUMNS) as writer:
+        total, errors = asyncio.run(run())
+    typer.echo(f'{total} requests, {errors} errors', err=True)
+    if errors:
+        raise typer.Exit(code=1)
+
+
+def create_async_client(ctx: typer.Context) -> 'ti.AsyncClient':
+    profiler = get_profiler(ctx)
+    if ctx.obj.use_sandbox:
+        return ti.AsyncClient(ctx.obj.sandbox_token, use_sandbox=True, tracer=profiler)
+    return ti.AsyncClient(ctx.obj.token, tracer=profiler)
+
+
+async def _run(  # pylint:disable=too-many-arguments,too-many-positional-arguments
+    client: 'ti.AsyncClient',
+    records: Iterable[AnyDict],
+    writer: RecordWriter,
+    method: Optional[Method],
+    concurrency: int,
+    rate: int,
+) -> Tuple[int, int]:
+    """
+    Records are read in a thread as `concurrency` workers take them: at most
+    `concurrency` requests are in flight and as many records are queued.
+    """
+    rate_limiter = ti.RateLimiter(rate)
+    queue: 'asyncio.Queue[Optional[Job]]' = asyncio.Queue(concurrency)
+    total = errors = 0
+
+    async def feed() -> None:
+        nonlocal total
+        loop = asyncio.get_running_loop()
+        iterator = iter(records)
+        # Reading blocks on files and stdin, so it runs in a thread
+        record = await loop.run_in_executor(None, next, iterator, None)
+        while record is not None:
+            await queue.put((total, record))
+            total += 1
+            record = await loop.run_in_executor(None, next, iterator, None)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work() -> None:
+        nonlocal errors
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            await rate_limiter.acquire()
+            result = await _call(client, method, *item)
+            errors += not result['ok']
+            writer.write(result)
+
+    async with client:
+        tasks = [asyncio.create_task(feed())]
+        tasks.extend(asyncio.create_task(work()) for _ in range(concurrency))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    return total, errors
+
+
+async def _call(
+    client: 'ti.AsyncClient', method: Optional[Method], index: int, record: AnyDict
+) -> AnyDict:
+    name = record.get('method') or (method and method.value)
+    payload = error = None
+    started = time.perf_counter()
+    try:
+        response = await CALLS[Method(name)](client, record)
+        payload = json.loads(response.json(by_alias=True))['payload']
+    except Exception as e:  # pylint:disable=broad-except
+        error = f'{type(e).__name__}: {e}'
+    elapsed = time.perf_counter() - started
+
+    return {
+        'index': index,
+        'method': name,
+        'request': record,
+        'ok': error is None,
+        'error': error,
+        'elapsed': elapsed,
+        'payload': payload,
+    }
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import typer
+
+import tinvest as ti
+
+from ..tracing import Span, Tracer
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Endpoint(str, Enum):
+    accounts = 'accounts'
+    portfolio = 'portfolio'
+    portfolio_currencies = 'portfolio-currencies'
+    orders = 'orders'
+    market_stocks = 'market-stocks'
+    market_bonds = 'market-bonds'
+    market_etfs = 'market-etfs'
+    market_currencies = 'market-currencies'
+    market_orderbook = 'market-orderbook'
+    market_search_by_figi = 'market-search-by-figi'
+
+
+Call = Callable[['ti.AsyncClient', str, int], Awaitable[Any]]
+
+CALLS: Dict[Endpoint, Call] = {
+    Endpoint.accounts: lambda c, figi, depth: c.get_accounts(),
+    Endpoint.portfolio: lambda c, figi, depth: c.get_portfolio(),
+    Endpoint.portfolio_currencies: lambda c, figi, depth: c.get_portfolio_currencies(),
+    Endpoint.orders: lambda c, figi, depth: c.get_orders(),
+    Endpoint.market_stocks: lambda c, figi, depth: c.get_market_stocks(),
+    Endpoint.market_bonds: lambda c, figi, depth: c.get_market_bonds(),
+    Endpoint.market_etfs: lambda c, figi, depth: c.get_market_etfs(),
+    Endpoint.market_currencies: lambda c, figi, depth: c.get_market_currencies(),
+    Endpoint.market_orderbook: lambda c, figi, depth: c.get_market_orderbook(
+        figi, depth
+    ),
+    Endpoint.market_search_by_figi: lambda c, figi, depth: (
+        c.get_market_search_by_figi(figi)
+    ),
+}
+FIGI_ENDPOINTS = (Endpoint.market_orderbook, Endpoint.market_search_by_figi)
+
+
+class Recorder(Tracer):
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def on_end(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+def bench(  # pylint:disable=too-many-arguments,too-many-positional-arguments
+    endpoint: Endpoint,
+    requests: int = typer.Option(100, '--requests', '-n', min=1),  # noqa:B008
+    concurrency: int = typer.Option(10, '--concurrency', '-c', min=1),  # noqa:B008
+    figi: Optional[str] = None,
+    depth: int = 20,
+    token: str = typer.Option('', envvar='TINVEST_TOKEN'),  # noqa:B008
+    sandbox_token: str = typer.Option('', envvar='TINVEST_SANDBOX_TOKEN'),  # noqa:B008
+    use_sandbox: bool = typer.Option(False, '--use-sandbox', '-s'),  # noqa:B008
+    fake: bool = typer.Option(  # noqa:B008
+        False, '--fake', help='Requests to the in-memory fake server'
+    ),
+    latency: float = typer.Option(  # noqa:B008
+        0.0, help='Latency of the fake server, seconds'
+    ),
+):
+    """
+    Sends `requests` requests to an endpoint with `concurrency` requests
+    in flight and prints throughput, latency quantiles and mean phases.
+    Mind the rate limits of invest-openapi.
+    """
+    token = _get_token(sandbox_token if use_sandbox else token, use_sandbox, fake)
+    transport = None
+    if fake:
+        transport, figi = _create_fake_transport(figi, latency)
+    if endpoint in FIGI_ENDPOINTS and not figi:
+        raise typer.BadParameter(f'--figi is required for {endpoint.value}')
+
+    recorder = Recorder()
+    call = CALLS[endpoint]
+
+    async def run() -> None:
+        # The client is created in the event loop of the benchmark
+        client = ti.AsyncClient(
+            token,
+            use_sandbox=use_sandbox,
+            transport=transport,
+            tracer=recorder,
+        )
+        await _run(
+            client, lambda: call(client, figi or '', depth), requests, concurrency
+        )
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    _report(recorder.spans, time.perf_counter() - started, concurrency)
+
+
+def _get_token(token: str, use_sandbox: bool, fake: bool) -> str:
+    if token or fake:
+        return token or 'fake'
+    if use_sandbox:
+        raise typer.BadParameter(
+            '--sandbox-token or TINVEST_SANDBOX_TOKEN is required without --fake'
+        )
+    raise typer.BadParameter('--token or TINVEST_TOKEN is required without --fake')
+
+
+def _create_fake_transport(figi: Optional[str], latency: float) -> Tuple[Any, str]:
+    # The fake server pulls in aiohttp and requests, keep them off startup
+    from ..fake import (  # pylint:disable=import-outside-toplevel
+        FakeServer,
+        FakeTransport,
+    )
+
+    server = FakeServer()
+    return (
+        FakeTransport(server, latency=latency),
+        figi or next(iter(server.instruments)),
+    )
+
+
+async def _run(
+    client: 'ti.AsyncClient',
+    call: Callable[[], Awaitable[Any]],
+    requests: int,
+    concurrency: int,
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one() -> None:
+        async with semaphore:
+            await call()
+
+    async with client:
+        await asyncio.gather(
+            *(run_one() for _ in range(requests)), return_exceptions=True
+        )
+
+
+def _report(spans: List[Span], elapsed: float, concurrency: int) -> None:
+    errors = [span for span in spans if span.error is not None]
+    durations = sorted(span.duration for span in spans)
+    _show('Requests', len(spans))
+    _show('Concurrency', concurrency)
+    if not spans:
+        # Requests failed before they were sent
+        return
+    _show('Errors', len(errors))
+    for span in errors[:1]:
+        _show('First error', repr(span.error))
+    _show('Throughput', f'{len(spans) / elapsed:.1f} req/s')
+    for quantile in QUANTILES:
+        index = min(len(durations) - 1, int(quantile * len(durations)))
+        _show(f'Latency p{quantile * 100:g}', _ms(durations[index]))
+    _show('Latency max', _ms(durations[-1]))
+
+    phases: Dict[str, float] = {}
+    for span in spans:
+        for phase, seconds in span.phases.items():
+            phases[phase] = phases.get(phase, 0.0) + seconds
+    for phase, seconds in phases.items():
+        _show(f'Mean {phase}', _ms(seconds / len(spans)))
+
+
+def _ms(seconds: float) -> str:
+    return f'{seconds * 1e3:.2f} ms'
+
+
+def _show(name: str, value: Any) -> None:
+    typer.echo(f'{name}\t{value}')
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Optional
+
+import typer
+
+
+def daemon(
+    socket_path: Optional[str] = typer.Option(  # noqa:B008
+        None, '--socket', envvar='TINVEST_DAEMON_SOCKET', help='Unix socket path'
+    ),
+    cache_ttl: float = typer.Option(  # noqa:B008
+        60.0, help='Seconds to cache instrument lists and searches, 0 to disable'
+    ),
+    stop: bool = typer.Option(
+        False, '--stop', help='Stop the running daemon'
+    ),  # noqa:B008
+):
+    """
+    Keeps a warm client behind a Unix socket, `tinvest openapi` commands
+    go through it while it is running.
+    """
+    # pylint:disable=import-outside-toplevel
+    from ..daemon import DaemonServer, DaemonTransport, get_socket_path, is_running
+
+    path = socket_path or get_socket_path()
+    if stop:
+        if not is_running(path):
+            typer.echo(f'Daemon is not running on {path}')
+            raise typer.Exit(code=1)
+        DaemonTransport(path).stop()
+        return
+
+    server = DaemonServer(path, cache_ttl=cache_ttl)
+    typer.echo(f'Listening on {path}')
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from e
@@ -0,0 +1,278 @@
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from contextlib import ExitStack, contextmanager
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Type
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+from pydantic.json import pydantic_encoder
+
+from ..typedefs import AnyDict
+
+ARROW_BATCH = 10000  # pragma: no mutate
+SCALARS = (bool, int, float, str)
+
+# Types of columns by name: bool, int, float or str
+Columns = Dict[str, type]
+
+
+class Format(str, Enum):
+    json = 'json'
+    jsonl = 'jsonl'
+    csv = 'csv'
+    arrow = 'arrow'
+    parquet = 'parquet'
+
+
+class RecordWriter(ABC):
+    @abstractmethod
+    def write(self, record: AnyDict) -> None:
+        """Writes a record of `--output`."""
+
+    def close(self) -> None:
+        return
+
+
+class JsonlWriter(RecordWriter):
+    def __init__(self, file: IO[str]):
+        self._file = file
+
+    def write(self, record: AnyDict) -> None:
+        self._file.write(json.dumps(record, default=str) + '\n')
+        self._file.flush()
+
+
+class JsonWriter(RecordWriter):
+    """A JSON array, an item is written per record."""
+
+    def __init__(self, file: IO[str]):
+        self._file = file
+        self._separator = '[\n'
+
+    def write(self, record: AnyDict) -> None:
+        self._file.write(self._separator + json.dumps(record, default=str))
+        self._file.flush()
+        self._separator = ',\n'
+
+    def close(self) -> None:
+        self._file.write('[]\n' if self._separator == '[\n' else '\n]\n')
+
+
+class CsvWriter(RecordWriter):
+    """
+    Columns are `columns` or the keys of the first record,
+    nested values are JSON.
+    """
+
+    def __init__(self, file: IO[str], columns: Optional[Columns] = None):
+        self._file = file
+        self._columns = columns
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, record: AnyDict) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self._file, list(self._columns or record), extrasaction='ignore'
+            )
+            self._writer.writeheader()
+        self._writer.writerow(_flatten(record))
+        self._file.flush()
+
+
+TextWriter = Callable[[IO[str], Optional[Columns]], RecordWriter]
+TEXT_WRITERS: Dict[Format, TextWriter] = {
+    Format.json: lambda file, _: JsonWriter(file),
+    Format.jsonl: lambda file, _: JsonlWriter(file),
+    Format.csv: CsvWriter,
+}
+
+
+class ArrowWriter(RecordWriter):
+    """
+    Arrow IPC stream, a record batch is written per `ARROW_BATCH` records.
+    The schema is `columns` or is inferred from the first batch,
+    requires pyarrow.
+    """
+
+    def __init__(self, sink: Any, columns: Optional[Columns] = None):
+        import pyarrow  # pylint:disable=import-outside-toplevel
+
+        self._pyarrow = pyarrow
+        self._sink = sink
+        self._columns = columns
+        self._rows: List[AnyDict] = []
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def write(self, record: AnyDict) -> None:
+        self._rows.append(_flatten(record))
+        if len(self._rows) >= ARROW_BATCH:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+    def _open(self, schema: Any) -> Any:
+        import pyarrow.ipc  # pylint:disable=import-outside-toplevel
+
+        return pyarrow.ipc.new_stream(self._sink, schema)
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        if self._writer is None:
+            self._schema = self._get_schema()
+            self._writer = self._open(self._schema)
+        self._writer.write_table(
+            self._pyarrow.Table.from_pylist(self._rows, self._schema)
+        )
+        self._rows = []
+
+    def _get_schema(self) -> Any:
+        types = {
+            bool: self._pyarrow.bool_(),
+            int: self._pyarrow.int64(),
+            float: self._pyarrow.float64(),
+        }
+        columns = self._columns or _infer_columns(self._rows)
+        return self._pyarrow.schema(
+            [
+                (key, types.get(column_type, self._pyarrow.string()))
+                for key, column_type in columns.items()
+            ]
+        )
+
+
+class ParquetWriter(ArrowWriter):
+    """Writes a row group per `ARROW_BATCH` records."""
+
+    def _open(self, schema: Any) -> Any:
+        import pyarrow.parquet  # pylint:disable=import-outside-toplevel
+
+        return pyarrow.parquet.ParquetWriter(self._sink, schema)
+
+
+@contextmanager
+def open_writer(
+    fmt: Format, output: Optional[Path], columns: Optional[Columns] = None
+) -> Iterator[RecordWriter]:
+    """
+    Writes to `output` or stdout, Parquet needs `output`.
+    `columns` are the columns of CSV, Arrow and Parquet.
+    """
+    with ExitStack() as stack:
+        writer: RecordWriter
+        if fmt == Format.parquet:
+            if output is None:
+                raise ValueError('Parquet needs an output file')
+            writer = ParquetWriter(str(output), columns)
+        elif fmt == Format.arrow:
+            writer = ArrowWriter(
+                str(output) if output else stack.enter_context(_open_stdout_bytes()),
+                columns,
+            )
+        else:
+            file = stack.enter_context(_open_output(output))
+            writer = TEXT_WRITERS[fmt](file, columns)
+        try:
+            yield writer
+        finally:
+            writer.close()
+
+
+def read_records(path: Path, fmt: Optional[Format] = None) -> Iterator[AnyDict]:
+    """
+    Reads JSONL or CSV, the format is taken from the suffix of `path` if
+    `fmt` is not set, `-` is stdin. Empty CSV cells are skipped.
+    """
+    if fmt is None:
+        fmt = Format.csv if path.suffix == '.csv' else Format.jsonl
+    if str(path) == '-':
+        yield from _parse_records(sys.stdin, fmt)
+        return
+    with open(path, newline='', encoding='utf-8') as file:
+        yield from _parse_records(file, fmt)
+
+
+def _parse_records(file: IO[str], fmt: Format) -> Iterator[AnyDict]:
+    if fmt == Format.csv:
+        for row in csv.DictReader(file):
+            yield {key: value for key, value in row.items() if value}
+        return
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+@contextmanager
+def _open_stdout_bytes() -> Iterator[IO[bytes]]:
+    yield sys.stdout.buffer
+    sys.stdout.buffer.flush()
+
+
+@contextmanager
+def _open_output(path: Optional[Path]) -> Iterator[IO[str]]:
+    if path is None:
+        yield sys.stdout
+        return
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        yield file
+
+
+def get_columns(model: Type[BaseModel]) -> Columns:
+    """Columns of records of `model` by alias, nested values are strings."""
+    return {field.alias: _get_column_type(field) for field in model.__fields__.values()}
+
+
+def _get_column_type(field: Any) -> type:
+    if field.shape != SHAPE_SINGLETON or not isinstance(field.type_, type):
+        return str
+    # Decimals are encoded as floats, enums are strings
+    for column_type in (bool, int, float):
+        if issubclass(field.type_, column_type):
+            return column_type
+    return float if issubclass(field.type_, Decimal) else str
+
+
+def _infer_columns(rows: List[AnyDict]) -> Columns:
+    # Columns without values in the rows are strings
+    return {
+        key: type(next((row[key] for row in rows if row[key] is not None), ''))
+        for key in rows[0]
+    }
+
+
+def to_record(model: BaseModel) -> AnyDict:
+    """Fields of `model` by alias as JSON compatible values."""
+    return _to_primitive(model.dict(by_alias=True))
+
+
+def _to_primitive(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _to_primitive(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_primitive(item) for item in value]
+    # Enums are str subclasses
+    if value is None or type(value) in SCALARS:
+        return value
+    return pydantic_encoder(value)
+
+
+def _flatten(record: AnyDict) -> Dict[str, Any]:
+    return {
+        key: value if value is None or isinstance(value, SCALARS) else _dump(value)
+        for key, value in record.items()
+    }
+
+
+def _dump(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
@@ -0,0 +1,106 @@
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import typer
+
+import tinvest as ti
+
+INDEX_ENV = 'TINVEST_INSTRUMENTS_INDEX'
+MAX_AGE = 24 * 60 * 60  # pragma: no mutate
+FIGI_RE = re.compile(r'BBG[0-9A-Z]{9}')
+STREAMS = (
+    'stream_market_stocks',
+    'stream_market_bonds',
+    'stream_market_etfs',
+    'stream_market_currencies',
+)
+
+
+def get_index_path() -> Path:
+    """`TINVEST_INSTRUMENTS_INDEX` or `tinvest/instruments.json` in the user cache."""
+    if os.environ.get(INDEX_ENV):
+        return Path(os.environ[INDEX_ENV])
+    cache = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache) / 'tinvest' / 'instruments.json'
+
+
+class InstrumentIndex:
+    """
+    FIGIs by ticker and ISIN of all market instruments, kept in a local
+    file and refreshed from the market lists once it is `max_age` seconds old.
+
+    ```python
+    index = InstrumentIndex()
+    figi = index.resolve('AAPL', lambda: ti.SyncClient(TOKEN))
+    ```
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_age: float = MAX_AGE):
+        self.path = path or get_index_path()
+        self.max_age = max_age
+        self._figis: Optional[Dict[str, str]] = None
+
+    def is_fresh(self) -> bool:
+        try:
+            return time.time() - self.path.stat().st_mtime < self.max_age
+        except OSError:
+            return False
+
+    def refresh(self, client: 'ti.SyncClient') -> None:
+        rows = [
+            [instrument.figi, instrument.ticker, instrument.isin]
+            for name in STREAMS
+            for instrument in getattr(client, name)()
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(rows), encoding='utf-8')
+        tmp.replace(self.path)
+        self._figis = None
+
+    def load(self) -> Dict[str, str]:
+        if self._figis is None:
+            self._figis = _build_figis(
+                json.loads(self.path.read_text(encoding='utf-8'))
+            )
+        return self._figis
+
+    def resolve(
+        self, value: str, create_client: Callable[[], 'ti.SyncClient']
+    ) -> Optional[str]:
+        """
+        FIGI of a FIGI, ticker or ISIN, a client is created only to refresh
+        a stale index.
+        """
+        if FIGI_RE.fullmatch(value):
+            return value
+        if not self.is_fresh():
+            self.refresh(create_client())
+        return self.load().get(value.upper())
+
+
+def lookup_figi(
+    value: str,
+    create_client: Callable[[], 'ti.SyncClient'],
+    index: Optional[InstrumentIndex] = None,
+) -> str:
+    """FIGI of a FIGI, ticker or ISIN argument of a command."""
+    figi = (index or InstrumentIndex()).resolve(value, create_client)
+    if figi is None:
+        raise typer.BadParameter(f'Unknown FIGI, ticker or ISIN: {value}')
+    return figi
+
+
+def _build_figis(rows: List[List[Any]]) -> Dict[str, str]:
+    figis = {}
+    for figi, ticker, isin in rows:
+        if isin:
+            figis[isin.upper()] = figi
+        figis[ticker.upper()] = figi
+    # FIGIs win over tickers and ISINs with the same value
+    figis.update((figi.upper(), figi) for figi, _, _ in rows)
+    return figis
@@ -1,6 +1,10 @@
+# pylint:disable=too-many-lines
+import itertools
+import time
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 import typer
 from pydantic import BaseModel
@@ -8,28 +12,58 @@ from pydantic.datetime_parse import parse_datetime
 
 import tinvest as ti
 
+from .formats import Format, get_columns, open_writer, to_record
+from .instruments import lookup_figi
+from .profiling import get_profiler
+
 openapi = typer.Typer()
 
 DATETIME_HELP = (
     'Use one of [now, day, week, month, 6month, year] or any date-time format'
 )
+FIGI_HELP = 'FIGI, ticker or ISIN'
 
 
 class OpenapiCtx(BaseModel):
     token: str = ''
     sandbox_token: str = ''
     use_sandbox: bool = False
+    use_daemon: bool = True
+    output_format: Optional[Format] = None
+    output: Optional[Path] = None
 
 
 class BaseApi:
-    client: ti.SyncClient
+    client: 'ti.SyncClient'
 
 
-def do_request(ctx: typer.Context, method, *args, **kwargs):
+def create_client(ctx: typer.Context) -> 'ti.SyncClient':
+    # pylint:disable=import-outside-toplevel
+    from ..daemon import DaemonTransport, is_running
+
+    profiler = get_profiler(ctx)
+    started = time.perf_counter()
+    transport = DaemonTransport() if ctx.obj.use_daemon and is_running() else None
     if ctx.obj.use_sandbox:
-        client = ti.SyncClient(ctx.obj.sandbox_token, use_sandbox=True)
+        client = ti.SyncClient(
+            ctx.obj.sandbox_token,
+            use_sandbox=True,
+            transport=transport,
+            tracer=profiler,
+        )
     else:
-        client = ti.SyncClient(ctx.obj.token)
+        client = ti.SyncClient(ctx.obj.token, transport=transport, tracer=profiler)
+    if profiler:
+        profiler.timings['client'] = time.perf_counter() - started
+    return client
+
+
+def resolve_figi(ctx: typer.Context, value: str) -> str:
+    return lookup_figi(value, lambda: create_client(ctx))
+
+
+def do_request(ctx: typer.Context, method, *args, **kwargs):
+    client = create_client(ctx)
     try:
         return method(client, *args, **kwargs).payload
     except ti.BadRequestError as e:
@@ -38,6 +72,43 @@ def do_request(ctx: typer.Context, method, *args, **kwargs):
     raise typer.Exit(code=1)
 
 
+def stream_request(ctx: typer.Context, method, *args, **kwargs) -> Iterator[Any]:
+    client = create_client(ctx)
+    try:
+        yield from method(client, *args, **kwargs)
+    except ti.BadRequestError as e:
+        typer.echo(f'500 {e.response.payload}')
+        raise typer.Exit(code=1) from e
+
+
+def output(
+    ctx: typer.Context, rows: Iterable[Any], show_row: Callable[[Any], None]
+) -> int:
+    """
+    Shows rows as tab separated values or writes them in `--format`,
+    rows are written as they come, columns are the fields of their model.
+    Returns the number of rows.
+    """
+    total = 0
+    if ctx.obj.output_format is None:
+        for row in rows:
+            show_row(row)
+            total += 1
+        return total
+
+    rows = iter(rows)
+    first = next(rows, None)
+    columns = None
+    if first is not None:
+        columns = get_columns(type(first))
+        rows = itertools.chain([first], rows)
+    with open_writer(ctx.obj.output_format, ctx.obj.output, columns) as writer:
+        for row in rows:
+            writer.write(to_record(row))
+            total += 1
+    return total
+
+
 def convert_to_datetime(val: str) -> datetime:
     constants = {
         'now': datetime.utcnow(),
@@ -61,16 +132,28 @@ def show(*args):
 
 
 @openapi.callback()
-def openapi_main(
+def openapi_main(  # pylint:disable=too-many-arguments,too-many-positional-arguments
     ctx: typer.Context,
     token: str = typer.Option('', envvar='TINVEST_TOKEN'),  # noqa:B008
     sandbox_token: str = typer.Option('', envvar='TINVEST_SANDBOX_TOKEN'),  # noqa:B008
     use_sandbox: bool = typer.Option(False, '--use-sandbox', '-s'),  # noqa:B008
+    use_daemon: bool = typer.Option(  # noqa:B008
+        True, help='Send requests through `tinvest daemon` when it is running'
+    ),
+    output_format: Optional[Format] = typer.Option(  # noqa:B008
+        None, '--format', help='Machine-readable output instead of a table'
+    ),
+    output_path: Optional[Path] = typer.Option(  # noqa:B008
+        None, '--output', '-o', help='Output file instead of stdout'
+    ),
 ):
     ctx.ensure_object(OpenapiCtx)
     ctx.obj.token = token
     ctx.obj.sandbox_token = sandbox_token
     ctx.obj.use_sandbox = use_sandbox
+    ctx.obj.use_daemon = use_daemon
+    ctx.obj.output_format = output_format
+    ctx.obj.output = output_path
 
 
 @openapi.command()
@@ -80,7 +163,13 @@ def sandbox_register(ctx: typer.Context, broker_account_type: ti.BrokerAccountTy
         ti.SyncClient.register_sandbox_account,
         ti.SandboxRegisterRequest(broker_account_type=broker_account_type),
     )
-    show(payload.broker_account_id, payload.broker_account_type.value)
+    output(
+        ctx,
+        [payload],
+        lambda account: show(
+            account.broker_account_id, account.broker_account_type.value
+        ),
+    )
 
 
 @openapi.command()
@@ -102,13 +191,15 @@ def sandbox_currencies_balance(
 def sandbox_positions_balance(
     ctx: typer.Context,
     balance: float,
-    figi: Optional[str] = None,
+    figi: Optional[str] = typer.Option(None, help=FIGI_HELP),  # noqa:B008
     broker_account_id: Optional[str] = None,
 ):
     do_request(
         ctx,
         ti.SyncClient.set_sandbox_positions_balance,
-        ti.SandboxSetPositionBalanceRequest(balance=balance, figi=figi),
+        ti.SandboxSetPositionBalanceRequest(
+            balance=balance, figi=figi and resolve_figi(ctx, figi)
+        ),
         broker_account_id,
     )
 
@@ -126,8 +217,10 @@ def sandbox_clear(ctx: typer.Context, broker_account_id: Optional[str] = None):
 @openapi.command()
 def orders(ctx: typer.Context, broker_account_id: Optional[str] = None):
     payload = do_request(ctx, ti.SyncClient.get_orders, broker_account_id)
-    for order in payload:
-        show(
+    output(
+        ctx,
+        payload,
+        lambda order: show(
             order.figi,
             order.order_id,
             order.operation.value,
@@ -136,22 +229,24 @@ def orders(ctx: typer.Context, broker_account_id: Optional[str] = None):
             order.price,
             order.requested_lots,
             order.executed_lots,
-        )
+        ),
+    )
 
 
 @openapi.command()
 def orders_limit_order(  # pylint:disable=too-many-arguments
     ctx: typer.Context,
-    figi: str,
-    operation: ti.OperationType,
-    lots: int,
-    price: float,
+    figi: str = typer.Argument(..., help=FIGI_HELP),  # noqa:B008
+    operation: ti.OperationType = typer.Argument(...),  # noqa:B008
+    lots: int = typer.Argument(...),  # noqa:B008
+    price: float = typer.Argument(...),  # noqa:B008
+    *,
     broker_account_id: Optional[str] = None,
 ):
     payload = do_request(
         ctx,
         ti.SyncClient.post_orders_limit_order,
-        figi,
+        resolve_figi(ctx, figi),
         ti.LimitOrderRequest(
             operation=operation,
             lots=lots,
@@ -159,47 +254,41 @@ def orders_limit_order(  # pylint:disable=too-many-arguments
         ),
         broker_account_id,
     )
-    show(
-        payload.order_id,
-        payload.commission and payload.commission.value,
-        payload.commission and payload.commission.currency,
-        payload.executed_lots,
-        payload.operation.value,
-        payload.status.value,
-        payload.reject_reason,
-        payload.message,
-        payload.requested_lots,
-    )
+    output(ctx, [payload], _show_placed_order)
 
 
 @openapi.command()
 def orders_market_order(
     ctx: typer.Context,
-    figi: str,
-    operation: ti.OperationType,
-    lots: int,
+    figi: str = typer.Argument(..., help=FIGI_HELP),  # noqa:B008
+    operation: ti.OperationType = typer.Argument(...),  # noqa:B008
+    lots: int = typer.Argument(...),  # noqa:B008
     broker_account_id: Optional[str] = None,
 ):
     payload = do_request(
         ctx,
         ti.SyncClient.post_orders_market_order,
-        figi,
+        resolve_figi(ctx, figi),
         ti.MarketOrderRequest(
             operation=operation,
             lots=lots,
         ),
         broker_account_id,
     )
+    output(ctx, [payload], _show_placed_order)
+
+
+def _show_placed_order(order: Any):
     show(
-        payload.order_id,
-        payload.commission and payload.commission.value,
-        payload.commission and payload.commission.currency,
-        payload.executed_lots,
-        payload.operation.value,
-        payload.status.value,
-        payload.reject_reason,
-        payload.message,
-        payload.requested_lots,
+        order.order_id,
+        order.commission and order.commission.value,
+        order.commission and order.commission.currency,
+        order.executed_lots,
+        order.operation.value,
+        order.status.value,
+        order.reject_reason,
+        order.message,
+        order.requested_lots,
     )
 
 
@@ -213,69 +302,83 @@ def orders_cancel(
 @openapi.command()
 def portfolio(ctx: typer.Context, broker_account_id: Optional[str] = None):
     payload = do_request(ctx, ti.SyncClient.get_portfolio, broker_account_id)
-    for position in payload.positions:
-        show(
+    output(
+        ctx,
+        payload.positions,
+        lambda position: show(
             position.figi,
             position.lots,
             position.average_position_price and position.average_position_price.value,
             position.balance,
             position.expected_yield and position.expected_yield.value,
             position.name,
-        )
+        ),
+    )
 
 
 @openapi.command()
 def portfolio_currencies(ctx: typer.Context, broker_account_id: Optional[str] = None):
     payload = do_request(ctx, ti.SyncClient.get_portfolio_currencies, broker_account_id)
-    for currency in payload.currencies:
-        show(
+    output(
+        ctx,
+        payload.currencies,
+        lambda currency: show(
             currency.currency.value,
             currency.balance,
             currency.blocked or 0.0,
-        )
+        ),
+    )
 
 
 @openapi.command()
 def market_stocks(ctx: typer.Context):
-    payload = do_request(ctx, ti.SyncClient.get_market_stocks)
-    _show_instruments_payload(payload)
+    _output_instruments(ctx, stream_request(ctx, ti.SyncClient.stream_market_stocks))
 
 
 @openapi.command()
 def market_bonds(ctx: typer.Context):
-    payload = do_request(ctx, ti.SyncClient.get_market_bonds)
-    _show_instruments_payload(payload)
+    _output_instruments(ctx, stream_request(ctx, ti.SyncClient.stream_market_bonds))
 
 
 @openapi.command()
 def market_etfs(ctx: typer.Context):
-    payload = do_request(ctx, ti.SyncClient.get_market_etfs)
-    _show_instruments_payload(payload)
+    _output_instruments(ctx, stream_request(ctx, ti.SyncClient.stream_market_etfs))
 
 
 @openapi.command()
 def market_currencies(ctx: typer.Context):
-    payload = do_request(ctx, ti.SyncClient.get_market_currencies)
-    _show_instruments_payload(payload)
+    _output_instruments(
+        ctx, stream_request(ctx, ti.SyncClient.stream_market_currencies)
+    )
 
 
 @openapi.command()
-def market_orderbook(ctx: typer.Context, figi: str, depth: int):
-    payload = do_request(ctx, ti.SyncClient.get_market_orderbook, figi, depth)
-    show('FIGI', payload.figi)
-    show('Status', payload.trade_status.value)
-    show('Close price', payload.close_price)
-    show('Last price', payload.last_price)
-    show('Face value', payload.face_value)
-    show('Limit down', payload.limit_down)
-    show('Limit up', payload.limit_up)
-    show('Min price increment', payload.min_price_increment)
-    show('Depth', payload.depth)
+def market_orderbook(
+    ctx: typer.Context,
+    figi: str = typer.Argument(..., help=FIGI_HELP),  # noqa:B008
+    depth: int = typer.Argument(...),  # noqa:B008
+):
+    payload = do_request(
+        ctx, ti.SyncClient.get_market_orderbook, resolve_figi(ctx, figi), depth
+    )
+    output(ctx, [payload], _show_orderbook)
+
+
+def _show_orderbook(orderbook: Any):
+    show('FIGI', orderbook.figi)
+    show('Status', orderbook.trade_status.value)
+    show('Close price', orderbook.close_price)
+    show('Last price', orderbook.last_price)
+    show('Face value', orderbook.face_value)
+    show('Limit down', orderbook.limit_down)
+    show('Limit up', orderbook.limit_up)
+    show('Min price increment', orderbook.min_price_increment)
+    show('Depth', orderbook.depth)
     show('Orders')
     orders_ = []
-    for order in payload.asks:
+    for order in orderbook.asks:
         orders_.append(('<  ', order))
-    for order in payload.bids:
+    for order in orderbook.bids:
         orders_.append(('  >', order))
     orders_.sort(key=lambda o: o[1].price, reverse=True)
     for order_type, order in orders_:
@@ -285,21 +388,23 @@ def market_orderbook(ctx: typer.Context, figi: str, depth: int):
 @openapi.command()
 def market_candles(
     ctx: typer.Context,
-    figi: str,
-    interval: ti.CandleResolution,
+    figi: str = typer.Argument(..., help=FIGI_HELP),  # noqa:B008
+    interval: ti.CandleResolution = typer.Argument(...),  # noqa:B008
     from_: str = typer.Argument(..., metavar='FROM', help=DATETIME_HELP),
     to: str = typer.Argument('now', help=DATETIME_HELP),
 ):
-    payload = do_request(
+    candles = stream_request(
         ctx,
-        ti.SyncClient.get_market_candles,
-        figi,
+        ti.SyncClient.stream_market_candles,
+        resolve_figi(ctx, figi),
         convert_to_datetime(from_),
         convert_to_datetime(to),
         interval,
     )
-    for candle in payload.candles:
-        show(
+    output(
+        ctx,
+        candles,
+        lambda candle: show(
             candle.figi,
             candle.time,
             candle.o,
@@ -308,31 +413,42 @@ def market_candles(
             candle.l,
             candle.v,
             candle.interval.value,
-        )
+        ),
+    )
 
 
 @openapi.command()
-def market_search_by_figi(ctx: typer.Context, figi: str):
-    payload = do_request(ctx, ti.SyncClient.get_market_search_by_figi, figi=figi)
-    show(
-        payload.figi,
-        payload.currency and payload.currency.value,
-        payload.lot,
-        payload.min_price_increment,
-        payload.ticker,
-        payload.name,
+def market_search_by_figi(
+    ctx: typer.Context, figi: str = typer.Argument(..., help=FIGI_HELP)  # noqa:B008
+):
+    payload = do_request(
+        ctx, ti.SyncClient.get_market_search_by_figi, figi=resolve_figi(ctx, figi)
+    )
+    output(
+        ctx,
+        [payload],
+        lambda instrument: show(
+            instrument.figi,
+            instrument.currency and instrument.currency.value,
+            instrument.lot,
+            instrument.min_price_increment,
+            instrument.ticker,
+            instrument.name,
+        ),
     )
 
 
 @openapi.command()
 def market_search_by_ticker(ctx: typer.Context, ticker: str):
     payload = do_request(ctx, ti.SyncClient.get_market_search_by_ticker, ticker=ticker)
-    _show_instruments_payload(payload)
+    _output_instruments(ctx, payload.instruments)
 
 
-def _show_instruments_payload(payload: ti.MarketInstrumentList):
-    for instrument in payload.instruments:
-        show(
+def _output_instruments(ctx: typer.Context, instruments: Iterable[Any]):
+    total = output(
+        ctx,
+        instruments,
+        lambda instrument: show(
             instrument.figi,
             instrument.currency and instrument.currency.value,
             instrument.lot,
@@ -340,8 +456,10 @@ def _show_instruments_payload(payload: ti.MarketInstrumentList):
             instrument.min_price_increment,
             instrument.ticker,
             instrument.name,
-        )
-    show('Total', payload.total)
+        ),
+    )
+    if ctx.obj.output_format is None:
+        show('Total', total)
 
 
 @openapi.command()
@@ -349,18 +467,12 @@ def operations(
     ctx: typer.Context,
     from_: str = typer.Argument(..., metavar='FROM', help=DATETIME_HELP),
     to: str = typer.Argument('now', help=DATETIME_HELP),
-    figi: Optional[str] = None,
+    figi: Optional[str] = typer.Option(None, help=FIGI_HELP),  # noqa:B008
     broker_account_id: Optional[str] = None,
 ):
-    payload = do_request(
-        ctx,
-        ti.SyncClient.get_operations,
-        convert_to_datetime(from_),
-        convert_to_datetime(to),
-        figi,
-        broker_account_id,
-    )
-    for operation in payload.operations:
+    commissions = defaultdict(list)
+
+    def show_operation(operation: Any):
         show(
             dt_to_str(operation.date),
             operation.payment,
@@ -369,12 +481,23 @@ def operations(
             operation.figi,
             operation.id,
         )
-    if not payload.operations:
-        return
-    commissions = defaultdict(list)
-    for operation in payload.operations:
         if operation.operation_type == ti.OperationTypeWithCommission.broker_commission:
             commissions[operation.currency].append(operation.payment)
+
+    total = output(
+        ctx,
+        stream_request(
+            ctx,
+            ti.SyncClient.stream_operations,
+            convert_to_datetime(from_),
+            convert_to_datetime(to),
+            figi and resolve_figi(ctx, figi),
+            broker_account_id,
+        ),
+        show_operation,
+    )
+    if not total or ctx.obj.output_format is not None:
+        return
     typer.echo('\nCommissions')
     for currency, values in commissions.items():
         show('', currency.value, sum(values) * -1)
@@ -383,5 +506,10 @@ def operations(
 @openapi.command()
 def accounts(ctx: typer.Context):
     payload = do_request(ctx, ti.SyncClient.get_accounts)
-    for account in payload.accounts:
-        show(account.broker_account_id, account.broker_account_type.value)
+    output(
+        ctx,
+        payload.accounts,
+        lambda account: show(
+            account.broker_account_id, account.broker_account_type.value
+        ),
+    )
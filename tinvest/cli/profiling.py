@@ -0,0 +1,83 @@
+import cProfile
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+
+from ..tracing import Span, Tracer
+
+PROFILER_KEY = 'tinvest.profiler'  # pragma: no mutate
+PARSE_PHASES = ('decode', 'validate')
+
+IMPORTED_AT = time.perf_counter()
+
+
+class Profiler(Tracer):
+    """
+    Timings of a CLI command printed to stderr when the command exits:
+    startup, client construction and phases of each request.
+    """
+
+    def __init__(self, output: Optional[Path] = None):
+        self.startup = get_startup_time()
+        self.timings: Dict[str, float] = {}
+        self.spans: List[Span] = []
+        self._started = time.perf_counter()
+        self._output = output
+        self._cprofile: Optional[cProfile.Profile] = None
+        if output:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def on_end(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def report(self) -> None:
+        total = time.perf_counter() - self._started
+        if self._cprofile and self._output:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._output)
+
+        _echo('startup', self.startup, 'Interpreter start and imports')
+        for name, seconds in self.timings.items():
+            _echo(name, seconds)
+        for span in self.spans:
+            phases = ' '.join(
+                f'{phase}={seconds * 1e3:.1f}ms'
+                for phase, seconds in span.phases.items()
+            )
+            parse = sum(span.phases.get(phase, 0.0) for phase in PARSE_PHASES)
+            _echo(
+                f'{span.method} {span.path}',
+                span.duration,
+                f'status={span.status} tracking_id={span.tracking_id} '
+                f'{phases} parse={parse * 1e3:.1f}ms',
+            )
+        _echo('command', total)
+        if self._output:
+            typer.echo(f'cProfile stats: {self._output}', err=True)
+
+
+def get_startup_time() -> float:
+    """
+    Wall time since the start of the process,
+    since the import of the CLI where `/proc` is not available.
+    """
+    try:
+        with open('/proc/self/stat', encoding='ascii') as file:
+            # Fields after the command name, which may contain spaces
+            fields = file.read().rsplit(')', 1)[1].split()
+        started = int(fields[19]) / os.sysconf('SC_CLK_TCK')
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - started
+    except (OSError, AttributeError, ValueError, IndexError):
+        return time.perf_counter() - IMPORTED_AT
+
+
+def get_profiler(ctx: typer.Context) -> Optional[Profiler]:
+    return ctx.meta.get(PROFILER_KEY)
+
+
+def _echo(name: str, seconds: float, details: str = '') -> None:
+    typer.echo(f'{name:<32} {seconds * 1e3:9.1f} ms  {details}'.rstrip(), err=True)
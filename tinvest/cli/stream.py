@@ -0,0 +1,175 @@
+import asyncio
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+import typer
+
+import tinvest as ti
+
+from .formats import JsonlWriter, RecordWriter, to_record
+from .instruments import InstrumentIndex, lookup_figi
+
+CLEAR_SCREEN = '\x1b[H\x1b[J'  # pragma: no mutate
+
+
+class Kind(str, Enum):
+    candle = 'candle'
+    orderbook = 'orderbook'
+    instrument_info = 'instrument-info'
+
+
+class LiveView:
+    """
+    The latest event of each FIGI, rendered no more often than it is asked
+    to, and message and latency stats of the time since the previous render.
+    """
+
+    def __init__(self, writer: Optional[RecordWriter] = None):
+        self.total = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._writer = writer
+        self._latest: Dict[str, Any] = {}
+        self._latencies: List[float] = []
+        self._window_start = time.monotonic()
+
+    def add(self, event: Any) -> None:
+        self.total += 1
+        if self._writer is not None:
+            self._writer.write(to_record(event))
+        self._latencies.append(
+            (datetime.now(timezone.utc) - event.time).total_seconds()
+        )
+        if isinstance(event, ti.ErrorStreamingResponse):
+            self.errors += 1
+            self.last_error = event.payload.error
+            return
+        self._latest[event.payload.figi] = event.payload
+
+    def render(self) -> List[str]:
+        lines = [
+            _render_payload(payload) for _, payload in sorted(self._latest.items())
+        ]
+        if self.last_error:
+            lines.append(f'Last error: {self.last_error}')
+        lines.append(self._render_stats())
+        return lines
+
+    def _render_stats(self) -> str:
+        now = time.monotonic()
+        elapsed = max(now - self._window_start, 1e-9)
+        latencies = sorted(self._latencies)
+        self._latencies = []
+        self._window_start = now
+
+        stats = f'{len(latencies) / elapsed:.1f} msg/s'
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            stats += (
+                f'\tlatency p50 {p50 * 1e3:.0f} ms max {latencies[-1] * 1e3:.0f} ms'
+            )
+        return f'{stats}\ttotal {self.total}\terrors {self.errors}'
+
+
+def stream(  # pylint:disable=too-many-arguments,too-many-positional-arguments
+    kind: Kind,
+    figis: List[str] = typer.Argument(  # noqa:B008
+        ..., metavar='FIGI...', help='FIGIs, tickers or ISINs'
+    ),
+    token: str = typer.Option('', envvar='TINVEST_TOKEN'),  # noqa:B008
+    interval: ti.CandleResolution = typer.Option(  # noqa:B008
+        ti.CandleResolution.min1, help='Interval of candles'
+    ),
+    depth: int = typer.Option(  # noqa:B008
+        5, min=1, max=20, help='Depth of orderbooks'
+    ),
+    output: Optional[Path] = typer.Option(  # noqa:B008
+        None, '--output', '-o', help='Write every event as JSONL to the file'
+    ),
+    refresh: float = typer.Option(  # noqa:B008
+        1.0, min=0.05, help='Seconds between renders of the live view'
+    ),
+    duration: Optional[float] = typer.Option(  # noqa:B008
+        None, help='Stop after the number of seconds'
+    ),
+):
+    """
+    Subscribes to the Streaming API and renders the latest event of each
+    FIGI with message and latency stats, Ctrl+C to stop.
+    """
+    subscribe = {
+        Kind.candle: lambda s, figi: s.candle.subscribe(figi, interval),
+        Kind.orderbook: lambda s, figi: s.orderbook.subscribe(figi, depth),
+        Kind.instrument_info: lambda s, figi: s.instrument_info.subscribe(figi),
+    }[kind]
+
+    index = InstrumentIndex()
+    figis = [lookup_figi(v, lambda: ti.SyncClient(token), index) for v in figis]
+
+    async def run(view: LiveView) -> None:
+        async with ti.Streaming(token) as streaming:
+            for figi in figis:
+                await subscribe(streaming, figi)
+            await watch(streaming, view, refresh, duration)
+
+    with open(output, 'w', encoding='utf-8') if output else nullcontext() as file:
+        view = LiveView(JsonlWriter(file) if file else None)
+        try:
+            asyncio.run(run(view))
+        except KeyboardInterrupt:
+            pass
+    typer.echo(f'{view.total} events, {view.errors} errors')
+
+
+async def watch(
+    events: Any, view: LiveView, refresh: float, duration: Optional[float] = None
+) -> None:
+    """Feeds `view` from `events` and redraws it every `refresh` seconds."""
+
+    async def consume() -> None:
+        async for event in events:
+            view.add(event)
+
+    async def draw() -> None:
+        while True:
+            await asyncio.sleep(refresh)
+            _draw(view.render())
+
+    drawing = asyncio.create_task(draw())
+    try:
+        await asyncio.wait_for(consume(), duration)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        drawing.cancel()
+    _draw(view.render())
+
+
+def _draw(lines: List[str], file: Optional[IO[str]] = None) -> None:
+    file = file or sys.stdout
+    text = '\n'.join(lines) + '\n'
+    if file.isatty():
+        text = CLEAR_SCREEN + text
+    file.write(text)
+    file.flush()
+
+
+def _render_payload(payload: Any) -> str:
+    if isinstance(payload, ti.OrderbookStreaming):
+        bid = payload.bids[0] if payload.bids else ('-', '-')
+        ask = payload.asks[0] if payload.asks else ('-', '-')
+        return f'{payload.figi}\tbid {bid[0]} x {bid[1]}\task {ask[0]} x {ask[1]}'
+    if isinstance(payload, ti.InstrumentInfoStreaming):
+        return (
+            f'{payload.figi}\t{payload.trade_status}'
+            f'\tlimits {payload.limit_down} - {payload.limit_up}'
+        )
+    return (
+        f'{payload.figi}\t{payload.interval.value}\t{payload.time}'
+        f'\to {payload.o} h {payload.h} l {payload.l} c {payload.c} v {payload.v}'
+    )
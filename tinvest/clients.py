@@ -1,6 +1,27 @@
 # pylint:disable=too-many-lines
+import asyncio
+import functools
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from typing import Any, Optional, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from aiohttp import ClientSession
 from pydantic import BaseModel
@@ -29,17 +50,33 @@ from .apis import (
     sandbox_register_post,
     sandbox_remove_post,
 )
+from .background import BackgroundLoop
+from .batch import (
+    DEFAULT_CONCURRENCY,
+    OrderResult,
+    PlaceOrder,
+    cancel_orders,
+    place_orders,
+)
+from .config import parse_lazy, parse_obj, parse_raw
 from .constants import get_base_url
 from .exceptions import BadRequestError, TooManyRequestsError, UnexpectedError
+from .history import iter_operations
+from .jsonstream import ArrayItemsParser
+from .lazy import LazyModel
+from .limits import RateLimiter
 from .schemas import (
+    Candle,
     CandleResolution,
     CandlesResponse,
     Empty,
     LimitOrderRequest,
     LimitOrderResponse,
+    MarketInstrument,
     MarketInstrumentListResponse,
     MarketOrderRequest,
     MarketOrderResponse,
+    Operation,
     OperationsResponse,
     OrderbookResponse,
     OrdersResponse,
@@ -52,15 +89,163 @@ from .schemas import (
     SearchMarketInstrumentResponse,
     UserAccountsResponse,
 )
-from .typedefs import datetime_or_str
-from .utils import set_default_headers, validate_token
+from .snapshots import PortfolioSnapshot, get_portfolio_snapshot
+from .tracing import (
+    Span,
+    Tracer,
+    get_current_span,
+    get_trace_configs,
+    trace_stream,
+    trace_sync_stream,
+)
+from .transports import (
+    AiohttpTransport,
+    AsyncTransport,
+    RequestsTransport,
+    SyncTransport,
+)
+from .typedefs import AnyDict, datetime_or_str
+from .utils import get_default_headers, set_default_headers, validate_token
 
 __all__ = ('AsyncClient', 'SyncClient')
 
 T = TypeVar('T', bound=BaseModel)  # pragma: no mutate
-
-
-class AsyncClient:
+ItemT = TypeVar('ItemT', bound=BaseModel)  # pragma: no mutate
+
+CHUNK_SIZE = 64 * 1024  # pragma: no mutate
+
+# Key of the array with items
+STREAM_KEYS: Dict[Type[BaseModel], str] = {
+    MarketInstrumentListResponse: 'instruments',
+    OperationsResponse: 'operations',
+    CandlesResponse: 'candles',
+}
+
+
+def _raise_error(status: int, text: str) -> NoReturn:
+    if status == HTTPStatus.BAD_REQUEST:
+        raise BadRequestError(text)
+
+    if status == HTTPStatus.TOO_MANY_REQUESTS:
+        raise TooManyRequestsError
+
+    raise UnexpectedError(status, text)
+
+
+def _parse(response_model: Type[T], status: int, text: str, lazy: bool) -> T:
+    if status != HTTPStatus.OK:
+        _raise_error(status, text)
+    if lazy:
+        # `lazy` methods of the clients return it as LazyModel
+        return cast(T, parse_lazy(response_model, json.loads(text)))
+    return parse_raw(response_model, text)
+
+
+def _parse_traced(
+    span: Span, response_model: Type[T], status: int, text: str, lazy: bool
+) -> T:
+    span.status = status
+    if status != HTTPStatus.OK:
+        _raise_traced_error(span, status, text)
+
+    data = json.loads(text)
+    span.lap('decode')
+    span.tracking_id = data.get('trackingId')
+    try:
+        if lazy:
+            return cast(T, parse_lazy(response_model, data))
+        return parse_obj(response_model, data)
+    finally:
+        span.lap('validate')
+
+
+def _trace_response(status: int) -> Optional[Span]:
+    """Adds the `response` phase and the status to the span of a stream."""
+    span = get_current_span()
+    if span is not None:
+        span.lap('response')
+        span.status = status
+    return span
+
+
+def _raise_traced_error(span: Optional[Span], status: int, text: str) -> NoReturn:
+    try:
+        _raise_error(status, text)
+    except BadRequestError as e:
+        if span is not None:
+            span.tracking_id = e.response.tracking_id
+        raise
+
+
+async def _aiter_items(
+    chunks: AsyncIterator[bytes], key: str, item_model: Type[ItemT]
+) -> AsyncIterator[ItemT]:
+    parser = ArrayItemsParser(key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield parse_obj(item_model, item)
+    parser.close()
+
+
+def _iter_items(
+    chunks: Iterator[bytes], key: str, item_model: Type[ItemT]
+) -> Iterator[ItemT]:
+    parser = ArrayItemsParser(key)
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield parse_obj(item_model, item)
+    parser.close()
+
+
+async def _gather(
+    method: Callable[..., Awaitable[T]],
+    client: 'AsyncClient',
+    args_list: List[Tuple[Any, ...]],
+    return_exceptions: bool,
+) -> List[Union[T, BaseException]]:
+    return await asyncio.gather(
+        *(method(client, *args) for args in args_list),
+        return_exceptions=return_exceptions,
+    )
+
+
+def _call(
+    method: Callable[..., T],
+    client: 'SyncClient',
+    args: Tuple[Any, ...],
+    return_exceptions: bool,
+) -> Union[T, BaseException]:
+    try:
+        return method(client, *args)
+    except Exception as e:  # pylint:disable=broad-except
+        if not return_exceptions:
+            raise
+        return e
+
+
+class _LazyRequests:
+    """Stands for a client in its `get_` methods, responses are proxies."""
+
+    __slots__ = ('_request',)
+
+    def __init__(self, request: Callable[..., Any]):
+        self._request = functools.partial(request, lazy=True)
+
+
+def _lazy_requests(method: Callable[..., Any], request: Callable[..., Any]) -> Any:
+    if not method.__name__.startswith('get_'):
+        raise TypeError(f'{method.__name__} is not a get_ method of a client')
+    return _LazyRequests(request)
+
+
+async def _create_async_client(
+    token: str, use_sandbox: bool, tracer: Optional[Tracer]
+) -> 'AsyncClient':
+    # aiohttp session is created inside the running loop
+    return AsyncClient(token, use_sandbox=use_sandbox, tracer=tracer)
+
+
+class AsyncClient:  # pylint:disable=too-many-public-methods
     """
     ```python
     import os
@@ -75,20 +260,31 @@ class AsyncClient:
     ```
     """
 
-    def __init__(
+    def __init__(  # pylint:disable=too-many-arguments
         self,
         token: str,
         *,
         use_sandbox: bool = False,
         session: Optional[ClientSession] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[AsyncTransport] = None,
+        tracer: Optional[Tracer] = None,
     ):
         validate_token(token)
-        if not session:
-            session = ClientSession()
-
         self._base_url = get_base_url(use_sandbox)
         self._token: str = token
-        self._session = session
+        self._headers = get_default_headers(token)
+        self._transport = transport or AiohttpTransport(
+            session, trace_configs=get_trace_configs(tracer)
+        )
+        self._rate_limiter = rate_limiter
+        self._tracer = tracer
+
+    def _set_headers(self, kwargs: AnyDict) -> None:
+        if 'headers' in kwargs:
+            set_default_headers(kwargs, self._token)
+        else:
+            kwargs['headers'] = self._headers
 
     async def __aenter__(self) -> 'AsyncClient':
         return self
@@ -98,26 +294,68 @@ class AsyncClient:
         return exc_type is None
 
     async def _request(
-        self, method: str, path: str, response_model: Type[T], **kwargs: Any
+        self,
+        method: str,
+        path: str,
+        response_model: Type[T],
+        *,
+        lazy: bool = False,
+        **kwargs: Any,
     ) -> T:
-        url = self._base_url + path
-        set_default_headers(kwargs, self._token)
-        kwargs['raise_for_status'] = False
-
-        async with self._session.request(method, url, **kwargs) as response:
-            if response.status == HTTPStatus.OK:
-                return response_model.parse_raw(await response.text())
-
-            if response.status == HTTPStatus.BAD_REQUEST:
-                raise BadRequestError(await response.text())
-
-            if response.status == HTTPStatus.TOO_MANY_REQUESTS:
-                raise TooManyRequestsError
-
-            raise UnexpectedError(response.status, await response.text())
+        url = await self._prepare(path, kwargs)
+        if self._tracer is not None:
+            with self._tracer.start_span(method, path) as span:
+                async with self._transport.request(method, url, **kwargs) as response:
+                    span.lap('response')
+                    text = await response.text()
+                    span.lap('read')
+                return _parse_traced(span, response_model, response.status, text, lazy)
+
+        async with self._transport.request(method, url, **kwargs) as response:
+            text = await response.text()
+        return _parse(response_model, response.status, text, lazy)
+
+    def _stream(self, item_model: Type[ItemT]) -> Callable[..., AsyncIterator[ItemT]]:
+        """Request of `apis` functions, items of the response array are yielded."""
+
+        def request(
+            method: str, path: str, response_model: Type[BaseModel], **kwargs: Any
+        ) -> AsyncIterator[ItemT]:
+            items = self._iter_stream(method, path, response_model, item_model, kwargs)
+            if self._tracer is None:
+                return items
+            return trace_stream(self._tracer.start_span(method, path), items)
+
+        return request
+
+    async def _iter_stream(
+        self,
+        method: str,
+        path: str,
+        response_model: Type[BaseModel],
+        item_model: Type[ItemT],
+        kwargs: AnyDict,
+    ) -> AsyncIterator[ItemT]:
+        url = await self._prepare(path, kwargs)
+        async with self._transport.request(method, url, **kwargs) as response:
+            span = _trace_response(response.status)
+            if response.status != HTTPStatus.OK:
+                _raise_traced_error(span, response.status, await response.text())
+            chunks = response.iter_chunks(CHUNK_SIZE)
+            async for item in _aiter_items(
+                chunks, STREAM_KEYS[response_model], item_model
+            ):
+                yield item
+
+    async def _prepare(self, path: str, kwargs: AnyDict) -> str:
+        """Sets headers of the request and waits for the rate limiter."""
+        self._set_headers(kwargs)
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
+        return self._base_url + path
 
     async def close(self) -> None:
-        await self._session.close()
+        await self._transport.close()
 
     async def register_sandbox_account(
         self,
@@ -290,6 +528,62 @@ class AsyncClient:
             broker_account_id,
         )
 
+    async def place_orders(
+        self,
+        orders: Iterable[PlaceOrder],
+        broker_account_id: Optional[str] = None,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> List[OrderResult]:
+        """
+        Orders are placed concurrently, `rate_limiter` is the orders bucket
+        in addition to the client one.
+
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            buy = LimitOrderRequest(lots=1, operation='Buy', price=75)
+            sell = MarketOrderRequest(lots=1, operation='Sell')
+            results = await client.place_orders(
+                [('BBG0013HGFT4', buy), ('BBG000B9XRY4', sell)],
+                rate_limiter=RateLimiter(100),
+            )
+            for result in results:
+                print(result.order_id, result.error, result.elapsed)
+        ```
+        """
+        return await place_orders(
+            self,
+            orders,
+            broker_account_id,
+            concurrency=concurrency,
+            rate_limiter=rate_limiter,
+        )
+
+    async def cancel_orders(
+        self,
+        order_ids: Union[Iterable[str], str],
+        broker_account_id: Optional[str] = None,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> List[OrderResult]:
+        """
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            await client.cancel_orders('all', broker_account_id)
+        ```
+        """
+        return await cancel_orders(
+            self,
+            order_ids,
+            broker_account_id,
+            concurrency=concurrency,
+            rate_limiter=rate_limiter,
+        )
+
     async def get_portfolio(
         self,
         broker_account_id: Optional[str] = None,
@@ -482,8 +776,156 @@ class AsyncClient:
             self._request,
         )
 
+    async def snapshot(
+        self,
+        broker_account_id: Optional[str] = None,
+        figis: Optional[Iterable[str]] = None,
+        depth: int = 1,
+    ) -> PortfolioSnapshot:
+        """
+        Portfolio, currencies, orders and orderbooks of positions
+        are requested concurrently.
+        Pass `figis` of expected positions to request their orderbooks
+        in the same round.
+
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            snapshot = await client.snapshot(broker_account_id)
+            for valuation in snapshot.positions:
+                print(valuation.position.figi, valuation.market_value)
+        ```
+        """
+        return await get_portfolio_snapshot(self, broker_account_id, figis, depth)
+
+    async def lazy(
+        self, method: Callable[..., Awaitable[T]], *args: Any
+    ) -> LazyModel[T]:
+        """
+        Calls `method`, an `AsyncClient.get_` method, and returns the response
+        as a `LazyModel`: fields are validated on first access.
+
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            response = await client.lazy(AsyncClient.get_operations, from_, to)
+            ids = [operation.id for operation in response.payload.operations]
+        ```
+        """
+        return cast(
+            LazyModel[T], await method(_lazy_requests(method, self._request), *args)
+        )
+
+    def iter_operations(
+        self,
+        from_: datetime_or_str,
+        to: datetime_or_str,
+        figi: Optional[str] = None,
+        broker_account_id: Optional[str] = None,
+    ) -> AsyncIterator[Operation]:
+        """
+        The period is split into windows which are requested concurrently,
+        operations are yielded in chronological order.
+
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            async for operation in client.iter_operations(from_, to):
+                print(operation)
+        ```
+        """
+        return iter_operations(self, from_, to, figi, broker_account_id)
+
+    def stream_market_stocks(self) -> AsyncIterator[MarketInstrument]:
+        """
+        Instruments are parsed one by one while the response body is read.
+
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            async for instrument in client.stream_market_stocks():
+                print(instrument.ticker)
+        ```
+        """
+        return market_stocks_get(self._stream(MarketInstrument))
+
+    def stream_market_bonds(self) -> AsyncIterator[MarketInstrument]:
+        """
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            async for instrument in client.stream_market_bonds():
+                print(instrument.ticker)
+        ```
+        """
+        return market_bonds_get(self._stream(MarketInstrument))
+
+    def stream_market_etfs(self) -> AsyncIterator[MarketInstrument]:
+        """
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            async for instrument in client.stream_market_etfs():
+                print(instrument.ticker)
+        ```
+        """
+        return market_etfs_get(self._stream(MarketInstrument))
+
+    def stream_market_currencies(self) -> AsyncIterator[MarketInstrument]:
+        """
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            async for instrument in client.stream_market_currencies():
+                print(instrument.ticker)
+        ```
+        """
+        return market_currencies_get(self._stream(MarketInstrument))
+
+    def stream_market_candles(
+        self,
+        figi: str,
+        from_: datetime_or_str,
+        to: datetime_or_str,
+        interval: CandleResolution,
+    ) -> AsyncIterator[Candle]:
+        """
+        Candles are parsed one by one while the response body is read.
+
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            async for candle in client.stream_market_candles(
+                figi, from_, to, CandleResolution.min1
+            ):
+                print(candle.c)
+        ```
+        """
+        return market_candles_get(self._stream(Candle), figi, from_, to, interval)
+
+    def stream_operations(
+        self,
+        from_: datetime_or_str,
+        to: datetime_or_str,
+        figi: Optional[str] = None,
+        broker_account_id: Optional[str] = None,
+    ) -> AsyncIterator[Operation]:
+        """
+        Operations are parsed one by one while the response body is read.
+
+        ```python
+        async def main():
+            client = AsyncClient(TOKEN, use_sandbox=True)
+            async for operation in client.stream_operations(from_, to):
+                print(operation)
+        ```
+        """
+        return operations_get(
+            self._stream(Operation), from_, to, figi, broker_account_id
+        )
+
 
-class SyncClient:
+class SyncClient:  # pylint:disable=too-many-public-methods
     """
     ```python
     import os
@@ -496,45 +938,212 @@ class SyncClient:
 
         # SyncClient methods like AsyncClient methods
         market_bonds = client.get_market_bonds()
+
+    # Without `session` each thread uses its own session,
+    # so the client can be shared by a thread pool
+    orderbooks = client.map(SyncClient.get_market_orderbook, [(figi, 20)] * 10)
+
+    # Requests are made by AsyncClient in a background event loop thread
+    client = SyncClient(TOKEN, background_loop=BackgroundLoop.shared())
     ```
     """
 
-    def __init__(
+    def __init__(  # pylint:disable=too-many-arguments
         self,
         token: str,
         *,
         use_sandbox: bool = False,
         session: Optional[Session] = None,
+        background_loop: Optional[BackgroundLoop] = None,
+        transport: Optional[SyncTransport] = None,
+        tracer: Optional[Tracer] = None,
     ):
         validate_token(token)
-        if not session:
-            session = Session()
-
         self._base_url = get_base_url(use_sandbox)
         self._token: str = token
-        self._session = session
+        self._headers = get_default_headers(token)
+        self._transport = transport or RequestsTransport(session)
+        self._tracer = tracer
+        self._loop = background_loop
+        self._async_client: Optional[AsyncClient] = None
+        self._executors: Dict[Optional[int], ThreadPoolExecutor] = {}
+        self._executors_lock = threading.Lock()
+        if background_loop:
+            self._async_client = background_loop.run(
+                _create_async_client(token, use_sandbox, tracer)
+            )
+
+    def __enter__(self) -> 'SyncClient':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return exc_type is None
+
+    def close(self) -> None:
+        with self._executors_lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown()
+        self._transport.close()
+        if self._loop and self._async_client:
+            self._loop.run(self._async_client.close())
+
+    def gather(
+        self,
+        method: Callable[..., T],
+        arg_list: Iterable[Any],
+        *,
+        return_exceptions: bool = False,
+    ) -> List[Union[T, BaseException]]:
+        """
+        Calls `method`, a `SyncClient` method, for each item of `arg_list`:
+        a tuple of arguments or a single argument.
+        With `background_loop` the calls are concurrent, otherwise serial.
+
+        ```python
+        client = SyncClient(TOKEN, background_loop=BackgroundLoop.shared())
+        orderbooks = client.gather(
+            SyncClient.get_market_orderbook, [(figi, 20) for figi in figis]
+        )
+        ```
+        """
+        args_list = [args if isinstance(args, tuple) else (args,) for args in arg_list]
+        if self._loop and self._async_client:
+            return self._loop.run(
+                _gather(
+                    getattr(AsyncClient, method.__name__),
+                    self._async_client,
+                    args_list,
+                    return_exceptions,
+                )
+            )
+        return [_call(method, self, args, return_exceptions) for args in args_list]
+
+    def map(
+        self,
+        method: Callable[..., T],
+        arg_list: Iterable[Any],
+        max_workers: Optional[int] = None,
+        *,
+        return_exceptions: bool = False,
+    ) -> List[Union[T, BaseException]]:
+        """
+        Calls `method`, a `SyncClient` method, for each item of `arg_list`
+        in a thread pool, each worker thread uses its own session.
+        The pool is created on first use and shut down by `close`.
+
+        ```python
+        orderbooks = client.map(
+            SyncClient.get_market_orderbook,
+            [(figi, 20) for figi in figis],
+            max_workers=8,
+        )
+        ```
+        """
+        args_list = [args if isinstance(args, tuple) else (args,) for args in arg_list]
+        return list(
+            self._get_executor(max_workers).map(
+                lambda args: _call(method, self, args, return_exceptions),
+                args_list,
+            )
+        )
+
+    def _get_executor(self, max_workers: Optional[int]) -> ThreadPoolExecutor:
+        with self._executors_lock:
+            if max_workers not in self._executors:
+                self._executors[max_workers] = ThreadPoolExecutor(
+                    max_workers, thread_name_prefix='tinvest'
+                )
+            return self._executors[max_workers]
+
+    def lazy(self, method: Callable[..., T], *args: Any) -> LazyModel[T]:
+        """
+        Calls `method`, a `SyncClient.get_` method, and returns the response
+        as a `LazyModel`: fields are validated on first access.
+
+        ```python
+        response = client.lazy(SyncClient.get_market_stocks)
+        tickers = [i.ticker for i in response.payload.instruments]
+        ```
+        """
+        return cast(LazyModel[T], method(_lazy_requests(method, self._request), *args))
+
+    def _set_headers(self, kwargs: AnyDict) -> None:
+        if 'headers' in kwargs:
+            set_default_headers(kwargs, self._token)
+        else:
+            kwargs['headers'] = self._headers
 
     def _request(
         self,
         method: str,
         path: str,
         response_model: Type[T],
+        *,
+        lazy: bool = False,
         **kwargs: Any,
     ) -> T:
-        url = self._base_url + path
-        set_default_headers(kwargs, self._token)
-
-        response = self._session.request(method, url, **kwargs)
-        if response.status_code == HTTPStatus.OK:
-            return response_model.parse_raw(response.text)
-
-        if response.status_code == HTTPStatus.BAD_REQUEST:
-            raise BadRequestError(response.text)
-
-        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
-            raise TooManyRequestsError
+        if self._loop and self._async_client:
+            return self._loop.run(
+                self._async_client._request(  # pylint:disable=protected-access
+                    method, path, response_model, lazy=lazy, **kwargs
+                )
+            )
 
-        raise UnexpectedError(response.status_code, response.text)
+        url = self._prepare(path, kwargs)
+        if self._tracer is not None:
+            with self._tracer.start_span(method, path) as span:
+                with self._transport.request(method, url, **kwargs) as response:
+                    span.lap('response')
+                    text = response.text()
+                    span.lap('read')
+                return _parse_traced(span, response_model, response.status, text, lazy)
+
+        with self._transport.request(method, url, **kwargs) as response:
+            text = response.text()
+        return _parse(response_model, response.status, text, lazy)
+
+    def _stream(self, item_model: Type[ItemT]) -> Callable[..., Iterator[ItemT]]:
+        """Request of `apis` functions, items of the response array are yielded."""
+
+        def request(
+            method: str, path: str, response_model: Type[BaseModel], **kwargs: Any
+        ) -> Iterator[ItemT]:
+            if self._loop and self._async_client:
+                stream = self._async_client._stream  # pylint:disable=protected-access
+                return self._loop.iterate(
+                    stream(item_model)(method, path, response_model, **kwargs)
+                )
+
+            items = self._iter_stream(method, path, response_model, item_model, kwargs)
+            if self._tracer is None:
+                return items
+            return trace_sync_stream(self._tracer.start_span(method, path), items)
+
+        return request
+
+    def _iter_stream(
+        self,
+        method: str,
+        path: str,
+        response_model: Type[BaseModel],
+        item_model: Type[ItemT],
+        kwargs: AnyDict,
+    ) -> Iterator[ItemT]:
+        url = self._prepare(path, kwargs)
+        with self._transport.request(method, url, stream=True, **kwargs) as response:
+            span = _trace_response(response.status)
+            if response.status != HTTPStatus.OK:
+                _raise_traced_error(span, response.status, response.text())
+            chunks = response.iter_chunks(CHUNK_SIZE)
+            yield from _iter_items(chunks, STREAM_KEYS[response_model], item_model)
+
+    def _prepare(self, path: str, kwargs: AnyDict) -> str:
+        """Sets headers of the request."""
+        self._set_headers(kwargs)
+        return self._base_url + path
 
     def register_sandbox_account(
         self,
@@ -731,3 +1340,35 @@ class SyncClient:
         return accounts_get(
             self._request,
         )
+
+    def stream_market_stocks(self) -> Iterator[MarketInstrument]:
+        return market_stocks_get(self._stream(MarketInstrument))
+
+    def stream_market_bonds(self) -> Iterator[MarketInstrument]:
+        return market_bonds_get(self._stream(MarketInstrument))
+
+    def stream_market_etfs(self) -> Iterator[MarketInstrument]:
+        return market_etfs_get(self._stream(MarketInstrument))
+
+    def stream_market_currencies(self) -> Iterator[MarketInstrument]:
+        return market_currencies_get(self._stream(MarketInstrument))
+
+    def stream_market_candles(
+        self,
+        figi: str,
+        from_: datetime_or_str,
+        to: datetime_or_str,
+        interval: CandleResolution,
+    ) -> Iterator[Candle]:
+        return market_candles_get(self._stream(Candle), figi, from_, to, interval)
+
+    def stream_operations(
+        self,
+        from_: datetime_or_str,
+        to: datetime_or_str,
+        figi: Optional[str] = None,
+        broker_account_id: Optional[str] = None,
+    ) -> Iterator[Operation]:
+        return operations_get(
+            self._stream(Operation), from_, to, figi, broker_account_id
+        )
@@ -0,0 +1,69 @@
+from enum import Enum
+from typing import Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+from .lazy import LazyModel
+from .numeric import float_model
+from .typedefs import AnyDict
+
+__all__ = (
+    'NumericMode',
+    'configure',
+    'get_model',
+    'parse_lazy',
+    'parse_obj',
+    'parse_raw',
+    'settings',
+)
+
+T = TypeVar('T', bound=BaseModel)  # pragma: no mutate
+
+
+class NumericMode(str, Enum):
+    decimal = 'decimal'
+    float_ = 'float'
+
+
+class Settings:
+    def __init__(self) -> None:
+        self.numeric = NumericMode.decimal
+
+
+settings = Settings()
+
+
+def configure(
+    *,
+    numeric: Optional[Union[NumericMode, str]] = None,
+) -> None:
+    """
+    Library-wide settings.
+
+    ```python
+    import tinvest
+
+    # Prices of responses are parsed as float, orders keep Decimal
+    tinvest.configure(numeric='float')
+    ```
+    """
+    if numeric is not None:
+        settings.numeric = NumericMode(numeric)
+
+
+def get_model(model: Type[T]) -> Type[T]:
+    if settings.numeric == NumericMode.float_:
+        return float_model(model)
+    return model
+
+
+def parse_raw(model: Type[T], raw: Union[str, bytes]) -> T:
+    return get_model(model).parse_raw(raw)
+
+
+def parse_obj(model: Type[T], obj: AnyDict) -> T:
+    return get_model(model).parse_obj(obj)
+
+
+def parse_lazy(model: Type[T], obj: AnyDict) -> LazyModel[T]:
+    return LazyModel(get_model(model), obj)
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+from http import HTTPStatus
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .transports import AiohttpTransport, AsyncTransport, SyncResponse, SyncTransport
+from .typedefs import AnyDict
+
+__all__ = ('DaemonServer', 'DaemonTransport', 'get_socket_path', 'is_running')
+
+SOCKET_ENV = 'TINVEST_DAEMON_SOCKET'  # pragma: no mutate
+DEFAULT_CACHE_TTL = 60.0
+# Responses of these GET requests do not depend on the account
+CACHED_PATHS = (
+    '/market/stocks',
+    '/market/bonds',
+    '/market/etfs',
+    '/market/currencies',
+    '/market/search/by-figi',
+    '/market/search/by-ticker',
+)
+LINE_LIMIT = 1 << 30  # pragma: no mutate
+BUFFER_SIZE = 1 << 16  # pragma: no mutate
+
+
+def get_socket_path() -> str:
+    """
+    `TINVEST_DAEMON_SOCKET`, a socket in `XDG_RUNTIME_DIR` or in a private
+    per-user directory in the temp directory.
+    """
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], 'tinvest.sock')
+    return os.path.join(tempfile.gettempdir(), f'tinvest-{os.getuid()}', 'daemon.sock')
+
+
+def is_running(path: Optional[str] = None) -> bool:
+    """Whether a daemon of the current user listens on `path`."""
+    try:
+        with _connect(path or get_socket_path(), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+class DaemonServer:
+    """
+    Serves requests of `DaemonTransport` over a Unix socket with one warm
+    `AsyncTransport`, so CLI commands and short-lived workers reuse its
+    connections. Instrument lists and searches are cached for `cache_ttl`
+    seconds, expired entries are dropped when a response is cached.
+
+    ```python
+    import asyncio
+    from tinvest.daemon import DaemonServer
+
+    asyncio.run(DaemonServer().serve())
+    ```
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        transport: Optional[AsyncTransport] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        self.path = path or get_socket_path()
+        self.cache_ttl = cache_ttl
+        self.requests = 0
+        self._transport = transport
+        self._cache: Dict[str, Tuple[float, AnyDict]] = {}
+        self._stopped: Optional[asyncio.Event] = None
+
+    async def serve(self) -> None:
+        """Serves until `stop` is called or a client sends the stop command."""
+        if os.path.exists(self.path):
+            if is_running(self.path):
+                raise RuntimeError(f'Daemon is already running on {self.path}')
+            os.unlink(self.path)
+
+        _make_private_directory(os.path.dirname(os.path.abspath(self.path)))
+        self._stopped = asyncio.Event()
+        transport = self._transport or AiohttpTransport()
+        # Requests carry tokens, the socket is never accessible to others
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(
+                lambda reader, writer: self._serve_client(transport, reader, writer),
+                self.path,
+                limit=LINE_LIMIT,
+            )
+        finally:
+            os.umask(umask)
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            await transport.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def handle(self, transport: AsyncTransport, request: AnyDict) -> AnyDict:
+        if request.get('command') == 'stop':
+            self.stop()
+            return {'status': HTTPStatus.OK, 'text': ''}
+
+        self.requests += 1
+        key = self._get_cache_key(request)
+        cached = self._cache.get(key) if key else None
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        async with transport.request(
+            request['method'], request['url'], **request['kwargs']
+        ) as response:
+            result = {'status': response.status, 'text': await response.text()}
+        if key and result['status'] == HTTPStatus.OK:
+            self._cache_result(key, result)
+        return result
+
+    def _cache_result(self, key: str, result: AnyDict) -> None:
+        now = time.monotonic()
+        # Entries are kept in the order they expire
+        self._cache.pop(key, None)
+        self._cache[key] = (now + self.cache_ttl, result)
+        while True:
+            oldest, (expires, _) = next(iter(self._cache.items()))
+            if expires > now:
+                return
+            del self._cache[oldest]
+
+    def _get_cache_key(self, request: AnyDict) -> Optional[str]:
+        if (
+            not self.cache_ttl
+            or request['method'] != 'GET'
+            or not urlsplit(request['url']).path.endswith(CACHED_PATHS)
+        ):
+            return None
+        # Tokens are a part of the key
+        return json.dumps(request, sort_keys=True)
+
+    async def _serve_client(
+        self,
+        transport: AsyncTransport,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            async for line in reader:
+                try:
+                    result = await self.handle(transport, json.loads(line))
+                except Exception as e:  # pylint:disable=broad-except
+                    result = {'error': f'{type(e).__name__}: {e}'}
+                writer.write(json.dumps(result).encode() + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class _DaemonResponse(SyncResponse):
+    def __init__(self, status: int, text: str):
+        self.status = status
+        self._text = text
+
+    def text(self) -> str:
+        return self._text
+
+    def iter_chunks(self, size: int) -> Iterator[bytes]:
+        data = self._text.encode()
+        for start in range(0, len(data), size):
+            end = start + size
+            yield data[start:end]
+
+
+class DaemonTransport(SyncTransport):
+    """
+    Sends `SyncClient` requests through a running `DaemonServer`.
+    Streamed responses are buffered by the daemon.
+
+    ```python
+    from tinvest import SyncClient
+    from tinvest.daemon import DaemonTransport, is_running
+
+    transport = DaemonTransport() if is_running() else None
+    client = SyncClient(TOKEN, transport=transport)
+    ```
+    """
+
+    def __init__(self, path: Optional[str] = None, *, timeout: float = 60):
+        self.path = path or get_socket_path()
+        self.timeout = timeout
+
+    @contextmanager
+    def request(  # type: ignore[override]
+        self, method: str, url: str, stream: bool = False, **kwargs: Any
+    ) -> Iterator[SyncResponse]:
+        result = self._send({'method': method, 'url': url, 'kwargs': kwargs})
+        yield _DaemonResponse(result['status'], result['text'])
+
+    def stop(self) -> None:
+        """Stops the daemon."""
+        self._send({'command': 'stop'})
+
+    def close(self) -> None:
+        return
+
+    def _send(self, request: AnyDict) -> AnyDict:
+        with _connect(self.path, self.timeout) as sock:
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            line = _read_line(sock)
+        if not line:
+            raise ConnectionError(f'Daemon on {self.path} closed the connection')
+        result = json.loads(line)
+        if 'error' in result:
+            raise ConnectionError(f'Daemon error: {result["error"]}')
+        return result
+
+
+def _read_line(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(BUFFER_SIZE)
+        chunks.append(chunk)
+        if not chunk or chunk.endswith(b'\n'):
+            return b''.join(chunks)
+
+
+def _make_private_directory(path: str) -> None:
+    # Others must not be able to replace the socket
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    shared = info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    if info.st_uid not in (os.getuid(), 0) or (
+        shared and not info.st_mode & stat.S_ISVTX
+    ):
+        raise RuntimeError(f'Directory {path} of the socket is not private')
+
+
+def _check_socket(path: str) -> None:
+    # Requests carry tokens, so they are sent only to a socket of the user
+    info = os.lstat(path)
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f'{path} is not a socket of the current user')
+
+
+@contextmanager
+def _connect(path: str, timeout: float) -> Iterator[socket.socket]:
+    _check_socket(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        yield sock
+    finally:
+        sock.close()
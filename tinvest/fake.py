@@ -0,0 +1,630 @@
+# pylint:disable=too-many-lines
+# pylint:disable=unused-argument
+import asyncio
+import bisect
+import itertools
+import json
+import random
+import string
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from .constants import PRODUCTION, SANDBOX
+from .schemas import CandleResolution, Currency, InstrumentType
+from .transports import AsyncResponse, AsyncTransport, SyncResponse, SyncTransport
+from .typedefs import AnyDict
+
+__all__ = ('FakeServer', 'FakeTransport', 'FakeSyncTransport')
+
+DEFAULT_INSTRUMENTS = 50  # pragma: no mutate
+DEFAULT_OPERATIONS = 500  # pragma: no mutate
+DEFAULT_START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+ACCOUNT_ID = 'FAKE0001'  # pragma: no mutate
+MAX_CANDLES = 5000  # pragma: no mutate
+
+# Paths of the sandbox base URL, e.g. /openapi/sandbox/orders and
+# /openapi/sandbox/sandbox/register, are tried after the production ones
+PATH_PREFIXES = (urlsplit(PRODUCTION).path, urlsplit(SANDBOX).path)
+CANDLE_STEPS = {
+    CandleResolution.min1: timedelta(minutes=1),
+    CandleResolution.min2: timedelta(minutes=2),
+    CandleResolution.min3: timedelta(minutes=3),
+    CandleResolution.min5: timedelta(minutes=5),
+    CandleResolution.min10: timedelta(minutes=10),
+    CandleResolution.min15: timedelta(minutes=15),
+    CandleResolution.min30: timedelta(minutes=30),
+    CandleResolution.hour: timedelta(hours=1),
+    CandleResolution.day: timedelta(days=1),
+    CandleResolution.week: timedelta(weeks=1),
+    CandleResolution.month: timedelta(days=30),
+}
+NAME_PARTS = (
+    ('Global', 'United', 'North', 'Pacific', 'First', 'Royal', 'Alpha', 'Nova'),
+    ('Energy', 'Systems', 'Motors', 'Foods', 'Bank', 'Mining', 'Telecom', 'Labs'),
+)
+# Instrument type, lot, price increment, price range
+INSTRUMENT_KINDS = (
+    (InstrumentType.stock, 1, 0.01, (10.0, 500.0)),
+    (InstrumentType.bond, 1, 0.01, (90.0, 110.0)),
+    (InstrumentType.etf, 1, 0.01, (1.0, 100.0)),
+)
+
+Route = Callable[[AnyDict, AnyDict], Any]
+
+
+class FakeError(Exception):
+    def __init__(self, message: str, code: str = 'VALIDATION_ERROR'):
+        super().__init__(message, code)
+        self.message = message
+        self.code = code
+
+
+class FakeServer:  # pylint:disable=too-many-instance-attributes
+    """
+    In-process Tinkoff OpenAPI serving every path of `tinvest.apis`
+    with generated instruments, prices, portfolio and operations.
+    Responses depend only on `seed` and the sequence of requests,
+    orders and sandbox balances are kept in memory.
+
+    ```python
+    from tinvest import AsyncClient
+    from tinvest.fake import FakeServer, FakeTransport
+
+    server = FakeServer(seed=1)
+    client = AsyncClient(TOKEN, transport=FakeTransport(server))
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        seed: int = 0,
+        instruments: int = DEFAULT_INSTRUMENTS,
+        operations: int = DEFAULT_OPERATIONS,
+        start: datetime = DEFAULT_START,
+    ):
+        self.seed = seed
+        self.start = start
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+        self.instruments: Dict[str, AnyDict] = {}
+        self.prices: Dict[str, float] = {}
+        self._tickers: Set[str] = set()
+        self._orderbooks: Dict[Tuple[str, int], str] = {}
+        for kind in INSTRUMENT_KINDS:
+            for _ in range(instruments):
+                self._add_instrument(*kind)
+        for currency in list(Currency)[1:]:
+            self._add_currency(currency)
+        self._lists = {
+            type_: json.dumps(
+                {
+                    'instruments': [
+                        i for i in self.instruments.values() if i['type'] == type_
+                    ],
+                    'total': sum(i['type'] == type_ for i in self.instruments.values()),
+                }
+            )
+            for type_ in InstrumentType
+        }
+
+        self.accounts: List[AnyDict] = [
+            {'brokerAccountType': 'Tinkoff', 'brokerAccountId': ACCOUNT_ID}
+        ]
+        self.orders: Dict[str, AnyDict] = {}
+        self.currencies: Dict[str, float] = {'RUB': 100000.0, 'USD': 1000.0}
+        # FIGI to balance and average price
+        self.positions: Dict[str, Tuple[float, float]] = {}
+        for figi in self._random.sample(sorted(self.prices), 10):
+            price = self.prices[figi] * self._random.uniform(0.8, 1.2)
+            self.positions[figi] = (self._random.randint(1, 100), price)
+        figis = sorted(self.positions)
+        self.operations = sorted(
+            (self._generate_operation(figis) for _ in range(operations)),
+            key=lambda o: o['date'],
+        )
+        self._operation_dates = [_parse_date(o['date']) for o in self.operations]
+
+        self._routes: Dict[Tuple[str, str], Route] = {
+            ('POST', '/sandbox/register'): self._sandbox_register,
+            ('POST', '/sandbox/currencies/balance'): self._sandbox_currencies,
+            ('POST', '/sandbox/positions/balance'): self._sandbox_positions,
+            ('POST', '/sandbox/remove'): self._sandbox_remove,
+            ('POST', '/sandbox/clear'): self._sandbox_clear,
+            ('GET', '/orders'): self._orders,
+            ('POST', '/orders/limit-order'): self._limit_order,
+            ('POST', '/orders/market-order'): self._market_order,
+            ('POST', '/orders/cancel'): self._cancel,
+            ('GET', '/portfolio'): self._portfolio,
+            ('GET', '/portfolio/currencies'): self._portfolio_currencies,
+            ('GET', '/market/stocks'): lambda *_: self._lists[InstrumentType.stock],
+            ('GET', '/market/bonds'): lambda *_: self._lists[InstrumentType.bond],
+            ('GET', '/market/etfs'): lambda *_: self._lists[InstrumentType.etf],
+            ('GET', '/market/currencies'): lambda *_: self._lists[
+                InstrumentType.currency
+            ],
+            ('GET', '/market/orderbook'): self._orderbook,
+            ('GET', '/market/candles'): self._candles,
+            ('GET', '/market/search/by-figi'): self._search_by_figi,
+            ('GET', '/market/search/by-ticker'): self._search_by_ticker,
+            ('GET', '/operations'): self._operations,
+            ('GET', '/user/accounts'): lambda *_: {'accounts': self.accounts},
+        }
+
+    def handle(
+        self,
+        method: str,
+        url: str,
+        params: Optional[AnyDict] = None,
+        data: Optional[str] = None,
+    ) -> Tuple[int, str]:
+        """Returns the status and the body of a response to the request."""
+        route = self._get_route(method, urlsplit(url).path)
+        with self._lock:
+            self.requests += 1
+            tracking_id = f'fake{self.requests}'
+            if route is None:
+                return HTTPStatus.NOT_FOUND, ''
+            try:
+                payload = route(params or {}, json.loads(data) if data else {})
+            except FakeError as e:
+                error = {'message': e.message, 'code': e.code}
+                return HTTPStatus.BAD_REQUEST, _dump(tracking_id, 'Error', error)
+        return HTTPStatus.OK, _dump(tracking_id, 'Ok', payload)
+
+    def _get_route(self, method: str, path: str) -> Optional[Route]:
+        for prefix in PATH_PREFIXES:
+            route = self._routes.get((method, path.partition(prefix)[2]))
+            if path.startswith(prefix) and route is not None:
+                return route
+        return self._routes.get((method, path))
+
+    def _next_id(self) -> str:
+        return str(next(self._ids))
+
+    def _add_instrument(
+        self, type_: InstrumentType, lot: int, increment: float, prices: Any
+    ) -> None:
+        ticker = ''.join(self._random.choices(string.ascii_uppercase, k=4))
+        while ticker in self._tickers:
+            ticker = ''.join(self._random.choices(string.ascii_uppercase, k=4))
+        self._tickers.add(ticker)
+        figi = 'BBG' + ''.join(
+            self._random.choices(string.ascii_uppercase + string.digits, k=9)
+        )
+        currency = 'RUB' if type_ == InstrumentType.bond else 'USD'
+        self.instruments[figi] = {
+            'figi': figi,
+            'ticker': ticker,
+            'isin': f'US{self._random.randrange(10 ** 10):010d}',
+            'minPriceIncrement': increment,
+            'lot': lot,
+            'currency': currency,
+            'name': ' '.join(self._random.choice(part) for part in NAME_PARTS),
+            'type': type_.value,
+        }
+        self.prices[figi] = _round(self._random.uniform(*prices), increment)
+
+    def _add_currency(self, currency: Currency) -> None:
+        figi = f'BBG0013{currency.value}{len(self.instruments) % 100:02d}'
+        self.instruments[figi] = {
+            'figi': figi,
+            'ticker': f'{currency.value}000UTSTOM',
+            'minPriceIncrement': 0.0025,
+            'lot': 1000,
+            'currency': 'RUB',
+            'name': f'{currency.value} RUB',
+            'type': InstrumentType.currency.value,
+        }
+        self.prices[figi] = _round(self._random.uniform(0.5, 100.0), 0.0025)
+
+    def _instrument(self, figi: str) -> AnyDict:
+        try:
+            return self.instruments[figi]
+        except KeyError:
+            raise FakeError(f'Instrument {figi} not found', 'NOT_FOUND') from None
+
+    def _check_account(self, params: AnyDict) -> None:
+        account_id = params.get('brokerAccountId')
+        if account_id and all(
+            a['brokerAccountId'] != account_id for a in self.accounts
+        ):
+            raise FakeError(f'Account {account_id} not found', 'NOT_FOUND')
+
+    def _generate_operation(self, figis: List[str]) -> AnyDict:
+        figi = self._random.choice(figis)
+        instrument = self.instruments[figi]
+        date = self.start - timedelta(seconds=self._random.randrange(365 * 86400))
+        operation_type = self._random.choice(('Buy', 'Buy', 'Sell', 'Dividend'))
+        operation: AnyDict = {
+            'id': self._next_id(),
+            'figi': figi,
+            'instrumentType': instrument['type'],
+            'currency': instrument['currency'],
+            'date': date.isoformat(),
+            'isMarginCall': False,
+            'operationType': operation_type,
+            'status': 'Done',
+        }
+        price = self.prices[figi]
+        if operation_type == 'Dividend':
+            operation['payment'] = round(price * 0.01, 2)
+            return operation
+
+        quantity = self._random.randint(1, 10) * instrument['lot']
+        payment = round(price * quantity, 2)
+        operation.update(
+            payment=-payment if operation_type == 'Buy' else payment,
+            price=price,
+            quantity=quantity,
+            quantityExecuted=quantity,
+            commission={
+                'currency': instrument['currency'],
+                'value': -round(payment * 0.0005, 2),
+            },
+            trades=[
+                {
+                    'tradeId': self._next_id(),
+                    'date': date.isoformat(),
+                    'price': price,
+                    'quantity': quantity,
+                }
+            ],
+        )
+        return operation
+
+    def _sandbox_register(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        account = {
+            'brokerAccountType': body.get('brokerAccountType', 'Tinkoff'),
+            'brokerAccountId': f'SB{self._next_id()}',
+        }
+        self.accounts.append(account)
+        return account
+
+    def _sandbox_currencies(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        self.currencies[body['currency']] = float(body['balance'])
+        return {}
+
+    def _sandbox_positions(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        figi = body['figi']
+        self._instrument(figi)
+        self.positions[figi] = (float(body['balance']), self.prices[figi])
+        return {}
+
+    def _sandbox_remove(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        account_id = params.get('brokerAccountId', ACCOUNT_ID)
+        self.accounts = [a for a in self.accounts if a['brokerAccountId'] != account_id]
+        return {}
+
+    def _sandbox_clear(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        self.orders.clear()
+        self.positions.clear()
+        self.currencies = dict.fromkeys(self.currencies, 0.0)
+        return {}
+
+    def _orders(self, params: AnyDict, body: AnyDict) -> List[AnyDict]:
+        self._check_account(params)
+        return list(self.orders.values())
+
+    def _limit_order(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        figi = params['figi']
+        self._instrument(figi)
+        order_id = self._next_id()
+        self.orders[order_id] = {
+            'orderId': order_id,
+            'figi': figi,
+            'operation': body['operation'],
+            'status': 'New',
+            'requestedLots': body['lots'],
+            'executedLots': 0,
+            'type': 'Limit',
+            'price': body['price'],
+        }
+        return {
+            'orderId': order_id,
+            'operation': body['operation'],
+            'status': 'New',
+            'requestedLots': body['lots'],
+            'executedLots': 0,
+        }
+
+    def _market_order(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        instrument = self._instrument(params['figi'])
+        price = self.prices[instrument['figi']]
+        lots = body['lots']
+        sign = 1 if body['operation'] == 'Buy' else -1
+        balance, average = self.positions.get(instrument['figi'], (0, price))
+        quantity = lots * instrument['lot']
+        if balance + sign * quantity:
+            self.positions[instrument['figi']] = (balance + sign * quantity, average)
+        else:
+            self.positions.pop(instrument['figi'], None)
+        currency = instrument['currency']
+        self.currencies[currency] = self.currencies.get(currency, 0.0) - round(
+            sign * price * quantity, 2
+        )
+        return {
+            'orderId': self._next_id(),
+            'operation': body['operation'],
+            'status': 'Fill',
+            'requestedLots': lots,
+            'executedLots': lots,
+            'commission': {
+                'currency': currency,
+                'value': round(price * quantity * 0.0005, 2),
+            },
+        }
+
+    def _cancel(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        if self.orders.pop(params['orderId'], None) is None:
+            raise FakeError(f'Order {params["orderId"]} not found', 'NOT_FOUND')
+        return {}
+
+    def _portfolio(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        positions = []
+        for figi, (balance, average) in self.positions.items():
+            instrument = self.instruments[figi]
+            currency = instrument['currency']
+            positions.append(
+                {
+                    'figi': figi,
+                    'ticker': instrument['ticker'],
+                    'isin': instrument.get('isin'),
+                    'instrumentType': instrument['type'],
+                    'name': instrument['name'],
+                    'balance': balance,
+                    'lots': int(balance // instrument['lot']),
+                    'averagePositionPrice': {'currency': currency, 'value': average},
+                    'expectedYield': {
+                        'currency': currency,
+                        'value': round((self.prices[figi] - average) * balance, 2),
+                    },
+                }
+            )
+        return {'positions': positions}
+
+    def _portfolio_currencies(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        return {
+            'currencies': [
+                {'currency': currency, 'balance': balance}
+                for currency, balance in self.currencies.items()
+            ]
+        }
+
+    def _orderbook(self, params: AnyDict, body: AnyDict) -> str:
+        instrument = self._instrument(params['figi'])
+        depth = int(params['depth'])
+        if not 1 <= depth <= 20:
+            raise FakeError('Depth should be in range 1..20')
+        # Prices do not move, so orderbooks are dumped once
+        key = (instrument['figi'], depth)
+        if key not in self._orderbooks:
+            self._orderbooks[key] = json.dumps(self._generate_orderbook(*key))
+        return self._orderbooks[key]
+
+    def _generate_orderbook(self, figi: str, depth: int) -> AnyDict:
+        instrument = self.instruments[figi]
+        increment = instrument['minPriceIncrement']
+        price = self.prices[figi]
+        book = random.Random(f'{self.seed}:{figi}')
+        return {
+            'figi': figi,
+            'depth': depth,
+            'asks': [
+                {
+                    'price': _round(price + increment * (i + 1), increment),
+                    'quantity': book.randint(1, 1000),
+                }
+                for i in range(depth)
+            ],
+            'bids': [
+                {
+                    'price': _round(price - increment * i, increment),
+                    'quantity': book.randint(1, 1000),
+                }
+                for i in range(depth)
+            ],
+            'tradeStatus': 'NormalTrading',
+            'minPriceIncrement': increment,
+            'lastPrice': price,
+            'closePrice': price,
+        }
+
+    def _candles(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        figi = self._instrument(params['figi'])['figi']
+        interval = CandleResolution(params['interval'])
+        step = CANDLE_STEPS[interval]
+        begin, end = _parse_date(params['from']), _parse_date(params['to'])
+        if (end - begin) / step > MAX_CANDLES:
+            raise FakeError(f'Too many candles for interval {interval.value}')
+        slot = (begin - self.start) // step
+        candles = []
+        close = self._level(figi, interval, slot - 1)[0]
+        while self.start + slot * step < end:
+            time_ = self.start + slot * step
+            candle = self._candle(figi, interval, slot, close)
+            close = candle['c']
+            if time_ >= begin:
+                candle['time'] = time_.isoformat()
+                candles.append(candle)
+            slot += 1
+        return {'figi': figi, 'interval': interval.value, 'candles': candles}
+
+    def _candle(
+        self, figi: str, interval: CandleResolution, slot: int, open_: float
+    ) -> AnyDict:
+        # Prices of a slot depend only on the slot, so ranges are consistent
+        close, rnd = self._level(figi, interval, slot)
+        increment = self.instruments[figi]['minPriceIncrement']
+        return {
+            'figi': figi,
+            'interval': interval.value,
+            'o': open_,
+            'c': close,
+            'h': _round(max(open_, close) * (1 + rnd.random() / 200), increment),
+            'l': _round(min(open_, close) * (1 - rnd.random() / 200), increment),
+            'v': rnd.randint(1, 10000),
+        }
+
+    def _level(
+        self, figi: str, interval: CandleResolution, slot: int
+    ) -> Tuple[float, random.Random]:
+        rnd = random.Random(f'{self.seed}:{figi}:{interval.value}:{slot}')
+        increment = self.instruments[figi]['minPriceIncrement']
+        return _round(self.prices[figi] * (1 + rnd.gauss(0, 0.02)), increment), rnd
+
+    def _search_by_figi(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        return self._instrument(params['figi'])
+
+    def _search_by_ticker(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        instruments = [
+            i for i in self.instruments.values() if i['ticker'] == params['ticker']
+        ]
+        return {'instruments': instruments, 'total': len(instruments)}
+
+    def _operations(self, params: AnyDict, body: AnyDict) -> AnyDict:
+        self._check_account(params)
+        begin, end = _parse_date(params['from']), _parse_date(params['to'])
+        figi = params.get('figi')
+        first = bisect.bisect_left(self._operation_dates, begin)
+        last = bisect.bisect_left(self._operation_dates, end)
+        operations = self.operations[first:last]
+        return {
+            'operations': [o for o in operations if figi is None or o['figi'] == figi]
+        }
+
+
+class _FakeAsyncResponse(AsyncResponse):
+    def __init__(self, status: int, text: str):
+        self.status = status
+        self._text = text
+
+    async def text(self) -> str:
+        return self._text
+
+    # pylint:disable=invalid-overridden-method
+    async def iter_chunks(self, size: int) -> AsyncIterator[bytes]:  # type: ignore
+        for chunk in _split(self._text, size):
+            yield chunk
+
+
+class FakeTransport(AsyncTransport):
+    """
+    Serves `AsyncClient` requests from a `FakeServer` without network,
+    `latency` seconds are awaited before each response.
+
+    ```python
+    from tinvest import AsyncClient
+    from tinvest.fake import FakeTransport
+
+    client = AsyncClient(TOKEN, transport=FakeTransport(latency=0.005))
+    ```
+    """
+
+    def __init__(self, server: Optional[FakeServer] = None, *, latency: float = 0):
+        self.server = server or FakeServer()
+        self.latency = latency
+
+    # pylint:disable=invalid-overridden-method
+    @asynccontextmanager
+    async def request(  # type: ignore[override]
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[AsyncResponse]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        status, text = self.server.handle(
+            method, url, kwargs.get('params'), kwargs.get('data')
+        )
+        yield _FakeAsyncResponse(status, text)
+
+    async def close(self) -> None:
+        return
+
+
+class _FakeSyncResponse(SyncResponse):
+    def __init__(self, status: int, text: str):
+        self.status = status
+        self._text = text
+
+    def text(self) -> str:
+        return self._text
+
+    def iter_chunks(self, size: int) -> Iterator[bytes]:
+        return _split(self._text, size)
+
+
+class FakeSyncTransport(SyncTransport):
+    """
+    Serves `SyncClient` requests from a `FakeServer` without network,
+    `latency` seconds are slept before each response.
+    """
+
+    def __init__(self, server: Optional[FakeServer] = None, *, latency: float = 0):
+        self.server = server or FakeServer()
+        self.latency = latency
+
+    @contextmanager
+    def request(  # type: ignore[override]
+        self, method: str, url: str, stream: bool = False, **kwargs: Any
+    ) -> Iterator[SyncResponse]:
+        if self.latency:
+            time.sleep(self.latency)
+        status, text = self.server.handle(
+            method, url, kwargs.get('params'), kwargs.get('data')
+        )
+        yield _FakeSyncResponse(status, text)
+
+    def close(self) -> None:
+        return
+
+
+def _dump(tracking_id: str, status: str, payload: Any) -> str:
+    if not isinstance(payload, str):
+        payload = json.dumps(payload)
+    # Payloads of instrument lists are dumped once
+    return (
+        f'{{"trackingId": "{tracking_id}", "status": "{status}", '
+        f'"payload": {payload}}}'
+    )
+
+
+def _round(value: float, increment: float) -> float:
+    return round(round(value / increment) * increment, 6)
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _split(text: str, size: int) -> Iterator[bytes]:
+    data = text.encode()
+    for start in range(0, len(data), size):
+        end = start + size
+        yield data[start:end]
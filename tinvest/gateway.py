@@ -0,0 +1,249 @@
+import asyncio
+import bisect
+import logging
+import math
+import time
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from .schemas import LimitOrderResponse, MarketOrderResponse, OperationType
+from .typedefs import AnyDict
+
+if TYPE_CHECKING:
+    from .clients import AsyncClient  # pragma: no cover
+
+__all__ = ('LatencyHistogram', 'OrderTemplate', 'OrderGateway')
+
+logger = logging.getLogger(__name__)
+
+# 0.5ms ... ~16s
+DEFAULT_BOUNDS = tuple(0.0005 * 2**i for i in range(16))  # pragma: no mutate
+
+Price = Union[int, float, Decimal]
+Ping = Callable[['AsyncClient'], Awaitable[Any]]
+
+
+class LatencyHistogram:
+    """
+    Cumulative latency histogram in seconds with fixed bucket bounds.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-th percentile."""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            if total >= rank:
+                return min(bound, self.max or bound)
+        return self.max
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        return list(zip(self.bounds + (float('inf'),), self.counts))
+
+
+class OrderTemplate:
+    """
+    Prebuilt request of an order: path, query and the static part of the body.
+    Only lots and price are formatted on submit.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        response_model: Type[BaseModel],
+        params: AnyDict,
+        operation: OperationType,
+    ):
+        self.path = path
+        self.response_model = response_model
+        self.params = params
+        self._operation = f'"operation": "{operation.value}"'
+
+    def body(self, lots: int, price: Optional[Price] = None) -> str:
+        if price is None:
+            return f'{{"lots": {int(lots)}, {self._operation}}}'
+        return (
+            f'{{"lots": {int(lots)}, {self._operation}, '
+            f'"price": {_format_price(price)}}}'
+        )
+
+
+class OrderGateway:
+    """
+    Latency oriented order entry.
+    Keeps `connections` keep-alive connections warm by pinging every
+    `keepalive_interval` seconds and measures submit-to-ack latency.
+
+    ```python
+    from tinvest import AsyncClient, OperationType, OrderGateway
+
+    async def main():
+        async with AsyncClient(TOKEN) as client:
+            async with OrderGateway(client) as gateway:
+                buy = gateway.limit_order_template('BBG0013HGFT4', OperationType.buy)
+                await gateway.limit_order(buy, lots=1, price=75.5)
+                print(gateway.latency.percentile(99))
+    ```
+    """
+
+    def __init__(
+        self,
+        client: 'AsyncClient',
+        *,
+        keepalive_interval: float = 10.0,
+        connections: int = 2,
+        ping: Optional[Ping] = None,
+    ):
+        self._client = client
+        self._keepalive_interval = keepalive_interval
+        self._connections = connections
+        self._ping = ping or _ping
+        self._ping_task: Optional[asyncio.Task] = None
+        self.latency = LatencyHistogram()
+        self.latency_by_path: Dict[str, LatencyHistogram] = {}
+
+    async def __aenter__(self) -> 'OrderGateway':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        await self.warm_up()
+        self._ping_task = asyncio.create_task(self._keep_alive())
+
+    async def stop(self) -> None:
+        if self._ping_task:
+            self._ping_task.cancel()
+            await asyncio.gather(self._ping_task, return_exceptions=True)
+            self._ping_task = None
+
+    async def warm_up(self) -> None:
+        """Opens connections with concurrent pings (DNS, TCP and TLS)."""
+        results = await asyncio.gather(
+            *(self._ping(self._client) for _ in range(self._connections)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning('Ping error: %s', result)
+
+    def limit_order_template(
+        self,
+        figi: str,
+        operation: OperationType,
+        broker_account_id: Optional[str] = None,
+    ) -> OrderTemplate:
+        return OrderTemplate(
+            '/orders/limit-order',
+            LimitOrderResponse,
+            _get_params(figi, broker_account_id),
+            operation,
+        )
+
+    def market_order_template(
+        self,
+        figi: str,
+        operation: OperationType,
+        broker_account_id: Optional[str] = None,
+    ) -> OrderTemplate:
+        return OrderTemplate(
+            '/orders/market-order',
+            MarketOrderResponse,
+            _get_params(figi, broker_account_id),
+            operation,
+        )
+
+    async def limit_order(
+        self, template: OrderTemplate, lots: int, price: Price
+    ) -> LimitOrderResponse:
+        return await self.submit(template, template.body(lots, price))
+
+    async def market_order(
+        self, template: OrderTemplate, lots: int
+    ) -> MarketOrderResponse:
+        return await self.submit(template, template.body(lots))
+
+    async def submit(self, template: OrderTemplate, body: str) -> Any:
+        start = time.perf_counter()
+        try:
+            return await self._client._request(  # pylint:disable=protected-access
+                'POST',
+                template.path,
+                template.response_model,
+                params=template.params,
+                data=body,
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            self.latency.record(elapsed)
+            if template.path not in self.latency_by_path:
+                self.latency_by_path[template.path] = LatencyHistogram(
+                    self.latency.bounds
+                )
+            self.latency_by_path[template.path].record(elapsed)
+
+    async def _keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(self._keepalive_interval)
+            await self.warm_up()
+
+
+async def _ping(client: 'AsyncClient') -> Any:
+    return await client.get_accounts()
+
+
+def _get_params(figi: str, broker_account_id: Optional[str]) -> AnyDict:
+    params: AnyDict = {'figi': figi}
+    if broker_account_id:
+        params['brokerAccountId'] = broker_account_id
+    return params
+
+
+def _format_price(price: Price) -> str:
+    # NaN and infinity are not valid JSON numbers
+    if isinstance(price, float):
+        if not math.isfinite(price):
+            raise ValueError(f'Price must be finite: {price}')
+        return repr(price)
+    if isinstance(price, Decimal):
+        if not price.is_finite():
+            raise ValueError(f'Price must be finite: {price}')
+        return str(price)
+    # bool is an int, but str(True) is not a JSON number
+    if isinstance(price, int) and not isinstance(price, bool):
+        return str(price)
+    raise TypeError(f'Unsupported price type: {type(price).__name__}')
@@ -0,0 +1,176 @@
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from pydantic.datetime_parse import parse_datetime
+
+from .schemas import Operation, OperationsResponse
+from .typedefs import datetime_or_str
+
+if TYPE_CHECKING:
+    from .clients import AsyncClient  # pragma: no cover
+
+__all__ = ('iter_operations', 'Windows')
+
+DEFAULT_WINDOW = timedelta(days=30)  # pragma: no mutate
+MIN_WINDOW = timedelta(hours=1)  # pragma: no mutate
+MAX_WINDOW = timedelta(days=365)  # pragma: no mutate
+
+WindowRequest = Tuple[datetime, datetime, 'asyncio.Task[OperationsResponse]']
+
+
+class Windows:
+    """
+    Splits a period into consecutive windows.
+    The window size is halved after a window with more than `max_operations`
+    operations and doubled after a window with less than a quarter of it.
+    """
+
+    def __init__(
+        self,
+        from_: datetime,
+        to: datetime,
+        window: timedelta = DEFAULT_WINDOW,
+        max_operations: int = 1000,
+    ):
+        self._cursor = from_
+        self._to = to
+        self.size = window
+        self._max_operations = max_operations
+
+    def __bool__(self) -> bool:
+        return self._cursor < self._to
+
+    def next(self) -> Tuple[datetime, datetime]:
+        start = self._cursor
+        self._cursor = min(start + self.size, self._to)
+        return start, self._cursor
+
+    def rewind(self, cursor: datetime) -> None:
+        """Continues splitting from `cursor` with the current window size."""
+        self._cursor = cursor
+
+    def adapt(self, operations_count: int) -> None:
+        if operations_count > self._max_operations:
+            self.size = max(self.size / 2, MIN_WINDOW)
+        elif operations_count < self._max_operations / 4:
+            self.size = min(self.size * 2, MAX_WINDOW)
+
+
+async def iter_operations(  # pylint:disable=too-many-arguments
+    client: 'AsyncClient',
+    from_: datetime_or_str,
+    to: datetime_or_str,
+    figi: Optional[str] = None,
+    broker_account_id: Optional[str] = None,
+    *,
+    window: timedelta = DEFAULT_WINDOW,
+    max_operations: int = 1000,
+    prefetch: int = 1,
+) -> AsyncIterator[Operation]:
+    """
+    Yields operations in chronological order window by window.
+    Up to `prefetch` next windows are requested while the current one is consumed,
+    so at most `prefetch + 1` windows of operations are kept in memory.
+    """
+    windows = Windows(_to_datetime(from_), _to_datetime(to), window, max_operations)
+    requests = _WindowRequests(
+        windows,
+        lambda start, end: client.get_operations(start, end, figi, broker_account_id),
+        prefetch,
+    )
+    try:
+        requests.schedule()
+        async for operation in _iter_unique(requests):
+            yield operation
+    finally:
+        requests.cancel()
+
+
+class _WindowRequests:
+    """
+    Requests of consecutive windows, prefetched in order.
+    Requested windows larger than a shrunk window size are requested again.
+    """
+
+    def __init__(
+        self,
+        windows: Windows,
+        request: Callable[[datetime, datetime], Awaitable[OperationsResponse]],
+        prefetch: int,
+    ):
+        self._windows = windows
+        self._request = request
+        self._prefetch = max(prefetch, 1)
+        self._pending: Deque[WindowRequest] = deque()
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def schedule(self) -> None:
+        while self._windows and len(self._pending) < self._prefetch:
+            start, end = self._windows.next()
+            task = asyncio.ensure_future(self._request(start, end))
+            self._pending.append((start, end, task))
+
+    async def next(self) -> Tuple[datetime, List[Operation]]:
+        _, end, task = self._pending.popleft()
+        operations = (await task).payload.operations
+        self._windows.adapt(len(operations))
+        self._resplit()
+        self.schedule()
+        return end, operations
+
+    def cancel(self) -> None:
+        while self._pending:
+            self._pending.pop()[2].cancel()
+
+    def _resplit(self) -> None:
+        if not self._pending:
+            return
+        start, end, _ = self._pending[0]
+        if end - start > self._windows.size:
+            self._windows.rewind(start)
+            self.cancel()
+
+
+async def _iter_unique(requests: _WindowRequests) -> AsyncIterator[Operation]:
+    seen: Dict[str, datetime] = {}
+    while requests:
+        end, operations = await requests.next()
+        for operation in _sort_unique(operations, seen):
+            yield operation
+        # Only operations at the end of the window can be returned again
+        seen = {key: date for key, date in seen.items() if date >= end}
+
+
+def _sort_unique(
+    operations: List[Operation], seen: Dict[str, datetime]
+) -> List[Operation]:
+    # Bounds of consecutive windows overlap, skip operations yielded before
+    operations.sort(key=lambda operation: operation.date)
+    unique = []
+    for operation in operations:
+        if operation.id not in seen:
+            seen[operation.id] = _to_datetime(operation.date)
+            unique.append(operation)
+    return unique
+
+
+def _to_datetime(dt: datetime_or_str) -> datetime:
+    if isinstance(dt, str):
+        dt = parse_datetime(dt)
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
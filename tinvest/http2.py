@@ -0,0 +1,115 @@
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator, Optional
+
+import httpx
+
+from .transports import AsyncResponse, AsyncTransport, SyncResponse, SyncTransport
+
+__all__ = ('HttpxTransport', 'HttpxSyncTransport')
+
+DEFAULT_CONNECTIONS = 2  # pragma: no mutate
+
+
+class _HttpxAsyncResponse(AsyncResponse):
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self.status = response.status_code
+
+    async def text(self) -> str:
+        await self._response.aread()
+        return self._response.text
+
+    def iter_chunks(self, size: int) -> AsyncIterator[bytes]:
+        return self._response.aiter_bytes(size)
+
+
+class HttpxTransport(AsyncTransport):
+    """
+    HTTP/2 over `httpx.AsyncClient`: concurrent requests are multiplexed
+    as streams over at most `connections` connections.
+    Requires `httpx[http2]`, install `tinvest[http2]`.
+
+    ```python
+    from tinvest import AsyncClient
+    from tinvest.http2 import HttpxTransport
+
+    client = AsyncClient(TOKEN, transport=HttpxTransport())
+    ```
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        *,
+        connections: int = DEFAULT_CONNECTIONS,
+    ):
+        self.client = client or httpx.AsyncClient(
+            http2=True, limits=httpx.Limits(max_connections=connections)
+        )
+
+    # pylint:disable=invalid-overridden-method
+    @asynccontextmanager
+    async def request(  # type: ignore[override]
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[AsyncResponse]:
+        async with self.client.stream(
+            method, url, **_get_httpx_kwargs(kwargs)
+        ) as response:
+            yield _HttpxAsyncResponse(response)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class _HttpxSyncResponse(SyncResponse):
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self.status = response.status_code
+
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    def iter_chunks(self, size: int) -> Iterator[bytes]:
+        return self._response.iter_bytes(size)
+
+
+class HttpxSyncTransport(SyncTransport):
+    """
+    HTTP/2 over `httpx.Client`, the client is thread-safe
+    and multiplexes requests of all threads.
+
+    ```python
+    from tinvest import SyncClient
+    from tinvest.http2 import HttpxSyncTransport
+
+    client = SyncClient(TOKEN, transport=HttpxSyncTransport())
+    ```
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        *,
+        connections: int = DEFAULT_CONNECTIONS,
+    ):
+        self.client = client or httpx.Client(
+            http2=True, limits=httpx.Limits(max_connections=connections)
+        )
+
+    @contextmanager
+    def request(  # type: ignore[override]
+        self, method: str, url: str, stream: bool = False, **kwargs: Any
+    ) -> Iterator[SyncResponse]:
+        with self.client.stream(method, url, **_get_httpx_kwargs(kwargs)) as response:
+            yield _HttpxSyncResponse(response)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def _get_httpx_kwargs(kwargs: Any) -> Any:
+    # httpx sends a str body as `content`
+    if 'data' in kwargs:
+        kwargs['content'] = kwargs.pop('data')
+    return kwargs
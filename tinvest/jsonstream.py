@@ -0,0 +1,82 @@
+import codecs
+import json
+import re
+from typing import Any, List
+
+__all__ = ('ArrayItemsParser',)
+
+WHITESPACE = ' \t\n\r'  # pragma: no mutate
+
+
+class ArrayItemsParser:
+    """
+    Incrementally extracts items of the array stored under `key`
+    from a JSON document fed chunk by chunk.
+    Only the unparsed tail of the document is kept in memory.
+
+    ```python
+    parser = ArrayItemsParser('instruments')
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            print(item)
+    parser.close()
+    ```
+    """
+
+    def __init__(self, key: str):
+        self._key = json.dumps(key)
+        self._marker = re.compile(re.escape(self._key) + r'\s*:\s*\[')
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._in_array = False
+        self.done = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        if self.done:
+            return []
+        self._buffer += self._text_decoder.decode(chunk)
+        if not self._in_array and not self._find_array():
+            return []
+        return self._read_items()
+
+    def close(self) -> None:
+        if not self.done:
+            raise ValueError(f'Array {self._key} is not found or not completed')
+
+    def _find_array(self) -> bool:
+        match = self._marker.search(self._buffer)
+        if not match:
+            # Keep a tail long enough to contain a marker split between chunks
+            tail = len(self._key) + 64
+            self._buffer = self._buffer[-tail:]
+            return False
+        end = match.end()
+        self._buffer = self._buffer[end:]
+        self._in_array = True
+        return True
+
+    def _read_items(self) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE + ',':
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == ']':
+                self.done = True
+                pos = len(buffer)
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            if end == len(buffer):
+                # A number may be cut by the end of the chunk
+                break
+            items.append(item)
+            pos = end
+        self._buffer = buffer[pos:]
+        return items
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Generic, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+from .typedefs import AnyDict
+
+__all__ = ('LazyModel',)
+
+T = TypeVar('T', bound=BaseModel)  # pragma: no mutate
+
+
+class LazyModel(Generic[T]):
+    """
+    Read-only proxy over decoded JSON of `model`.
+    A field is validated on first access and cached,
+    nested models and lists of models are proxied as well.
+
+    ```python
+    response = LazyModel(MarketInstrumentListResponse, json.loads(raw))
+    tickers = [instrument.ticker for instrument in response.payload.instruments]
+    ```
+    """
+
+    __slots__ = ('_model', '_data', '_cache')
+
+    def __init__(self, model: Type[T], data: AnyDict):
+        self._model = model
+        self._data = data
+        self._cache: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            field = self._model.__fields__[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+        cache = self._cache
+        if name not in cache:
+            cache[name] = self._get_value(field)
+        return cache[name]
+
+    def __repr__(self) -> str:
+        return f'Lazy{self._model.__name__}({self._data!r})'
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModel):
+            return self._model is other._model and self._data == other._data
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def to_model(self) -> T:
+        return self._model.parse_obj(self._data)
+
+    def dict(self, **kwargs: Any) -> AnyDict:
+        return self.to_model().dict(**kwargs)
+
+    def json(self, **kwargs: Any) -> str:
+        return self.to_model().json(**kwargs)
+
+    def _get_value(self, field: ModelField) -> Any:
+        if field.alias not in self._data:
+            if field.required:
+                raise ValidationError([_missing_error(field)], self._model)
+            return field.get_default()
+
+        value = self._data[field.alias]
+        if value is not None and _is_model(field.type_):
+            if field.shape == SHAPE_SINGLETON and isinstance(value, dict):
+                return LazyModel(field.type_, value)
+            if field.shape == SHAPE_LIST and isinstance(value, list):
+                return [_lazy_item(field.type_, item) for item in value]
+
+        value, errors = field.validate(value, {}, loc=field.alias, cls=self._model)
+        if errors:
+            raise ValidationError([errors], self._model)
+        return value
+
+
+def _lazy_item(model: Type[BaseModel], item: Any) -> Any:
+    if isinstance(item, dict):
+        return LazyModel(model, item)
+    return model.parse_obj(item)
+
+
+def _is_model(type_: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, BaseModel)
+
+
+def _missing_error(field: ModelField) -> ErrorWrapper:
+    return ErrorWrapper(MissingError(), loc=field.alias)
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+__all__ = ('RateLimiter',)
+
+
+class RateLimiter:
+    """
+    Token bucket: no more than `rate` requests per `period` seconds.
+
+    ```python
+    from tinvest import AsyncClient, RateLimiter
+
+    # invest-openapi allows 120 requests per minute for /portfolio
+    client = AsyncClient(TOKEN, rate_limiter=RateLimiter(120))
+    ```
+    """
+
+    def __init__(self, rate: int, period: float = 60.0):
+        if rate <= 0 or period <= 0:
+            raise ValueError('Rate and period must be positive')
+        self._rate = rate
+        self._period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> 'RateLimiter':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        return
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) * self._period / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(
+            float(self._rate), self._tokens + elapsed * self._rate / self._period
+        )
@@ -0,0 +1,79 @@
+import functools
+import typing
+from decimal import Decimal
+from typing import Any, Dict, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .schemas import (
+    LimitOrderRequest,
+    LimitOrderResponse,
+    MarketOrderRequest,
+    MarketOrderResponse,
+    PlacedLimitOrder,
+    PlacedMarketOrder,
+    SandboxSetCurrencyBalanceRequest,
+    SandboxSetPositionBalanceRequest,
+)
+
+__all__ = ('DECIMAL_MODELS', 'float_model')
+
+T = TypeVar('T', bound=BaseModel)  # pragma: no mutate
+
+# Order placement keeps exact prices and commissions
+DECIMAL_MODELS = frozenset(
+    (
+        LimitOrderRequest,
+        LimitOrderResponse,
+        MarketOrderRequest,
+        MarketOrderResponse,
+        PlacedLimitOrder,
+        PlacedMarketOrder,
+        SandboxSetCurrencyBalanceRequest,
+        SandboxSetPositionBalanceRequest,
+    )
+)
+
+
+@functools.lru_cache(maxsize=None)
+def float_model(model: Type[T]) -> Type[T]:
+    """
+    Returns a subclass of `model` where `Decimal` fields are `float`,
+    nested models are replaced recursively.
+    The model itself is returned if it has nothing to replace.
+    """
+    if model in DECIMAL_MODELS:
+        return model
+
+    hints = typing.get_type_hints(model)
+    annotations: Dict[str, Any] = {}
+    for name in model.__fields__:
+        hint = _replace_decimal(hints[name])
+        if hint != hints[name]:
+            annotations[name] = hint
+    if not annotations:
+        return model
+
+    namespace: Dict[str, Any] = {
+        '__annotations__': annotations,
+        '__module__': model.__module__,
+        '__qualname__': model.__qualname__,
+    }
+    for name in annotations:
+        namespace[name] = model.__fields__[name].field_info
+    return typing.cast(Type[T], type(model.__name__, (model,), namespace))
+
+
+def _replace_decimal(hint: Any) -> Any:
+    if hint is Decimal:
+        return float
+    if isinstance(hint, type) and issubclass(hint, BaseModel):
+        return float_model(hint)
+
+    args = typing.get_args(hint)
+    if not args:
+        return hint
+    new_args = tuple(_replace_decimal(arg) for arg in args)
+    if new_args == args:
+        return hint
+    return hint.copy_with(new_args)
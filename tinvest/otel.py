@@ -0,0 +1,47 @@
+from typing import Any, Optional
+
+from opentelemetry import trace
+
+from .tracing import Span, Tracer
+
+__all__ = ('OpenTelemetryTracer',)
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Exports requests as OpenTelemetry client spans with phases in
+    `tinvest.phase.<phase>` attributes. Requires `opentelemetry-api`,
+    install `tinvest[opentelemetry]`.
+
+    ```python
+    from tinvest import AsyncClient
+    from tinvest.otel import OpenTelemetryTracer
+
+    client = AsyncClient(TOKEN, tracer=OpenTelemetryTracer())
+    ```
+    """
+
+    def __init__(self, tracer_provider: Optional[Any] = None):
+        self.tracer = trace.get_tracer('tinvest', tracer_provider=tracer_provider)
+
+    def on_start(self, span: Span) -> None:
+        span.context = self.tracer.start_span(
+            f'{span.method} {span.path}',
+            kind=trace.SpanKind.CLIENT,
+            start_time=span.start_time_ns,
+            attributes={'http.request.method': span.method, 'url.path': span.path},
+        )
+
+    def on_phase(self, span: Span, phase: str, seconds: float) -> None:
+        span.context.set_attribute(f'tinvest.phase.{phase}', span.phases[phase])
+
+    def on_end(self, span: Span) -> None:
+        otel_span = span.context
+        if span.tracking_id:
+            otel_span.set_attribute('tinvest.tracking_id', span.tracking_id)
+        if span.status:
+            otel_span.set_attribute('http.response.status_code', span.status)
+        if span.error:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(trace.Status(trace.StatusCode.ERROR))
+        otel_span.end(end_time=span.start_time_ns + int(span.duration * 1e9))
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+
+from .schemas import (
+    Candle,
+    CandleStreamingResponse,
+    Currency,
+    OrderbookStreaming,
+    OrderbookStreamingResponse,
+    PortfolioPosition,
+)
+from .snapshots import PositionValuation
+from .tracker import OrderEvent
+
+if TYPE_CHECKING:
+    from .clients import AsyncClient  # pragma: no cover
+    from .streaming import Streaming  # pragma: no cover
+
+__all__ = ('PortfolioEngine',)
+
+logger = logging.getLogger(__name__)
+
+Tick = Union[
+    OrderbookStreamingResponse, CandleStreamingResponse, OrderbookStreaming, Candle
+]
+
+
+class _Position:
+    __slots__ = ('position', 'currency', 'price', 'market_value', 'expected_yield')
+
+    def __init__(self, position: PortfolioPosition):
+        average = position.average_position_price
+        self.position = position
+        self.currency: Optional[Currency] = average.currency if average else None
+        self.price: Optional[Decimal] = None
+        self.market_value: Optional[Decimal] = None
+        self.expected_yield: Optional[Decimal] = None
+
+    def to_valuation(self) -> PositionValuation:
+        return PositionValuation(
+            position=self.position,
+            orderbook=None,
+            price=self.price,
+            currency=self.currency,
+            market_value=self.market_value,
+            expected_yield=self.expected_yield,
+        )
+
+
+class PortfolioEngine:  # pylint:disable=too-many-instance-attributes
+    """
+    Portfolio valuation updated from streaming ticks.
+    Positions are loaded with `GET /portfolio` and reloaded every
+    `resync_interval` seconds or after a fill, each tick updates
+    one position and the totals in constant time. After `subscribe`
+    orderbooks of opened and closed positions are subscribed and
+    unsubscribed on each resync.
+
+    ```python
+    from tinvest import AsyncClient, PortfolioEngine, Streaming
+
+    async def main():
+        async with AsyncClient(TOKEN) as client:
+            engine = PortfolioEngine(client)
+            await engine.load()
+            async with Streaming(TOKEN) as streaming:
+                await engine.subscribe(streaming)
+                await engine.run(streaming)
+
+    # elsewhere
+    print(engine.total(), engine.expected_yield())
+    ```
+    """
+
+    def __init__(
+        self,
+        client: 'AsyncClient',
+        broker_account_id: Optional[str] = None,
+        *,
+        resync_interval: float = 60.0,
+    ):
+        self._client = client
+        self._broker_account_id = broker_account_id
+        self._resync_interval = resync_interval
+        self._positions: Dict[str, _Position] = {}
+        self._prices: Dict[str, Decimal] = {}
+        self._market_value: Dict[Currency, Decimal] = {}
+        self._expected_yield: Dict[Currency, Decimal] = {}
+        self._resync = asyncio.Event()
+        self._streaming: Optional['Streaming'] = None
+        self._depth = 1
+        self._subscribed: Set[str] = set()
+
+    async def load(self) -> None:
+        """Loads positions, last streamed prices are kept."""
+        response = await self._client.get_portfolio(self._broker_account_id)
+        self._positions = {}
+        self._market_value = {}
+        self._expected_yield = {}
+        for position in response.payload.positions:
+            state = _Position(position)
+            self._positions[position.figi] = state
+            price = self._prices.get(position.figi, _get_portfolio_price(position))
+            if price is not None:
+                self._set_price(state, price)
+
+    def figis(self) -> List[str]:
+        return list(self._positions)
+
+    def get(self, figi: str) -> Optional[PositionValuation]:
+        state = self._positions.get(figi)
+        return state.to_valuation() if state else None
+
+    def positions(self) -> List[PositionValuation]:
+        return [state.to_valuation() for state in self._positions.values()]
+
+    def total(self) -> Dict[Currency, Decimal]:
+        """Market value of positions by currency."""
+        return dict(self._market_value)
+
+    def expected_yield(self) -> Dict[Currency, Decimal]:
+        return dict(self._expected_yield)
+
+    def apply(self, tick: Tick) -> bool:
+        """Returns `True` if a position is revalued."""
+        if isinstance(tick, (OrderbookStreamingResponse, CandleStreamingResponse)):
+            tick = tick.payload
+        if isinstance(tick, OrderbookStreaming):
+            if not tick.bids or not tick.asks:
+                return False
+            mid = (tick.bids[0][0] + tick.asks[0][0]) / 2
+            return self.update_price(tick.figi, mid)
+        if isinstance(tick, Candle):
+            return self.update_price(tick.figi, tick.c)
+        return False
+
+    def update_price(self, figi: str, price: Decimal) -> bool:
+        self._prices[figi] = price
+        state = self._positions.get(figi)
+        if state is None:
+            return False
+        self._set_price(state, price)
+        return True
+
+    def request_resync(self) -> None:
+        self._resync.set()
+
+    def on_order_event(self, event: OrderEvent) -> None:
+        """`OrderTracker` listener, executed lots or a gone order trigger resync."""
+        if event.order.executed_lots or event.order.gone:
+            self.request_resync()
+
+    async def subscribe(self, streaming: 'Streaming', depth: int = 1) -> None:
+        """Subscribes to orderbooks of positions, kept in sync on resync."""
+        self._streaming = streaming
+        self._depth = depth
+        self._subscribed = set()
+        await self._update_subscriptions()
+
+    async def run(self, streaming: 'Streaming') -> None:
+        """Applies streaming events until the stream is stopped."""
+        task = asyncio.create_task(self._run_resync())
+        try:
+            async for event in streaming:
+                self.apply(event)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run_resync(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._resync.wait(), self._resync_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._resync.clear()
+            try:
+                await self.load()
+                await self._update_subscriptions()
+            except Exception as e:  # pylint:disable=broad-except
+                logger.error('Portfolio resync error: %s', e)
+
+    async def _update_subscriptions(self) -> None:
+        if self._streaming is None:
+            return
+        figis = set(self._positions)
+        for figi in self._subscribed - figis:
+            await self._streaming.orderbook.unsubscribe(figi, self._depth)
+            self._subscribed.discard(figi)
+        for figi in self._positions:
+            if figi not in self._subscribed:
+                await self._streaming.orderbook.subscribe(figi, self._depth)
+                self._subscribed.add(figi)
+
+    def _set_price(self, state: _Position, price: Decimal) -> None:
+        balance = state.position.balance
+        average = state.position.average_position_price
+        market_value = price * balance
+        expected_yield = (price - average.value) * balance if average else None
+
+        if state.currency is not None:
+            _add(self._market_value, state.currency, market_value, state.market_value)
+            if expected_yield is not None:
+                _add(
+                    self._expected_yield,
+                    state.currency,
+                    expected_yield,
+                    state.expected_yield,
+                )
+
+        state.price = price
+        state.market_value = market_value
+        state.expected_yield = expected_yield
+
+
+def _add(
+    totals: Dict[Currency, Decimal],
+    currency: Currency,
+    value: Decimal,
+    previous: Optional[Decimal],
+) -> None:
+    total = totals.get(currency, 0) + value
+    if previous is not None:
+        total -= previous
+    totals[currency] = total
+
+
+def _get_portfolio_price(position: PortfolioPosition) -> Optional[Decimal]:
+    """Price implied by the average price and the expected yield."""
+    average = position.average_position_price
+    expected_yield = position.expected_yield
+    if not average or not expected_yield or not position.balance:
+        return None
+    return average.value + expected_yield.value / position.balance
@@ -0,0 +1,94 @@
+import threading
+import weakref
+from typing import Dict, NamedTuple, Optional
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram
+
+from .tracing import Span, Tracer
+
+__all__ = ('PrometheusTracer',)
+
+NAMESPACE = 'tinvest'  # pragma: no mutate
+
+
+class _Metrics(NamedTuple):
+    requests: Histogram
+    phases: Histogram
+    errors: Counter
+
+
+# Metrics are registered once per registry and namespace
+_metrics: 'weakref.WeakKeyDictionary[CollectorRegistry, Dict[str, _Metrics]]' = (
+    weakref.WeakKeyDictionary()
+)
+_metrics_lock = threading.Lock()
+
+
+class PrometheusTracer(Tracer):
+    """
+    Observes durations of requests and phases in Prometheus histograms
+    labelled by path, errors are counted by exception type.
+    Tracers of the same registry and namespace share the metrics.
+    Requires `prometheus-client`, install `tinvest[prometheus]`.
+
+    ```python
+    from tinvest import AsyncClient
+    from tinvest.prometheus import PrometheusTracer
+
+    client = AsyncClient(TOKEN, tracer=PrometheusTracer())
+    ```
+    """
+
+    def __init__(
+        self,
+        registry: Optional[CollectorRegistry] = REGISTRY,
+        *,
+        namespace: str = NAMESPACE,
+    ):
+        self.requests, self.phases, self.errors = _get_metrics(registry, namespace)
+
+    def on_phase(self, span: Span, phase: str, seconds: float) -> None:
+        self.phases.labels(span.path, phase).observe(seconds)
+
+    def on_end(self, span: Span) -> None:
+        self.requests.labels(span.method, span.path, str(span.status or '')).observe(
+            span.duration
+        )
+        if span.error is not None:
+            self.errors.labels(span.path, type(span.error).__name__).inc()
+
+
+def _get_metrics(registry: Optional[CollectorRegistry], namespace: str) -> _Metrics:
+    if registry is None:
+        return _create_metrics(registry, namespace)
+    with _metrics_lock:
+        by_namespace = _metrics.setdefault(registry, {})
+        if namespace not in by_namespace:
+            by_namespace[namespace] = _create_metrics(registry, namespace)
+        return by_namespace[namespace]
+
+
+def _create_metrics(registry: Optional[CollectorRegistry], namespace: str) -> _Metrics:
+    return _Metrics(
+        Histogram(
+            'request_duration_seconds',
+            'Duration of OpenAPI requests',
+            ['method', 'path', 'status'],
+            namespace=namespace,
+            registry=registry,
+        ),
+        Histogram(
+            'request_phase_seconds',
+            'Duration of phases of OpenAPI requests',
+            ['path', 'phase'],
+            namespace=namespace,
+            registry=registry,
+        ),
+        Counter(
+            'request_errors',
+            'Failed OpenAPI requests',
+            ['path', 'error'],
+            namespace=namespace,
+            registry=registry,
+        ),
+    )
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+
+from pydantic import BaseModel
+
+from .schemas import Currency, CurrencyPosition, Order, Orderbook, PortfolioPosition
+
+if TYPE_CHECKING:
+    from .clients import AsyncClient  # pragma: no cover
+
+__all__ = ('PositionValuation', 'PortfolioSnapshot', 'get_portfolio_snapshot')
+
+
+class PositionValuation(BaseModel):
+    position: PortfolioPosition
+    orderbook: Optional[Orderbook]
+    price: Optional[Decimal]
+    currency: Optional[Currency]
+    market_value: Optional[Decimal]
+    expected_yield: Optional[Decimal]
+
+
+class PortfolioSnapshot(BaseModel):
+    time: datetime
+    broker_account_id: Optional[str]
+    positions: List[PositionValuation]
+    currencies: List[CurrencyPosition]
+    orders: List[Order]
+    # Errors of orderbook requests by FIGI, these positions are not priced
+    errors: Dict[str, str] = {}
+
+    def total(self) -> Dict[Currency, Decimal]:
+        totals: Dict[Currency, Decimal] = {}
+        for valuation in self.positions:
+            if valuation.currency is None or valuation.market_value is None:
+                continue
+            totals[valuation.currency] = (
+                totals.get(valuation.currency, Decimal(0)) + valuation.market_value
+            )
+        return totals
+
+
+async def get_portfolio_snapshot(
+    client: 'AsyncClient',
+    broker_account_id: Optional[str] = None,
+    figis: Optional[Iterable[str]] = None,
+    depth: int = 1,
+) -> PortfolioSnapshot:
+    """
+    Portfolio, currencies and orders are requested concurrently.
+    Orderbooks of `figis` are requested in the same round,
+    orderbooks of other positions are requested right after the portfolio.
+    A position whose orderbook request fails is not priced.
+    """
+    time = datetime.utcnow()
+    known = list(dict.fromkeys(figis or ()))
+    portfolio, currencies, orders, results = await asyncio.gather(
+        client.get_portfolio(broker_account_id),
+        client.get_portfolio_currencies(broker_account_id),
+        client.get_orders(broker_account_id),
+        _get_orderbooks(client, known, depth),
+    )
+
+    missing = [
+        position.figi
+        for position in portfolio.payload.positions
+        if position.figi not in results
+    ]
+    results.update(await _get_orderbooks(client, missing, depth))
+    orderbook_by_figi = {
+        figi: result
+        for figi, result in results.items()
+        if not isinstance(result, BaseException)
+    }
+
+    return PortfolioSnapshot(
+        time=time,
+        broker_account_id=broker_account_id,
+        positions=[
+            value_position(position, orderbook_by_figi.get(position.figi))
+            for position in portfolio.payload.positions
+        ],
+        currencies=currencies.payload.currencies,
+        orders=orders.payload,
+        errors={
+            figi: repr(result)
+            for figi, result in results.items()
+            if isinstance(result, BaseException)
+        },
+    )
+
+
+def value_position(
+    position: PortfolioPosition, orderbook: Optional[Orderbook]
+) -> PositionValuation:
+    price = get_mark_price(orderbook) if orderbook else None
+    average = position.average_position_price
+    currency = average.currency if average else None
+    market_value = None
+    expected_yield = None
+    if price is not None:
+        market_value = price * position.balance
+        if average:
+            expected_yield = (price - average.value) * position.balance
+
+    return PositionValuation(
+        position=position,
+        orderbook=orderbook,
+        price=price,
+        currency=currency,
+        market_value=market_value,
+        expected_yield=expected_yield,
+    )
+
+
+def get_mark_price(orderbook: Orderbook) -> Optional[Decimal]:
+    if orderbook.last_price is not None:
+        return orderbook.last_price
+    if orderbook.bids and orderbook.asks:
+        return (orderbook.bids[0].price + orderbook.asks[0].price) / 2
+    return orderbook.close_price
+
+
+async def _get_orderbooks(
+    client: 'AsyncClient', figis: List[str], depth: int
+) -> Dict[str, Union[Orderbook, BaseException]]:
+    responses = await asyncio.gather(
+        *(client.get_market_orderbook(figi, depth) for figi in figis),
+        return_exceptions=True,
+    )
+    return {
+        figi: response if isinstance(response, BaseException) else response.payload
+        for figi, response in zip(figis, responses)
+    }
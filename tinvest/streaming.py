@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any, Optional, Set, TypeVar, Union
 
 import aiohttp
 
+from .config import parse_obj
 from .constants import STREAMING
 from .schemas import (
     CandleResolution,
@@ -232,16 +233,16 @@ def _parse_response(response: StreamingResponse) -> Any:
     data: Any = None
 
     if response.event == Event.instrument_info:
-        data = InstrumentInfoStreamingResponse.parse_obj(response.dict())
+        data = parse_obj(InstrumentInfoStreamingResponse, response.dict())
 
     if response.event == Event.orderbook:
-        data = OrderbookStreamingResponse.parse_obj(response.dict())
+        data = parse_obj(OrderbookStreamingResponse, response.dict())
 
     if response.event == Event.candle:
-        data = CandleStreamingResponse.parse_obj(response.dict())
+        data = parse_obj(CandleStreamingResponse, response.dict())
 
     if response.event == Event.error:
-        data = ErrorStreamingResponse.parse_obj(response.dict())
+        data = parse_obj(ErrorStreamingResponse, response.dict())
         logger.error('Error response: %s', data)
 
     return data
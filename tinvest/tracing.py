@@ -0,0 +1,242 @@
+import contextvars
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import aiohttp
+
+__all__ = (
+    'Span',
+    'Tracer',
+    'get_current_span',
+    'get_trace_configs',
+    'trace_stream',
+    'trace_sync_stream',
+)
+
+T = TypeVar('T')  # pragma: no mutate
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar(
+    'tinvest_span', default=None
+)
+
+
+class Span:  # pylint:disable=too-many-instance-attributes
+    """
+    Timings of one request. `phases` maps a phase to seconds:
+
+    - `connect`, `send`: connection acquire and sending, only with aiohttp
+    - `response`: until the status and headers are received
+    - `read`: reading the body, of streams also waiting and parsing items
+    - `decode`: JSON decoding
+    - `validate`: building the response model
+    """
+
+    __slots__ = (
+        'method',
+        'path',
+        'tracking_id',
+        'status',
+        'error',
+        'phases',
+        'start_time_ns',
+        'duration',
+        'context',
+        '_tracer',
+        '_started',
+        '_last',
+        '_token',
+    )
+
+    def __init__(self, tracer: 'Tracer', method: str, path: str):
+        self.method = method
+        self.path = path
+        self.tracking_id: Optional[str] = None
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.phases: Dict[str, float] = {}
+        self.start_time_ns = time.time_ns()
+        self.duration = 0.0
+        # Free for use by a tracer, e.g. for an OpenTelemetry span
+        self.context: Any = None
+        self._tracer = tracer
+        self._started = self._last = time.perf_counter()
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> 'Span':
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self.finish(exc_val)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self._tracer.on_phase(self, phase, seconds)
+
+    def lap(self, phase: str) -> None:
+        """Adds the time since the previous lap to `phase`."""
+        now = time.perf_counter()
+        self.add(phase, now - self._last)
+        self._last = now
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.duration = time.perf_counter() - self._started
+        self._tracer.on_end(self)
+
+
+class Tracer:
+    """
+    Hooks called for every request of a client created with `tracer`.
+    Without a tracer clients do not measure anything.
+
+    ```python
+    from tinvest import AsyncClient, Tracer
+
+    class PrintTracer(Tracer):
+        def on_end(self, span):
+            print(span.method, span.path, span.tracking_id, span.phases)
+
+    client = AsyncClient(TOKEN, tracer=PrintTracer())
+    ```
+    """
+
+    def start_span(self, method: str, path: str) -> Span:
+        span = Span(self, method, path)
+        self.on_start(span)
+        return span
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_phase(self, span: Span, phase: str, seconds: float) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+def get_current_span() -> Optional[Span]:
+    """Span of the request being sent or the stream item being read."""
+    return _current_span.get()
+
+
+def get_trace_configs(
+    tracer: Optional[Tracer],
+) -> Optional[List['aiohttp.TraceConfig']]:
+    """aiohttp trace configs adding `connect` and `send` phases to spans."""
+    if tracer is None:
+        return None
+
+    import aiohttp  # pylint:disable=import-outside-toplevel
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_create_end.append(_on_connected)
+    trace_config.on_connection_reuseconn.append(_on_connected)
+    # aiohttp>=3.8
+    if hasattr(trace_config, 'on_request_headers_sent'):
+        trace_config.on_request_headers_sent.append(_on_headers_sent)
+    return [trace_config]
+
+
+async def _on_request_start(*_: Any) -> None:
+    span = _current_span.get()
+    if span is not None:
+        span._last = time.perf_counter()  # pylint:disable=protected-access
+
+
+async def _on_connected(*_: Any) -> None:
+    _lap('connect')
+
+
+async def _on_headers_sent(*_: Any) -> None:
+    _lap('send')
+
+
+def _lap(phase: str) -> None:
+    span = _current_span.get()
+    if span is not None:
+        span.lap(phase)
+
+
+async def trace_stream(span: Span, items: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Adds the time spent producing items to the `read` phase of `span`.
+    The span is current while an item is produced, so the request of the
+    stream gets the same phases as other requests.
+    """
+    error = None
+    try:
+        async for item in _atimed(span, items):
+            yield item
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        span.finish(error)
+
+
+def trace_sync_stream(span: Span, items: Iterator[T]) -> Iterator[T]:
+    error = None
+    try:
+        yield from _timed(span, items)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        span.finish(error)
+
+
+async def _atimed(span: Span, items: AsyncIterator[T]) -> AsyncIterator[T]:
+    while True:
+        has_item, item = await _anext(span, items)
+        if not has_item:
+            return
+        yield cast(T, item)
+
+
+def _timed(span: Span, items: Iterator[T]) -> Iterator[T]:
+    while True:
+        has_item, item = _next(span, items)
+        if not has_item:
+            return
+        yield cast(T, item)
+
+
+async def _anext(span: Span, items: AsyncIterator[T]) -> Tuple[bool, Optional[T]]:
+    span._last = time.perf_counter()  # pylint:disable=protected-access
+    token = _current_span.set(span)
+    try:
+        return True, await items.__anext__()
+    except StopAsyncIteration:
+        return False, None
+    finally:
+        _current_span.reset(token)
+        span.lap('read')
+
+
+def _next(span: Span, items: Iterator[T]) -> Tuple[bool, Optional[T]]:
+    span._last = time.perf_counter()  # pylint:disable=protected-access
+    token = _current_span.set(span)
+    try:
+        return True, next(items)
+    except StopIteration:
+        return False, None
+    finally:
+        _current_span.reset(token)
+        span.lap('read')
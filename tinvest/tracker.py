@@ -0,0 +1,370 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from .schemas import (
+    LimitOrderRequest,
+    MarketOrderRequest,
+    Operation,
+    OperationStatus,
+    OperationType,
+    Order,
+    OrderStatus,
+    PlacedLimitOrder,
+    PlacedMarketOrder,
+)
+
+if TYPE_CHECKING:
+    from .clients import AsyncClient  # pragma: no cover
+
+__all__ = ('TrackedOrder', 'OrderEvent', 'OrderTracker')
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = frozenset(
+    (OrderStatus.fill, OrderStatus.cancelled, OrderStatus.rejected)
+)
+
+# Limit orders live until the end of the trading day
+OPERATIONS_LOOKBACK = timedelta(days=1)  # pragma: no mutate
+
+PlacedOrder = Union[PlacedLimitOrder, PlacedMarketOrder]
+
+
+class TrackedOrder(BaseModel):
+    order_id: str
+    figi: Optional[str]
+    operation: OperationType
+    status: OrderStatus
+    requested_lots: int
+    executed_lots: int
+    price: Optional[Decimal]
+    # Disappeared from GET /orders without an operation
+    gone: bool = False
+
+    @property
+    def closed(self) -> bool:
+        return self.gone or self.status in CLOSED_STATUSES
+
+
+class OrderEvent(BaseModel):
+    order: TrackedOrder
+    previous_status: Optional[OrderStatus]
+
+
+Listener = Callable[[OrderEvent], None]
+
+
+class OrderTracker:  # pylint:disable=too-many-instance-attributes
+    """
+    Local store of orders reconciled with `GET /orders`.
+    Orders are polled every `active_interval` seconds while some of them
+    are open and every `idle_interval` seconds otherwise.
+
+    `GET /orders` returns only active orders, the outcome of an order that
+    disappears from it is taken from its operation: a fill or a cancel with
+    the executed lots. An order without an operation is marked `gone`.
+    Closed orders are forgotten `retention` seconds after they are closed.
+
+    ```python
+    from tinvest import AsyncClient, LimitOrderRequest, OrderTracker
+
+    async def main():
+        async with AsyncClient(TOKEN) as client:
+            async with OrderTracker(client) as tracker:
+                order = await tracker.limit_order(
+                    'BBG0013HGFT4',
+                    LimitOrderRequest(lots=1, operation='Buy', price=75.5),
+                )
+                order = await tracker.wait(order.order_id)
+                print(order.status)
+    ```
+    """
+
+    def __init__(
+        self,
+        client: 'AsyncClient',
+        broker_account_id: Optional[str] = None,
+        *,
+        active_interval: float = 0.5,
+        idle_interval: float = 5.0,
+        retention: float = 3600.0,
+    ):
+        self._client = client
+        self._broker_account_id = broker_account_id
+        self._active_interval = active_interval
+        self._idle_interval = idle_interval
+        self._retention = retention
+        self._orders: Dict[str, TrackedOrder] = {}
+        self._orders_by_figi: Dict[str, Set[str]] = {}
+        self._added_at: Dict[str, float] = {}
+        self._seen_at: Dict[str, datetime] = {}
+        self._cancelled: Set[str] = set()
+        self._closed_at: Dict[str, float] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._listeners: List[Listener] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> 'OrderTracker':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get(self, order_id: str) -> Optional[TrackedOrder]:
+        return self._orders.get(order_id)
+
+    def by_figi(self, figi: str) -> List[TrackedOrder]:
+        return [self._orders[i] for i in self._orders_by_figi.get(figi, ())]
+
+    def open_orders(self) -> List[TrackedOrder]:
+        return [order for order in self._orders.values() if not order.closed]
+
+    def add_listener(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    async def events(self) -> AsyncIterator[OrderEvent]:
+        queue: 'asyncio.Queue[OrderEvent]' = asyncio.Queue()
+        self.add_listener(queue.put_nowait)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._listeners.remove(queue.put_nowait)
+
+    def add(
+        self,
+        placed: PlacedOrder,
+        figi: Optional[str] = None,
+        price: Optional[Decimal] = None,
+    ) -> TrackedOrder:
+        order = TrackedOrder(
+            order_id=placed.order_id,
+            figi=figi,
+            operation=placed.operation,
+            status=placed.status,
+            requested_lots=placed.requested_lots,
+            executed_lots=placed.executed_lots,
+            price=price,
+        )
+        self._added_at[order.order_id] = time.monotonic()
+        self._update(order)
+        self._wakeup.set()
+        return order
+
+    async def limit_order(self, figi: str, body: LimitOrderRequest) -> TrackedOrder:
+        response = await self._client.post_orders_limit_order(
+            figi, body, self._broker_account_id
+        )
+        return self.add(response.payload, figi, body.price)
+
+    async def market_order(self, figi: str, body: MarketOrderRequest) -> TrackedOrder:
+        response = await self._client.post_orders_market_order(
+            figi, body, self._broker_account_id
+        )
+        return self.add(response.payload, figi)
+
+    async def cancel(self, order_id: str) -> None:
+        self._cancelled.add(order_id)
+        try:
+            await self._client.post_orders_cancel(order_id, self._broker_account_id)
+        except Exception:
+            self._cancelled.discard(order_id)
+            raise
+        self._wakeup.set()
+
+    async def wait(
+        self, order_id: str, timeout: Optional[float] = None
+    ) -> TrackedOrder:
+        """Waits until the order is filled, cancelled or rejected."""
+        order = self._orders.get(order_id)
+        if order and order.closed:
+            return order
+        future = asyncio.get_event_loop().create_future()
+        waiters = self._waiters.setdefault(order_id, [])
+        waiters.append(future)
+        self._wakeup.set()
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            # A timed out waiter must not keep polling at the active interval
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters and self._waiters.get(order_id) is waiters:
+                del self._waiters[order_id]
+
+    async def poll(self) -> None:
+        self._evict()
+        requested_at = time.monotonic()
+        response = await self._client.get_orders(self._broker_account_id)
+        active = {order.order_id: order for order in response.payload}
+
+        for active_order in active.values():
+            self._update(_from_order(active_order))
+
+        disappeared = [
+            order
+            for order in self.open_orders()
+            if order.order_id not in active
+            # Placed after the request was sent
+            and self._added_at.get(order.order_id, 0) <= requested_at
+        ]
+        if disappeared:
+            await self._close(disappeared)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:  # pylint:disable=broad-except
+                logger.error('Orders polling error: %s', e)
+            interval = (
+                self._active_interval
+                if self.open_orders() or self._waiters
+                else self._idle_interval
+            )
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _close(self, orders: List[TrackedOrder]) -> None:
+        by_figi: Dict[Optional[str], List[TrackedOrder]] = {}
+        for order in orders:
+            by_figi.setdefault(order.figi, []).append(order)
+
+        for figi, figi_orders in by_figi.items():
+            operations = await self._get_operations(figi, figi_orders)
+            for order in figi_orders:
+                self._update(self._closed(order, operations.get(order.order_id)))
+
+    def _closed(
+        self, order: TrackedOrder, operation: Optional[Operation]
+    ) -> TrackedOrder:
+        if operation is None and order.order_id in self._cancelled:
+            return order.copy(update={'status': OrderStatus.cancelled})
+        return _close_order(order, operation)
+
+    async def _get_operations(
+        self, figi: Optional[str], orders: Iterable[TrackedOrder]
+    ) -> Dict[str, Operation]:
+        """Operations of orders by their ids, which are the ids of orders."""
+        now = datetime.now(timezone.utc)
+        from_ = min(self._seen_at.get(o.order_id, now) for o in orders)
+        response = await self._client.get_operations(
+            from_ - OPERATIONS_LOOKBACK, now, figi, self._broker_account_id
+        )
+        return {operation.id: operation for operation in response.payload.operations}
+
+    def _update(self, order: TrackedOrder) -> None:
+        previous = self._orders.get(order.order_id)
+        if previous is not None:
+            order.figi = order.figi or previous.figi
+            order.price = order.price if order.price is not None else previous.price
+            if previous == order:
+                return
+
+        self._orders[order.order_id] = order
+        self._seen_at.setdefault(order.order_id, datetime.now(timezone.utc))
+        if order.figi:
+            self._orders_by_figi.setdefault(order.figi, set()).add(order.order_id)
+
+        event = OrderEvent(
+            order=order, previous_status=previous.status if previous else None
+        )
+        for listener in list(self._listeners):
+            listener(event)
+
+        if order.closed:
+            self._closed_at.setdefault(order.order_id, time.monotonic())
+            self._resolve_waiters(order)
+        else:
+            self._closed_at.pop(order.order_id, None)
+
+    def _evict(self) -> None:
+        expired_at = time.monotonic() - self._retention
+        # Orders are kept in the order they were closed
+        expired = []
+        for order_id, closed_at in self._closed_at.items():
+            if closed_at > expired_at:
+                break
+            expired.append(order_id)
+
+        for order_id in expired:
+            del self._closed_at[order_id]
+            order = self._orders.pop(order_id)
+            self._added_at.pop(order_id, None)
+            self._seen_at.pop(order_id, None)
+            self._cancelled.discard(order_id)
+            if order.figi:
+                self._discard_figi_order(order.figi, order_id)
+
+    def _discard_figi_order(self, figi: str, order_id: str) -> None:
+        order_ids = self._orders_by_figi[figi]
+        order_ids.discard(order_id)
+        if not order_ids:
+            del self._orders_by_figi[figi]
+
+    def _resolve_waiters(self, order: TrackedOrder) -> None:
+        for future in self._waiters.pop(order.order_id, []):
+            if not future.done():
+                future.set_result(order)
+
+
+def _close_order(order: TrackedOrder, operation: Optional[Operation]) -> TrackedOrder:
+    if operation is None:
+        return order.copy(update={'gone': True})
+
+    executed_lots = order.executed_lots
+    if operation.status != OperationStatus.decline:
+        executed_lots = order.requested_lots
+        if operation.quantity and operation.quantity_executed is not None:
+            # Quantities are in pieces, lots are of the same size
+            executed_lots = (
+                order.requested_lots * operation.quantity_executed // operation.quantity
+            )
+    status = (
+        OrderStatus.fill
+        if executed_lots >= order.requested_lots
+        else OrderStatus.cancelled
+    )
+    return order.copy(update={'status': status, 'executed_lots': executed_lots})
+
+
+def _from_order(order: Order) -> TrackedOrder:
+    return TrackedOrder(
+        order_id=order.order_id,
+        figi=order.figi,
+        operation=order.operation,
+        status=order.status,
+        requested_lots=order.requested_lots,
+        executed_lots=order.executed_lots,
+        price=order.price,
+    )
@@ -0,0 +1,206 @@
+import threading
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+import aiohttp
+import requests
+
+__all__ = (
+    'AsyncResponse',
+    'AsyncTransport',
+    'SyncResponse',
+    'SyncTransport',
+    'AiohttpTransport',
+    'RequestsTransport',
+)
+
+
+class AsyncResponse(ABC):
+    status: int
+
+    @abstractmethod
+    async def text(self) -> str:
+        """Body of the response."""
+
+    @abstractmethod
+    def iter_chunks(self, size: int) -> AsyncIterator[bytes]:
+        """Chunks of the body of up to `size` bytes."""
+
+
+class AsyncTransport(ABC):
+    """
+    HTTP layer of `AsyncClient`.
+    `request` accepts `headers`, `params` and `data` (str) keyword arguments.
+
+    ```python
+    from tinvest import AsyncClient
+    from tinvest.http2 import HttpxTransport
+
+    client = AsyncClient(TOKEN, transport=HttpxTransport())
+    ```
+    """
+
+    @abstractmethod
+    def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncContextManager[AsyncResponse]:
+        """Context manager of the response, the connection is released on exit."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Closes connections."""
+
+
+class SyncResponse(ABC):
+    status: int
+
+    @abstractmethod
+    def text(self) -> str:
+        """Body of the response."""
+
+    @abstractmethod
+    def iter_chunks(self, size: int) -> Iterator[bytes]:
+        """Chunks of the body of up to `size` bytes."""
+
+
+class SyncTransport(ABC):
+    """
+    HTTP layer of `SyncClient`, `stream=True` is passed
+    when the body is read with `iter_chunks`.
+    """
+
+    @abstractmethod
+    def request(
+        self, method: str, url: str, stream: bool = False, **kwargs: Any
+    ) -> ContextManager[SyncResponse]:
+        """Context manager of the response, the connection is released on exit."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Closes connections."""
+
+
+class _AiohttpResponse(AsyncResponse):
+    def __init__(self, response: aiohttp.ClientResponse):
+        self._response = response
+        self.status = response.status
+
+    async def text(self) -> str:
+        return await self._response.text()
+
+    def iter_chunks(self, size: int) -> AsyncIterator[bytes]:
+        return self._response.content.iter_chunked(size)
+
+
+class AiohttpTransport(AsyncTransport):
+    """HTTP/1.1 over `aiohttp.ClientSession`, the default transport."""
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        *,
+        trace_configs: Optional[List[aiohttp.TraceConfig]] = None,
+    ):
+        self.session = session or aiohttp.ClientSession(trace_configs=trace_configs)
+
+    # pylint:disable=invalid-overridden-method
+    @asynccontextmanager
+    async def request(  # type: ignore[override]
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[AsyncResponse]:
+        kwargs['raise_for_status'] = False
+        async with self.session.request(method, url, **kwargs) as response:
+            yield _AiohttpResponse(response)
+
+    async def close(self) -> None:
+        await self.session.close()
+
+
+class _RequestsResponse(SyncResponse):
+    def __init__(self, response: requests.Response):
+        self._response = response
+        self.status = response.status_code
+
+    def text(self) -> str:
+        return self._response.text
+
+    def iter_chunks(self, size: int) -> Iterator[bytes]:
+        return self._response.iter_content(size)
+
+
+class RequestsTransport(SyncTransport):
+    """
+    HTTP/1.1 over `requests.Session`, the default transport.
+    Without `session` each thread uses its own session.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        self._shared_session = session
+        self._sessions = _ThreadSessions()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._shared_session is not None:
+            return self._shared_session
+        return self._sessions.get()
+
+    @contextmanager
+    def request(  # type: ignore[override]
+        self, method: str, url: str, stream: bool = False, **kwargs: Any
+    ) -> Iterator[SyncResponse]:
+        if stream:
+            kwargs['stream'] = True
+        response = self.session.request(method, url, **kwargs)
+        try:
+            yield _RequestsResponse(response)
+        finally:
+            response.close()
+
+    def close(self) -> None:
+        if self._shared_session is not None:
+            self._shared_session.close()
+        self._sessions.close()
+
+
+class _ThreadSessions:
+    """
+    `requests.Session` per thread, sessions of finished threads are closed
+    when a new one is created.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: Dict[threading.Thread, requests.Session] = {}
+
+    def get(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._lock:
+                self._close_finished()
+                self._sessions[threading.current_thread()] = session
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        self._local = threading.local()
+        for session in sessions:
+            session.close()
+
+    def _close_finished(self) -> None:
+        for thread in [t for t in self._sessions if not t.is_alive()]:
+            self._sessions.pop(thread).close()
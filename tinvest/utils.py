@@ -1,13 +1,19 @@
 import asyncio
 import contextvars
 import functools
+import json
 import typing
 from datetime import timezone
 
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
 from .typedefs import AnyDict, datetime_or_str
 
 __all__ = (
+    'get_default_headers',
     'set_default_headers',
+    'dump_model',
     'Func',
     'run_in_threadpool',
     'isoformat',
@@ -15,6 +21,10 @@ __all__ = (
 )
 
 
+def get_default_headers(token: str) -> typing.Dict[str, str]:
+    return {'accept': 'application/json', 'Authorization': f'Bearer {token}'}
+
+
 def set_default_headers(data: AnyDict, token: str) -> None:
     headers = data.get('headers', {})
     headers.setdefault('accept', 'application/json')
@@ -24,6 +34,26 @@ def set_default_headers(data: AnyDict, token: str) -> None:
 
 T = typing.TypeVar('T')  # pragma: no mutate
 
+_json_encoder = json.JSONEncoder(default=pydantic_encoder)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_aliases(
+    model: typing.Type[BaseModel],
+) -> typing.Tuple[typing.Tuple[str, str], ...]:
+    return tuple((name, field.alias) for name, field in model.__fields__.items())
+
+
+def dump_model(model: BaseModel) -> str:
+    """
+    Same as `model.json(by_alias=True)` for flat request models
+    without building an intermediate dict of the model.
+    """
+    values = model.__dict__
+    return _json_encoder.encode(
+        {alias: values[name] for name, alias in _get_aliases(type(model))}
+    )
+
 
 class Func:
     def __init__(